@@ -3,6 +3,9 @@ from flask import Flask
 from app.config import Config
 from app.auth.routes import login_manager
 from flask_mail import Mail
+from app.ml.model_registry import get_model_bundle
+from app.database.migrations import migrate
+from app.database.dbconnection import db_instance
 
 
 def create_app():
@@ -23,4 +26,8 @@ def create_app():
     from app.auth.routes import auth
     app.register_blueprint(auth)
 
+    migrate()
+    db_instance.open()
+    get_model_bundle()
+
     return app
\ No newline at end of file
@@ -12,6 +12,31 @@ class Config:
     DATABASE_REAL_ESTATE = os.path.join(BASE_DIR, 'real_estate.db')
     DATABASE_PREDICTIONS = os.path.join(BASE_DIR, 'predictions.db')
     DATABASE_USERS = os.path.join(BASE_DIR, 'users.db')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+    DB_BUSY_TIMEOUT = float(os.getenv('DB_BUSY_TIMEOUT', 5))
+    DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', 256 * 1024 * 1024))
+    DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', -16384))
+    REAL_ESTATE_DB_MODE = os.getenv('REAL_ESTATE_DB_MODE', 'readwrite')
+
+    MODEL_DIR = os.path.join(BASE_DIR, 'ml')
+    MODEL_REGISTRY_DIR = os.path.join(BASE_DIR, 'ml', 'models')
+    MODEL_REFRESH_INTERVAL = int(os.getenv('MODEL_REFRESH_INTERVAL', 30))
+    DATAFRAME_PAGE_SIZE = int(os.getenv('DATAFRAME_PAGE_SIZE', 100))
+    DATAFRAME_PAGE_LIMIT = int(os.getenv('DATAFRAME_PAGE_LIMIT', 1000))
+    PREDICT_BATCH_LIMIT = int(os.getenv('PREDICT_BATCH_LIMIT', 10000))
+    HISTORY_PAGE_LIMIT = int(os.getenv('HISTORY_PAGE_LIMIT', 1000))
+    PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 10000))
+    PREDICTION_CACHE_TTL = int(os.getenv('PREDICTION_CACHE_TTL', 3600))
+    PREDICTION_QUEUE_SIZE = int(os.getenv('PREDICTION_QUEUE_SIZE', 1000))
+    PREDICTION_QUEUE_TIMEOUT = float(os.getenv('PREDICTION_QUEUE_TIMEOUT', 5))
+    PREDICTION_WRITE_BATCH = int(os.getenv('PREDICTION_WRITE_BATCH', 100))
+    PREDICTION_ID_BLOCK = int(os.getenv('PREDICTION_ID_BLOCK', 100))
+    PREDICTION_WRITE_RETRIES = int(os.getenv('PREDICTION_WRITE_RETRIES', 5))
+    PREDICTION_RETRY_DELAY = float(os.getenv('PREDICTION_RETRY_DELAY', 0.1))
+    PIPELINE_CHUNK_SIZE = int(os.getenv('PIPELINE_CHUNK_SIZE', 50000))
+    PIPELINE_SKETCH_CAPACITY = int(os.getenv('PIPELINE_SKETCH_CAPACITY', 65536))
+    INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', 100000))
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(BASE_DIR, 'data', 'snapshots'))
 
     SECRET_KEY = os.getenv('SECRET_KEY', 'default')
     REMEMBER_COOKIE_SECURE = True
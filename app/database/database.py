@@ -8,6 +8,6 @@ def before_request():
     g.get_db = db_instance.get_db
 
 
-@predict.teardown_request
+@predict.teardown_app_request
 def close_db(error=None):
     db_instance.close()
\ No newline at end of file
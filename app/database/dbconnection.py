@@ -1,13 +1,198 @@
 # app/database/dbconnection.py
 from flask import g
+import os
 import sqlite3
+import threading
+from collections import deque
+from urllib.parse import quote
 from app.config import Config
 
 
+class ConnectionPool:
+    """
+    Thread-safe pool of connections to one SQLite database file.
+
+    Connections are opened on demand and configured once: WAL journal
+    (readers do not block the writer), synchronous=NORMAL, a memory map, a
+    page cache, in-memory temporary tables and a busy timeout. Up to `size`
+    released connections are kept for reuse. `acquire()` never waits: when
+    none is idle a new connection is opened, and connections released past
+    `size` are closed, so requests beyond the pool size still succeed. A
+    released connection has its open transaction rolled back.
+
+    Read-only databases can be served in two other modes:
+
+    - 'immutable': connections open the file with `mode=ro&immutable=1`, so
+      SQLite takes no file locks and does not check it for changes; the
+      memory map makes every connection read the same cached pages. The
+      file is switched out of WAL mode when the pool opens, as immutable
+      connections ignore the WAL file.
+    - 'memory': the database is copied into an in-memory database when the
+      pool opens, and every connection reads that copy.
+
+    In both modes the file must not be written while the pool is open.
+
+    Other databases can be attached to every connection, so a query can
+    join tables across database files.
+
+    Attributes:
+        path (str): Database file.
+        size (int): Maximum number of idle connections kept open.
+        mode (str): 'readwrite', 'immutable' or 'memory'.
+        attach (dict): Schema name to file of the databases attached to every connection.
+    """
+
+    MODES = ('readwrite', 'immutable', 'memory')
+
+    def __init__(self, path, size=None, mode='readwrite', attach=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown database mode: {mode}")
+
+        self.path = path
+        self.size = size or Config.DB_POOL_SIZE
+        self.mode = mode
+        self.attach = attach or {}
+
+        self._idle = deque()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        self._uri = None
+        self._memory = None
+
+        self.checkouts = 0
+        self.overflows = 0
+        self.peak_in_use = 0
+
+    def acquire(self):
+        """
+        Check out a connection, opening a new one if none is idle.
+
+        Returns:
+            sqlite3.Connection: Connection with sqlite3.Row rows.
+        """
+        with self._lock:
+            self.checkouts += 1
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._created += 1
+                if self._created > self.size:
+                    self.overflows += 1
+            self.peak_in_use = max(self.peak_in_use, self._created - len(self._idle))
+        if conn is not None:
+            return conn
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def open(self):
+        """Prepare the database for the pool mode, e.g. load the in-memory copy, if not done yet."""
+
+        with self._open_lock:
+            if self._uri is not None:
+                return
+
+            if self.mode == 'readwrite':
+                self._uri = self.path
+                return
+
+            source = sqlite3.connect(self.path, timeout=Config.DB_BUSY_TIMEOUT)
+            try:
+                if self.mode == 'immutable':
+                    source.execute("PRAGMA journal_mode=DELETE")
+                    self._uri = f'file:{quote(self.path)}?mode=ro&immutable=1'
+                else:
+                    uri = f'file:/{quote(os.path.basename(self.path))}-{id(self)}?vfs=memdb'
+                    self._memory = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                    source.backup(self._memory)
+                    self._uri = uri
+            finally:
+                source.close()
+
+    def release(self, conn):
+        """
+        Return a checked out connection to the pool.
+
+        Args:
+            conn (sqlite3.Connection): Connection from `acquire()`.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            keep = False
+        else:
+            with self._lock:
+                keep = len(self._idle) < self.size
+                if keep:
+                    self._idle.append(conn)
+
+        if not keep:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    def close(self):
+        """Close the idle connections and drop the in-memory copy once no connection is checked out."""
+
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+                self._created -= 1
+
+        with self._open_lock:
+            if self._memory is not None and self._created == 0:
+                self._memory.close()
+                self._memory = None
+                self._uri = None
+
+    def stats(self):
+        """
+        Return pool counters for monitoring.
+
+        Returns:
+            dict: Open, idle and checked out connections, checkouts, connections opened past the
+                pool size and the most connections checked out at once.
+        """
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'size': self._created,
+                'max_size': self.size,
+                'idle': len(self._idle),
+                'in_use': self._created - len(self._idle),
+                'checkouts': self.checkouts,
+                'overflows': self.overflows,
+                'peak_in_use': self.peak_in_use
+            }
+
+    def _connect(self):
+        self.open()
+        conn = sqlite3.connect(self._uri, timeout=Config.DB_BUSY_TIMEOUT, check_same_thread=False,
+                               uri=self.mode != 'readwrite')
+        conn.row_factory = sqlite3.Row
+        if self.mode == 'readwrite':
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        else:
+            conn.execute("PRAGMA query_only=1")
+        conn.execute(f"PRAGMA mmap_size={int(Config.DB_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA cache_size={int(Config.DB_CACHE_SIZE)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        for schema, path in self.attach.items():
+            conn.execute("ATTACH DATABASE ? AS " + schema, (path,))
+        return conn
+
+
 class Database:
     """
     Class for managing connections to multiple SQLite databases within a Flask application.
-    Uses the global `g` object to store connections in the request context.
+    Connections are checked out of a pool per database and kept in the global `g` object
+    for the rest of the request.
     """
     def __init__(self):
         self.databases = {
@@ -15,6 +200,10 @@ class Database:
             'predictions': Config.DATABASE_PREDICTIONS,
             'users': Config.DATABASE_USERS
         }
+        self.modes = {'real_estate': Config.REAL_ESTATE_DB_MODE}
+        self.attachments = {'users': {'predictions_db': Config.DATABASE_PREDICTIONS}}
+        self.pools = {key: ConnectionPool(path, mode=self.modes.get(key, 'readwrite'), attach=self.attachments.get(key))
+                      for key, path in self.databases.items()}
 
     def get_db(self, db_key):
         if db_key not in self.databases:
@@ -22,18 +211,30 @@ class Database:
 
         if db_key not in g:
             try:
-                g.__dict__[db_key] = sqlite3.connect(self.databases[db_key])
-                g.__dict__[db_key].row_factory = sqlite3.Row
+                g.__dict__[db_key] = self.pools[db_key].acquire()
             except sqlite3.Error as e:
                 g.__dict__[db_key] = None
         return g.__dict__[db_key]
 
-    @staticmethod
-    def close():
-        for key in list(g.__dict__.keys()):
-            db = getattr(g, key, None)
+    def open(self):
+        """Prepare every pool, so the first request does not load a database copy."""
+
+        for pool in self.pools.values():
+            pool.open()
+
+    def close(self):
+        for key, pool in self.pools.items():
+            db = g.__dict__.pop(key, None)
             if isinstance(db, sqlite3.Connection):
-                db.close()
-                del g.__dict__[key]
+                pool.release(db)
+
+    def stats(self):
+        """
+        Return the counters of every connection pool.
+
+        Returns:
+            dict: Database key to pool counters.
+        """
+        return {key: pool.stats() for key, pool in self.pools.items()}
 
-db_instance = Database()
\ No newline at end of file
+db_instance = Database()
@@ -0,0 +1,215 @@
+# app/database/migrations.py
+import sqlite3
+from app.config import Config
+
+INDEXES = {
+    'real_estate': [
+        ('idx_real_estate_price', 'real_estate', 'price'),
+        ('idx_real_estate_district', 'real_estate', 'district'),
+        ('idx_real_estate_rooms', 'real_estate', 'rooms'),
+        ('idx_real_estate_floor', 'real_estate', 'floor'),
+        ('idx_real_estate_floors', 'real_estate', 'floors'),
+        ('idx_real_estate_area', 'real_estate', 'area'),
+        ('idx_real_estate_type', 'real_estate', 'type'),
+        ('idx_real_estate_cond', 'real_estate', 'cond'),
+        ('idx_real_estate_walls', 'real_estate', 'walls')
+    ],
+    'predictions': [
+        ('idx_predictions_request_id', 'predictions', 'request_id'),
+        ('idx_predictions_price', 'predictions', 'price')
+    ],
+    'users': [
+        ('idx_user_predictions_user_id', 'user_predictions', 'user_id, id'),
+        ('idx_user_predictions_prediction_id', 'user_predictions', 'prediction_id')
+    ]
+}
+
+SEARCH_INDEX = [
+    """
+    CREATE VIRTUAL TABLE real_estate_fts USING fts5(
+        district, type, cond, walls, "desc",
+        content='real_estate', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER real_estate_fts_insert AFTER INSERT ON real_estate BEGIN
+        INSERT INTO real_estate_fts (rowid, district, type, cond, walls, "desc")
+        VALUES (new.id, new.district, new.type, new.cond, new.walls, new."desc");
+    END
+    """,
+    """
+    CREATE TRIGGER real_estate_fts_delete AFTER DELETE ON real_estate BEGIN
+        INSERT INTO real_estate_fts (real_estate_fts, rowid, district, type, cond, walls, "desc")
+        VALUES ('delete', old.id, old.district, old.type, old.cond, old.walls, old."desc");
+    END
+    """,
+    """
+    CREATE TRIGGER real_estate_fts_update AFTER UPDATE ON real_estate BEGIN
+        INSERT INTO real_estate_fts (real_estate_fts, rowid, district, type, cond, walls, "desc")
+        VALUES ('delete', old.id, old.district, old.type, old.cond, old.walls, old."desc");
+        INSERT INTO real_estate_fts (rowid, district, type, cond, walls, "desc")
+        VALUES (new.id, new.district, new.type, new.cond, new.walls, new."desc");
+    END
+    """,
+    "INSERT INTO real_estate_fts (real_estate_fts) VALUES ('rebuild')"
+]
+
+PREDICTION_TABLES = {
+    'requests': """
+        CREATE TABLE requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            district TEXT NOT NULL,
+            rooms INTEGER NOT NULL,
+            floor INTEGER NOT NULL,
+            floors INTEGER NOT NULL,
+            area REAL NOT NULL,
+            type TEXT NOT NULL,
+            cond TEXT NOT NULL,
+            walls TEXT NOT NULL,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'predictions': """
+        CREATE TABLE predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            price REAL NOT NULL,
+            mean_error REAL NOT NULL,
+            mse REAL NOT NULL,
+            request_id INTEGER NOT NULL,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+}
+
+DATABASES = {
+    'real_estate': Config.DATABASE_REAL_ESTATE,
+    'predictions': Config.DATABASE_PREDICTIONS,
+    'users': Config.DATABASE_USERS
+}
+
+
+def create_indexes(conn, indexes):
+    """
+    Create the secondary indexes the model queries rely on.
+
+    Args:
+        conn (sqlite3.Connection): Database connection.
+        indexes (list): (index name, table, columns) tuples.
+
+    Returns:
+        list: Names of the indexes that did not exist before.
+    """
+    existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    created = []
+
+    for name, table, columns in indexes:
+        if name not in existing:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+            created.append(name)
+
+    conn.commit()
+    return created
+
+
+def create_prediction_keys(conn):
+    """
+    Rebuild the requests and predictions tables with an AUTOINCREMENT primary key.
+
+    The ids were assigned by the application as the last id + 1. The existing
+    rows keep their ids, and both sequences start after the highest id of
+    either table, so a request and its prediction keep sharing an id.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the predictions database.
+
+    Returns:
+        list: Names of the tables that were rebuilt.
+    """
+    rebuilt = []
+    existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'").fetchall())
+    pending = [table for table in PREDICTION_TABLES if 'AUTOINCREMENT' not in existing[table].upper()]
+    if not pending:
+        return rebuilt
+
+    conn.execute("BEGIN")
+    try:
+        for table in pending:
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            conn.execute(PREDICTION_TABLES[table].replace(f'CREATE TABLE {table}', f'CREATE TABLE {table}_new', 1))
+            conn.execute(f"INSERT INTO {table}_new ({', '.join(columns)}) "
+                         f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            rebuilt.append(table)
+
+        (last_id,) = conn.execute("""
+            SELECT MAX(COALESCE((SELECT MAX(id) FROM requests), 0), COALESCE((SELECT MAX(id) FROM predictions), 0))
+        """).fetchone()
+        conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('requests', 'predictions')")
+        conn.executemany("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                         [(table, last_id) for table in PREDICTION_TABLES])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return rebuilt
+
+
+def create_search_index(conn):
+    """
+    Create the FTS5 index over the text columns of real_estate.
+
+    The index stores no copy of the text (it reads it from real_estate) and
+    is kept in sync by triggers on insert, update and delete.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the real estate database.
+
+    Returns:
+        list: ['real_estate_fts'] if the index was created, else an empty list.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'real_estate_fts'").fetchone()
+    if exists:
+        return []
+
+    conn.execute("BEGIN")
+    try:
+        for statement in SEARCH_INDEX:
+            conn.execute(statement)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return ['real_estate_fts']
+
+
+def migrate(databases=None):
+    """
+    Bring the application databases up to date: primary keys of the prediction tables,
+    secondary indexes and the full-text search index.
+
+    Args:
+        databases (dict, optional): Database key to file path; the application databases by default.
+
+    Returns:
+        dict: Names of the tables rebuilt and the indexes created per database.
+    """
+    databases = databases or DATABASES
+    created = {}
+
+    for key, path in databases.items():
+        conn = sqlite3.connect(path)
+        try:
+            created[key] = create_prediction_keys(conn) if key == 'predictions' else []
+            created[key] += create_indexes(conn, INDEXES[key])
+            if key == 'real_estate':
+                created[key] += create_search_index(conn)
+        finally:
+            conn.close()
+
+    return created
+
+
+if __name__ == '__main__':
+    for key, names in migrate().items():
+        print(f"{key}: {', '.join(names) if names else 'up to date'}")
@@ -0,0 +1,264 @@
+# app/database/prediction_writer.py
+import atexit
+import datetime
+import queue
+import sqlite3
+import threading
+import time
+from app.config import Config
+from app.models.predicts.models import PredictDB
+from app.models.users.model import UserDB
+from logs.logclass import logger
+
+_STOP = object()
+
+
+class PredictionWriter:
+    """
+    Write-behind persistence of predictions.
+
+    `submit()` assigns the ids of a prediction and queues it; a background
+    thread writes queued predictions to the predictions database, and their
+    user links to the users database, in batches committed as one
+    transaction each. Ids come from blocks reserved in the predictions
+    database, so they are known before the rows are written and stay unique
+    across processes.
+
+    The queue is bounded: when it is full `submit()` waits for the writer,
+    and if the writer does not catch up in time the prediction is written by
+    the calling thread. If that write has to be retried, `submit()` waits
+    for room once more and then drops the prediction rather than blocking
+    the request. `flush()` waits until the queued predictions are
+    written, so readers see their own writes; `close()` drains the queue.
+
+    A batch that fails because the database is locked or unavailable stays
+    queued and is retried with exponential backoff until it commits. A batch
+    that fails for any other reason is written again one prediction at a
+    time, so a bad record is dropped on its own. While closing, a batch is
+    retried `retries` times before it is given up.
+
+    Attributes:
+        predictions_path (str): Predictions database.
+        users_path (str): Users database.
+        batch_size (int): Maximum number of predictions per transaction.
+        id_block (int): Number of ids reserved at a time.
+        put_timeout (float): Seconds `submit()` waits for room in a full queue.
+        retries (int): Attempts to write a batch while closing, and to link predictions to users.
+        retry_delay (float): Seconds before the first retry; doubled on every failed attempt.
+    """
+
+    MAX_RETRY_DELAY = 10.0
+
+    def __init__(self, predictions_path=None, users_path=None, queue_size=None, batch_size=None, id_block=None,
+                 put_timeout=None, retries=None, retry_delay=None):
+        self.predictions_path = predictions_path or Config.DATABASE_PREDICTIONS
+        self.users_path = users_path or Config.DATABASE_USERS
+        self.batch_size = batch_size or Config.PREDICTION_WRITE_BATCH
+        self.id_block = id_block or Config.PREDICTION_ID_BLOCK
+        self.put_timeout = Config.PREDICTION_QUEUE_TIMEOUT if put_timeout is None else put_timeout
+        self.retries = Config.PREDICTION_WRITE_RETRIES if retries is None else retries
+        self.retry_delay = Config.PREDICTION_RETRY_DELAY if retry_delay is None else retry_delay
+
+        self._queue = queue.Queue(maxsize=queue_size or Config.PREDICTION_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._next_id = None
+        self._last_id = None
+        self._thread = None
+
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.overflows = 0
+        self.dropped = 0
+        self.retried = 0
+
+    def submit(self, data, result, user_id=None):
+        """
+        Queue a prediction for writing.
+
+        Args:
+            data (dict): Validated input data of the request.
+            result (dict): Model output with 'predicted_price'.
+            user_id (int, optional): User to link the prediction to.
+
+        Returns:
+            tuple: (request id, prediction id) the prediction will be saved under.
+        """
+        pr_id = self._take_id()
+        item = (pr_id, dict(data), dict(result), datetime.datetime.now(), user_id)
+
+        with self._idle:
+            self._pending += 1
+        self._start()
+
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full:
+            self.overflows += 1
+            if self._write([item]):
+                try:
+                    self._queue.put(item, timeout=self.put_timeout)
+                except queue.Full:
+                    logger.log_error("Prediction writer dropped a prediction, the queue is full",
+                                     stack_trace=str(pr_id))
+                    with self._idle:
+                        self.dropped += 1
+                    self._finish([item], saved=False)
+
+        return pr_id, pr_id
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued prediction is written.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the queue was drained.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self):
+        """Write the queued predictions and stop the background thread."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self):
+        """
+        Return writer counters for monitoring.
+
+        Returns:
+            dict: Queued, written and failed predictions, batches, retried writes, writes done by
+                request threads and the failed predictions dropped because the queue stayed full.
+        """
+        return {'queued': self._pending, 'written': self.written, 'failed': self.failed, 'batches': self.batches,
+                'retried': self.retried, 'overflows': self.overflows, 'dropped': self.dropped}
+
+    def _take_id(self):
+        with self._lock:
+            if self._next_id is None or self._next_id > self._last_id:
+                conn = sqlite3.connect(self.predictions_path)
+                try:
+                    first_id = PredictDB(conn).reserve_ids(self.id_block)
+                finally:
+                    conn.close()
+                if first_id is None:
+                    raise RuntimeError(f'Could not reserve prediction ids in {self.predictions_path}')
+                self._next_id, self._last_id = first_id, first_id + self.id_block - 1
+
+            pr_id = self._next_id
+            self._next_id += 1
+            return pr_id
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='prediction-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch, failures, stopping = [], 0, False
+        while True:
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(block=not batch)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            if not batch:
+                return
+
+            batch = self._write(batch)
+            if not batch:
+                failures = 0
+                continue
+
+            failures += 1
+            if stopping and failures > self.retries:
+                logger.log_error("Prediction writer gave up saving predictions",
+                                 stack_trace=str([item[0] for item in batch]))
+                self._finish(batch, saved=False)
+                return
+            time.sleep(self._backoff(failures))
+
+    def _write(self, batch):
+        """Write a batch and return the predictions to retry later."""
+
+        try:
+            self._save(batch)
+        except sqlite3.OperationalError as e:
+            logger.log_error("Prediction writer will retry saving predictions",
+                             stack_trace=f'{[item[0] for item in batch]}: {e}')
+            with self._idle:
+                self.retried += 1
+            return batch
+        except Exception as e:
+            if len(batch) == 1:
+                logger.log_error("Prediction writer could not save prediction",
+                                 stack_trace=f'{batch[0][0]}: {e}')
+                self._finish(batch, saved=False)
+                return []
+
+            for position, item in enumerate(batch):
+                if self._write([item]):
+                    return batch[position:]
+            return []
+
+        self._link(batch)
+        self._finish(batch, saved=True)
+        return []
+
+    def _save(self, batch):
+        conn = sqlite3.connect(self.predictions_path, timeout=Config.DB_BUSY_TIMEOUT)
+        try:
+            PredictDB(conn).save_results([item[:4] for item in batch])
+        finally:
+            conn.close()
+
+    def _link(self, batch):
+        links = [(user_id, pr_id, pr_id) for pr_id, _, _, _, user_id in batch if user_id is not None]
+        if not links:
+            return
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self._backoff(attempt))
+            try:
+                conn = sqlite3.connect(self.users_path, timeout=Config.DB_BUSY_TIMEOUT)
+                try:
+                    if UserDB(conn).add_user_predictions_many(links) is not None:
+                        return
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                pass
+
+        logger.log_error("Prediction writer could not link predictions to users", stack_trace=str(links))
+
+    def _backoff(self, failures):
+        return min(self.retry_delay * 2 ** (failures - 1), self.MAX_RETRY_DELAY)
+
+    def _finish(self, batch, saved):
+        with self._idle:
+            if saved:
+                self.written += len(batch)
+                self.batches += 1
+            else:
+                self.failed += len(batch)
+            self._pending -= len(batch)
+            self._idle.notify_all()
+
+prediction_writer = PredictionWriter()
+atexit.register(prediction_writer.close)
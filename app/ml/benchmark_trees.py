@@ -0,0 +1,72 @@
+# app/ml/benchmark_trees.py
+import os
+import time
+import joblib
+import numpy as np
+from app.config import Config
+from app.ml.flat_forest import FlatForest
+from app.ml.model_bundle import predict_matrix
+
+BATCH_SIZES = [1, 100, 10000]
+
+
+def measure(predict, X, repeats):
+    """
+    Measure the median latency of a predict function.
+
+    Args:
+        predict (callable): Function taking a feature matrix.
+        X (np.ndarray): Feature matrix.
+        repeats (int): Number of timed calls.
+
+    Returns:
+        float: Median latency in milliseconds.
+    """
+    predict(X)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def run_benchmark(model_dir=None, batch_sizes=BATCH_SIZES, seed=42):
+    """
+    Compare FlatForest with sklearn's HistGradientBoostingRegressor.predict.
+
+    Rows are drawn from a standard normal distribution, which matches the
+    scaled numeric features and covers every split of the trees.
+
+    Args:
+        model_dir (str, optional): Directory with price_model.pkl (defaults to Config.MODEL_DIR).
+        batch_sizes (list): Batch sizes to measure.
+        seed (int): Random seed for the generated rows.
+
+    Returns:
+        list: Per batch size latency of both evaluators and the largest prediction difference.
+    """
+    model = joblib.load(os.path.join(model_dir or Config.MODEL_DIR, 'price_model.pkl'))
+    forest = FlatForest.from_model(model)
+    rng = np.random.default_rng(seed)
+
+    results = []
+    for batch_size in batch_sizes:
+        X = rng.standard_normal((batch_size, forest.n_features))
+        repeats = max(5, min(200, 20000 // batch_size))
+
+        results.append({
+            'batch_size': batch_size,
+            'sklearn_ms': measure(lambda rows: predict_matrix(model, rows), X, repeats),
+            'flat_forest_ms': measure(forest.predict, X, repeats),
+            'max_abs_diff': float(np.abs(predict_matrix(model, X) - forest.predict(X)).max())
+        })
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'batch':>8} {'sklearn, ms':>12} {'flat, ms':>10} {'speedup':>8} {'max diff':>10}")
+    for row in run_benchmark():
+        speedup = row['sklearn_ms'] / row['flat_forest_ms']
+        print(f"{row['batch_size']:>8} {row['sklearn_ms']:>12.3f} {row['flat_forest_ms']:>10.3f} "
+              f"{speedup:>7.1f}x {row['max_abs_diff']:>10.2e}")
@@ -0,0 +1,243 @@
+# app/ml/featurizer.py
+import json
+import numpy as np
+from app.use_cases.data_processing_use_case import extract_features, extract_features_bulk
+
+CATEGORICAL = ['district', 'type', 'cond', 'walls']
+NUMERIC = ['rooms', 'floor', 'floors', 'area', 'property_level', 'property_strength', 'property_area_factor',
+           'high_quality_property', 'is_luxury']
+
+PROPERTY_WEIGHTS = {
+    1: 10.0,
+    2: 5.0,
+    3: 2.0,
+    4: 0.5,
+    5: 0.1
+}
+
+
+def property_features(levels, area):
+    """
+    Compute the features derived from the property level for many rows.
+
+    Used both when building training data and at inference, so the two
+    always agree.
+
+    Args:
+        levels (np.ndarray): Property levels.
+        area (np.ndarray): Living areas.
+
+    Returns:
+        dict: 'property_strength', 'property_area_factor', 'high_quality_property' and 'is_luxury' arrays.
+    """
+    levels = np.asarray(levels, dtype=np.int64)
+    strength = np.array([PROPERTY_WEIGHTS[level] for level in levels.tolist()], dtype=np.float64)
+
+    return {
+        'property_strength': strength,
+        'property_area_factor': strength * np.asarray(area, dtype=np.float64),
+        'high_quality_property': (levels <= 2).astype(np.int64),
+        'is_luxury': (levels == 1).astype(np.int64)
+    }
+
+
+class Featurizer:
+    """
+    Precompiled builder of model input rows that does not use pandas.
+
+    The target-encoding mappings and the scaler parameters are extracted once
+    from the fitted artifacts, so building a row for a validated listing is a
+    handful of dictionary lookups and one vectorized scale operation, written
+    straight into a float64 array in `feature_names` order.
+
+    Attributes:
+        feature_names (list): Feature order expected by the model.
+        n_features (int): Number of model features.
+    """
+
+    def __init__(self, feature_names, encodings, scaler_mean, scaler_scale):
+        """
+        Args:
+            feature_names (list): Feature order expected by the model.
+            encodings (dict): Per categorical column: {'values': {category: encoded}, 'unknown': float,
+                'missing': float}.
+            scaler_mean (dict): Mean of every numeric feature.
+            scaler_scale (dict): Scale of every numeric feature.
+        """
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+
+        positions = {name: index for index, name in enumerate(self.feature_names)}
+
+        self._categorical_plan = [
+            (positions[column], column, encodings[column]['values'],
+             encodings[column]['unknown'], encodings[column]['missing'])
+            for column in CATEGORICAL if column in positions
+        ]
+
+        numeric = [column for column in NUMERIC if column in positions]
+        self._numeric_columns = numeric
+        self._numeric_positions = np.array([positions[column] for column in numeric], dtype=np.intp)
+        self._mean = np.array([scaler_mean[column] for column in numeric], dtype=np.float64)
+        self._scale = np.array([scaler_scale[column] for column in numeric], dtype=np.float64)
+
+    @classmethod
+    def from_artifacts(cls, target_encoder, scaler, feature_names):
+        """
+        Compile a featurizer from a fitted TargetEncoder and StandardScaler.
+
+        Args:
+            target_encoder: Fitted category_encoders.TargetEncoder.
+            scaler: Fitted StandardScaler for numeric features.
+            feature_names (list): Feature order expected by the model.
+
+        Returns:
+            Featurizer: Compiled featurizer.
+        """
+        ordinal_mappings = {item['col']: item['mapping'] for item in target_encoder.ordinal_encoder.mapping}
+
+        encodings = {}
+        for column in CATEGORICAL:
+            target_mapping = target_encoder.mapping[column]
+            values = {category: float(target_mapping[code])
+                      for category, code in ordinal_mappings[column].items()
+                      if isinstance(category, str) and code in target_mapping.index}
+            encodings[column] = {
+                'values': values,
+                'unknown': float(target_mapping.get(-1, target_encoder._mean)),
+                'missing': float(target_mapping.get(-2, target_encoder._mean))
+            }
+
+        scaler_columns = list(scaler.feature_names_in_)
+        scaler_mean = dict(zip(scaler_columns, scaler.mean_))
+        scaler_scale = dict(zip(scaler_columns, scaler.scale_))
+
+        return cls(feature_names, encodings, scaler_mean, scaler_scale)
+
+    @classmethod
+    def from_dict(cls, tables):
+        """
+        Build a featurizer from exported lookup tables.
+
+        Args:
+            tables (dict): Output of `to_dict`.
+
+        Returns:
+            Featurizer: Compiled featurizer.
+        """
+        return cls(tables['feature_names'], tables['encodings'], tables['scaler']['mean'], tables['scaler']['scale'])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a featurizer from a lookup tables file.
+
+        Args:
+            path (str): Path to lookup_tables.json.
+
+        Returns:
+            Featurizer: Compiled featurizer.
+        """
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        """
+        Export the lookup tables used by the featurizer.
+
+        Returns:
+            dict: Feature names, per-column encodings with unknown/missing fallbacks and scaler parameters.
+        """
+        return {
+            'feature_names': self.feature_names,
+            'encodings': {column: {'values': values, 'unknown': unknown, 'missing': missing}
+                          for position, column, values, unknown, missing in self._categorical_plan},
+            'scaler': {
+                'mean': dict(zip(self._numeric_columns, self._mean.tolist())),
+                'scale': dict(zip(self._numeric_columns, self._scale.tolist()))
+            }
+        }
+
+    def save(self, path):
+        """
+        Write the lookup tables to a JSON file.
+
+        Args:
+            path (str): Destination path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    @staticmethod
+    def derive(area, desc):
+        """
+        Compute the description-based features of a listing.
+
+        Args:
+            area (float): Living area.
+            desc (str or None): Listing description.
+
+        Returns:
+            tuple: (list of derived values in NUMERIC order, starting at 'property_level', warning or None)
+        """
+        features = extract_features(desc)
+        level = features['property_level']
+        strength = PROPERTY_WEIGHTS[level]
+
+        derived = [level, strength, strength * area, 1 if level <= 2 else 0, 1 if level == 1 else 0]
+        return derived, features.get('warning')
+
+    def transform(self, data):
+        """
+        Build one model input row.
+
+        Args:
+            data (dict): Validated listing, as returned by Controller.filter_input_data_json.
+
+        Returns:
+            tuple: (np.ndarray of shape (1, n_features), warning or None)
+        """
+        row = np.zeros((1, self.n_features), dtype=np.float64)
+
+        for position, column, values, unknown, missing in self._categorical_plan:
+            value = data.get(column)
+            row[0, position] = missing if value is None else values.get(value, unknown)
+
+        derived, warning = self.derive(data['area'], data.get('desc'))
+        raw = dict(zip(NUMERIC, [data['rooms'], data['floor'], data['floors'], data['area']] + derived))
+
+        numeric = np.array([raw[column] for column in self._numeric_columns], dtype=np.float64)
+        row[0, self._numeric_positions] = (numeric - self._mean) / self._scale
+
+        return row, warning
+
+    def transform_many(self, rows):
+        """
+        Build a model input matrix for many listings.
+
+        Args:
+            rows (list): Validated listings.
+
+        Returns:
+            tuple: (np.ndarray of shape (n_rows, n_features), list of warnings)
+        """
+        matrix = np.zeros((len(rows), self.n_features), dtype=np.float64)
+
+        for position, column, values, unknown, missing in self._categorical_plan:
+            matrix[:, position] = [missing if row.get(column) is None else values.get(row[column], unknown)
+                                   for row in rows]
+
+        raw = np.empty((len(rows), len(NUMERIC)), dtype=np.float64)
+        raw[:, :4] = np.array([(row['rooms'], row['floor'], row['floors'], row['area']) for row in rows],
+                              dtype=np.float64).reshape(-1, 4)
+
+        levels, warnings = extract_features_bulk([row.get('desc') for row in rows])
+        derived = property_features(levels, raw[:, 3])
+        raw[:, 4] = levels
+        for index, column in enumerate(NUMERIC[5:], start=5):
+            raw[:, index] = derived[column]
+
+        columns = [NUMERIC.index(column) for column in self._numeric_columns]
+        matrix[:, self._numeric_positions] = (raw[:, columns] - self._mean) / self._scale
+
+        return matrix, warnings.tolist()
@@ -0,0 +1,215 @@
+# app/ml/flat_forest.py
+import numpy as np
+
+
+class FlatForest:
+    """
+    Array-based evaluator for a trained HistGradientBoostingRegressor.
+
+    Every tree of the model is flattened into shared contiguous NumPy arrays
+    (feature index, threshold, left/right child, missing-value direction and
+    leaf value); leaves point to themselves. These arrays are the exported
+    artifact.
+
+    For prediction the arrays are compiled into per-feature bitvector tables
+    (the QuickScorer layout). For every tree, a row's exit leaf is the
+    leftmost leaf not excluded by a split the row fails, and the splits a row
+    fails on one feature are a prefix of that feature's thresholds sorted in
+    ascending order. So a batch is scored for all trees at once with one
+    `searchsorted`, one table gather and one AND per feature, followed by a
+    lowest-set-bit lookup of the leaf values.
+
+    Attributes:
+        baseline (float): Initial raw prediction of the model.
+        roots (np.ndarray): Index of the root node of every tree.
+        max_depth (int): Depth of the deepest tree.
+        n_features (int): Number of input features.
+    """
+
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots')
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, baseline, max_depth, n_features):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.intp)
+        self.right = np.ascontiguousarray(right, dtype=np.intp)
+        self.missing_left = np.ascontiguousarray(missing_left, dtype=bool)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.baseline = float(baseline)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+
+        self._compile()
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Flatten a fitted HistGradientBoostingRegressor.
+
+        Only numeric splits and the identity link (squared or absolute error
+        style losses) are supported, which is what train_model.py produces.
+
+        Args:
+            model: Fitted HistGradientBoostingRegressor.
+
+        Returns:
+            FlatForest: Flattened model.
+        """
+        if type(model._loss.link).__name__ != 'IdentityLink':
+            raise NotImplementedError(f"Unsupported loss for flattening: {model.loss}")
+
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for predictors in model._predictors:
+            nodes = predictors[0].nodes
+            if nodes['is_categorical'].any():
+                raise NotImplementedError("Categorical splits are not supported")
+
+            node_ids = np.arange(len(nodes)) + offset
+            is_leaf = nodes['is_leaf'].astype(bool)
+
+            features.append(np.where(is_leaf, 0, nodes['feature_idx']))
+            thresholds.append(np.where(is_leaf, np.inf, nodes['num_threshold']))
+            lefts.append(np.where(is_leaf, node_ids, nodes['left'] + offset))
+            rights.append(np.where(is_leaf, node_ids, nodes['right'] + offset))
+            missing.append(nodes['missing_go_to_left'].astype(bool))
+            values.append(np.where(is_leaf, nodes['value'], 0.0))
+            roots.append(offset)
+
+            max_depth = max(max_depth, int(nodes['depth'].max()))
+            offset += len(nodes)
+
+        return cls(np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+                   np.concatenate(rights), np.concatenate(missing), np.concatenate(values), np.array(roots),
+                   baseline=np.ravel(model._baseline_prediction)[0], max_depth=max_depth,
+                   n_features=model.n_features_in_)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a flattened model written by `save`.
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            FlatForest: Flattened model.
+        """
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in cls.ARRAYS}
+            return cls(baseline=data['baseline'][0], max_depth=data['max_depth'][0],
+                       n_features=data['n_features'][0], **arrays)
+
+    def save(self, path):
+        """
+        Write the flattened arrays to a compressed .npz file.
+
+        Args:
+            path (str): Destination path.
+        """
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, baseline=np.array([self.baseline]), max_depth=np.array([self.max_depth]),
+                     n_features=np.array([self.n_features]),
+                     **{name: getattr(self, name) for name in self.ARRAYS})
+
+    def _compile(self):
+        """Build the per-feature bitvector tables and the leaf value matrix."""
+
+        n_nodes, n_trees = len(self.value), len(self.roots)
+        node_ids = np.arange(n_nodes)
+        is_leaf = self.left == node_ids
+        tree_of = np.repeat(np.arange(n_trees), np.diff(np.append(self.roots, n_nodes)))
+
+        leaf_position = np.zeros(n_nodes, dtype=np.intp)
+        left_leaves = [0] * n_nodes
+        max_leaves = 0
+
+        for root in self.roots:
+            count = 0
+            first_leaf = {}
+            stack = [(root, False)]
+            while stack:
+                node, visited = stack.pop()
+                if is_leaf[node]:
+                    leaf_position[node] = count
+                    first_leaf[node] = count
+                    count += 1
+                elif visited:
+                    first_leaf[node] = first_leaf[self.left[node]]
+                    low, high = first_leaf[self.left[node]], first_leaf[self.right[node]]
+                    left_leaves[node] = ((1 << high) - 1) ^ ((1 << low) - 1)
+                else:
+                    stack.extend([(node, True), (self.right[node], False), (self.left[node], False)])
+            max_leaves = max(max_leaves, count)
+
+        if max_leaves > 64:
+            raise NotImplementedError("Trees with more than 64 leaves are not supported")
+
+        self._mask_dtype = np.uint32 if max_leaves <= 32 else np.uint64
+        bits = np.iinfo(self._mask_dtype).bits
+        self._full_mask = self._mask_dtype(np.iinfo(self._mask_dtype).max)
+        fail_masks = np.array([((1 << bits) - 1) ^ leaves for leaves in left_leaves], dtype=self._mask_dtype)
+
+        self._leaf_values = np.zeros((n_trees, max_leaves), dtype=np.float64)
+        self._leaf_values[tree_of[is_leaf], leaf_position[is_leaf]] = self.value[is_leaf]
+        self._tree_index = np.arange(n_trees)
+
+        self._tables = []
+        for feature in range(self.n_features):
+            split_nodes = node_ids[~is_leaf & (self.feature == feature)]
+            if not len(split_nodes):
+                continue
+
+            order = split_nodes[np.argsort(self.threshold[split_nodes], kind='stable')]
+            table = np.full((len(order) + 1, n_trees), self._full_mask, dtype=self._mask_dtype)
+            table[np.arange(1, len(order) + 1), tree_of[order]] = fail_masks[order]
+            table = np.bitwise_and.accumulate(table, axis=0)
+
+            missing_mask = np.full(n_trees, self._full_mask, dtype=self._mask_dtype)
+            for node in split_nodes[~self.missing_left[split_nodes]]:
+                missing_mask[tree_of[node]] &= fail_masks[node]
+
+            self._tables.append((feature, self.threshold[order], table, missing_mask))
+
+    def predict(self, X):
+        """
+        Predict target values for a batch of rows.
+
+        Args:
+            X (np.ndarray): Feature matrix of shape (n_samples, n_features).
+
+        Returns:
+            np.ndarray: Predictions of shape (n_samples,).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        masks = np.full((X.shape[0], len(self.roots)), self._full_mask, dtype=self._mask_dtype)
+
+        for feature, thresholds, table, missing_mask in self._tables:
+            column = X[:, feature]
+            feature_masks = table[np.searchsorted(thresholds, column, side='left')]
+
+            missing = np.isnan(column)
+            if missing.any():
+                feature_masks[missing] = missing_mask
+
+            masks &= feature_masks
+
+        lowest_bit = masks & (~masks + self._mask_dtype(1))
+        leaves = np.log2(lowest_bit).astype(np.intp)
+
+        return self.baseline + self._leaf_values[self._tree_index, leaves].sum(axis=1)
+
+    def info(self):
+        """
+        Return the shape of the flattened model.
+
+        Returns:
+            dict: Number of trees and nodes and the maximum depth.
+        """
+        return {'n_trees': len(self.roots), 'n_nodes': len(self.value), 'max_depth': self.max_depth}
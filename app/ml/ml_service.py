@@ -1,8 +1,14 @@
 # app/ml/ml_services.py
-import pandas as pd
 import numpy as np
-import joblib
-from app.use_cases.data_processing_use_case import extract_features
+from pydantic import ValidationError
+from app.ml.featurizer import CATEGORICAL
+from app.ml.model_bundle import predict_matrix
+from app.ml.model_registry import get_model_bundle
+from app.ml.prediction_cache import prediction_cache
+from app.schemas.pydantic_schemas.post import REData
+from app.utils.utils import Utils
+
+REQUIRED_FIELDS = CATEGORICAL + ['rooms', 'floor', 'floors', 'area']
 
 
 def process_model(input_data, db=None):
@@ -17,70 +23,112 @@ def process_model(input_data, db=None):
         dict or None: Dictionary with predicted price and possible warning, or None on failure.
     """
     try:
-        model = joblib.load('app/ml/price_model.pkl')
-        target_encoder = joblib.load('app/ml/target_encoder.pkl')
-        scaler = joblib.load('app/ml/scaler.pkl')
-        feature_names = joblib.load('app/ml/feature_names.pkl')
-
-        categorical = ['district', 'type', 'cond', 'walls']
-        numeric = ['rooms', 'floor', 'floors', 'area', 'property_level', 'property_strength', 'property_area_factor',
-                   'high_quality_property', 'is_luxury']
-
-        property_weights = {
-            1: 10.0,
-            2: 5.0,
-            3: 2.0,
-            4: 0.5,
-            5: 0.1
-        }
-
-        required_fields = categorical + ['rooms', 'floor', 'floors', 'area']
-        missing_fields = [field for field in required_fields if field not in input_data]
+        bundle = get_model_bundle()
+
+        missing_fields = [field for field in REQUIRED_FIELDS if field not in input_data]
         if missing_fields:
             raise ValueError(f"Missing required fields: {missing_fields}")
 
-        df = pd.DataFrame([input_data])
+        model_key = (bundle.version, bundle.loaded_at)
+        cache_key = prediction_cache.make_key(input_data)
+        cached = prediction_cache.get(model_key, cache_key)
+        if cached is not None:
+            return cached
 
-        warning = None
+        row, warning = bundle.featurizer.transform(input_data)
 
-        if 'desc' in df.columns and not pd.isna(df['desc']).iloc[0]:
-            features = df['desc'].apply(extract_features)
-            df['property_level'] = features.apply(lambda x: x['property_level'])
-            if 'warning' in features.iloc[0]:
-                df['warning'] = features.apply(lambda x: x.get('warning', None))
-            df = df.drop(columns=['desc'])
-        else:
-            df['property_level'] = 5
-            df['warning'] = 'desc None (5)'
+        y_pred_log = predict_matrix(bundle.model, row)[0]
 
+        predicted_price = np.expm1(y_pred_log)
 
-        df = df.drop(columns=['desc'], errors='ignore')
+        result = {'predicted_price': float(predicted_price), 'warning': warning}
+        prediction_cache.put(model_key, cache_key, result)
 
-        df['property_strength'] = df['property_level'].map(property_weights)
-        df['high_quality_property'] = df['property_level'].apply(lambda x: 1 if x <= 2 else 0)
-        df['property_area_factor'] = df['property_strength'] * df['area']
-        df['is_luxury'] = df['property_level'].apply(lambda x: 1 if x == 1 else 0)
+        return result
 
-        for col in feature_names:
-            if col not in df.columns:
-                df[col] = 0
+    except Exception as e:
 
+        return None
 
-        df = df[feature_names]
 
-        df_enc = target_encoder.transform(df[categorical + numeric])
-        df_enc[numeric] = scaler.transform(df_enc[numeric])
-        df_enc = df_enc.reindex(columns=feature_names, fill_value=0)
+def validate_record(record, min_data=None, max_data=None):
+    """
+    Validate a single listing of a batch request.
 
-        y_pred_log = model.predict(df_enc)[0]
+    Args:
+        record (dict): Listing fields; the building type may be passed as 'type' or 'datatype'.
+        min_data (dict, optional): Lower bounds from RealEstateDB.get_min_max_data().
+        max_data (dict, optional): Upper bounds from RealEstateDB.get_min_max_data().
 
+    Returns:
+        tuple: (validated data or None, list of errors or None)
+    """
+    if not isinstance(record, dict):
+        return None, [{'error': 'Invalid record'}]
 
+    data_dict = {field: record.get(field) for field in REQUIRED_FIELDS}
+    if data_dict['type'] is None:
+        data_dict['type'] = record.get('datatype')
 
-        predicted_price = np.expm1(y_pred_log)
+    try:
+        data_dict = REData(**data_dict).dict()
+    except ValidationError:
+        return None, [{'error': 'Invalid input data'}]
 
-        return {'predicted_price': float(predicted_price), 'warning': warning}
+    data_dict['desc'] = record.get('desc')
 
-    except Exception as e:
+    if min_data is not None and max_data is not None:
+        errors = Utils.validate_input_data_from_model(data_dict, min_data, max_data)
+        if errors:
+            return None, errors
 
-        return None
+    return data_dict, None
+
+
+def predict_many(records, min_data=None, max_data=None):
+    """
+    Validate, featurize and score many listings with a single model call.
+
+    Invalid records are reported individually and do not fail the batch.
 
+    Args:
+        records (list): Listings with the same fields as a single prediction request.
+        min_data (dict, optional): Lower bounds for range validation (skipped when omitted).
+        max_data (dict, optional): Upper bounds for range validation (skipped when omitted).
+
+    Returns:
+        list or None: One result per record in input order, with 'predicted_price' and 'warning'
+        for valid records and 'error' for invalid ones, or None on failure.
+    """
+    try:
+        bundle = get_model_bundle()
+
+        results = []
+        valid_rows = []
+        valid_positions = []
+
+        for index, record in enumerate(records):
+            data, errors = validate_record(record, min_data, max_data)
+            if errors:
+                results.append({'index': index, 'error': errors})
+                continue
+
+            results.append({'index': index})
+            valid_rows.append(data)
+            valid_positions.append(index)
+
+        if not valid_rows:
+            return results
+
+        matrix, row_warnings = bundle.featurizer.transform_many(valid_rows)
+
+        prices = np.expm1(predict_matrix(bundle.model, matrix))
+
+        for position, price, warning in zip(valid_positions, prices, row_warnings):
+            results[position]['predicted_price'] = float(price)
+            results[position]['warning'] = warning
+
+        return results
+
+    except Exception as e:
+        return None
@@ -0,0 +1,194 @@
+# app/ml/model_bundle.py
+import json
+import os
+import sys
+import time
+import types
+import warnings
+import joblib
+import numpy as np
+from app.config import Config
+from app.ml.featurizer import Featurizer
+from app.ml.flat_forest import FlatForest
+
+
+class ModelBundle:
+    """
+    In-memory set of artifacts required for price prediction.
+
+    The bundle is loaded once per process and shared by all requests, so the
+    model, the lookup tables and feature names are not read from disk on
+    every call of `process_model`.
+
+    Inference only needs the exported lookup tables (`lookup_tables.json`)
+    and flattened trees (`price_model_trees.npz`); the pickled model, target
+    encoder and scaler are loaded only for older artifact directories that do
+    not have them.
+
+    Attributes:
+        model: FlatForest evaluator (or the HistGradientBoostingRegressor if it cannot be flattened).
+        featurizer (Featurizer): Pandas-free row builder with the target-encoding and scaling tables.
+        feature_names (list): Feature order expected by the model.
+        load_time (float): Seconds spent loading the artifacts.
+        memory_bytes (int): Approximate memory held by the artifacts.
+        source (str): Directory the artifacts were loaded from.
+        version (str): Registry version of the artifacts ('legacy' for the flat app/ml files).
+        metrics (dict): Evaluation metrics of the model.
+        loaded_at (float): Unix timestamp of the load.
+    """
+
+    ARTIFACTS = {
+        'feature_names': 'feature_names.pkl'
+    }
+    MODEL_FILE = 'price_model.pkl'
+    TREES_FILE = 'price_model_trees.npz'
+    ENCODER_ARTIFACTS = {
+        'target_encoder': 'target_encoder.pkl',
+        'scaler': 'scaler.pkl'
+    }
+    LOOKUP_TABLES = 'lookup_tables.json'
+    METRICS_FILE = 'metrics_results.json'
+
+    def __init__(self, model, featurizer, feature_names, load_time=0.0, memory_bytes=0, source=None,
+                 version='legacy', metrics=None):
+        self.model = model
+        self.featurizer = featurizer
+        self.feature_names = list(feature_names)
+        self.load_time = load_time
+        self.memory_bytes = memory_bytes
+        self.source = source
+        self.version = version
+        self.metrics = metrics or {}
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, directory=None, version='legacy', metrics=None):
+        """
+        Load all artifacts from a directory and measure load time and memory.
+
+        Args:
+            directory (str, optional): Directory with the artifacts (defaults to Config.MODEL_DIR).
+            version (str, optional): Version label of the artifacts.
+            metrics (dict, optional): Model metrics; read from metrics_results.json when omitted.
+
+        Returns:
+            ModelBundle: Loaded bundle.
+        """
+        directory = directory or Config.MODEL_DIR
+
+        start = time.perf_counter()
+        artifacts = {name: joblib.load(os.path.join(directory, file_name))
+                     for name, file_name in cls.ARTIFACTS.items()}
+
+        trees_path = os.path.join(directory, cls.TREES_FILE)
+        if os.path.exists(trees_path):
+            artifacts['model'] = FlatForest.load(trees_path)
+        else:
+            artifacts['model'] = joblib.load(os.path.join(directory, cls.MODEL_FILE))
+            try:
+                artifacts['model'] = FlatForest.from_model(artifacts['model'])
+            except NotImplementedError:
+                pass
+
+        lookup_path = os.path.join(directory, cls.LOOKUP_TABLES)
+        if os.path.exists(lookup_path):
+            featurizer = Featurizer.load(lookup_path)
+        else:
+            encoders = {name: joblib.load(os.path.join(directory, file_name))
+                        for name, file_name in cls.ENCODER_ARTIFACTS.items()}
+            featurizer = Featurizer.from_artifacts(feature_names=artifacts['feature_names'], **encoders)
+        load_time = time.perf_counter() - start
+
+        memory_bytes = _deep_sizeof([artifacts['model'], artifacts['feature_names'], featurizer])
+
+        if metrics is None:
+            metrics_path = os.path.join(directory, cls.METRICS_FILE)
+            if os.path.exists(metrics_path):
+                with open(metrics_path, 'r') as f:
+                    metrics = json.load(f)
+
+        return cls(featurizer=featurizer, load_time=load_time, memory_bytes=memory_bytes, source=directory,
+                   version=version, metrics=metrics, **artifacts)
+
+    def info(self):
+        """
+        Return monitoring information about the bundle.
+
+        Returns:
+            dict: Source directory, load time, memory footprint and feature count.
+        """
+        return {
+            'version': self.version,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'load_time_ms': round(self.load_time * 1000, 3),
+            'memory_bytes': self.memory_bytes,
+            'memory_mb': round(self.memory_bytes / (1024 * 1024), 3),
+            'n_features': len(self.feature_names),
+            'model': self.model.info() if isinstance(self.model, FlatForest) else type(self.model).__name__
+        }
+
+
+def predict_matrix(model, matrix):
+    """
+    Predict with a model on rows built as plain arrays in feature_names order.
+
+    sklearn models fitted on a DataFrame warn that the array has no feature
+    names; the columns are already in the fitted order, so that warning is
+    silenced for this call only.
+
+    Args:
+        model: FlatForest or fitted sklearn regressor.
+        matrix (np.ndarray): Rows of shape (n_rows, n_features).
+
+    Returns:
+        np.ndarray: Predictions.
+    """
+    if isinstance(model, FlatForest):
+        return model.predict(matrix)
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        return model.predict(matrix)
+
+
+def _deep_sizeof(obj):
+    """
+    Approximate the memory held by an object graph, including NumPy buffers.
+
+    Args:
+        obj: Root object.
+
+    Returns:
+        int: Size in bytes.
+    """
+    skip_types = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+    seen = set()
+    stack = [obj]
+    total = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, skip_types):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                stack.append(item.base)
+            if item.dtype == object:
+                stack.extend(item.ravel().tolist())
+            continue
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+
+        if hasattr(item, '__dict__'):
+            stack.append(vars(item))
+
+    return total
+
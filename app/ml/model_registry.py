@@ -0,0 +1,306 @@
+# app/ml/model_registry.py
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import joblib
+from app.config import Config
+from app.ml.featurizer import Featurizer
+from app.ml.flat_forest import FlatForest
+from app.ml.model_bundle import ModelBundle
+from logs.logclass import logger
+
+
+class ModelRegistry:
+    """
+    Registry of versioned model bundles with an atomic in-process swap.
+
+    Every trained model is published into its own directory
+    (`<root>/<version>/`) together with a `manifest.json` holding file
+    checksums and evaluation metrics. The active version is named in the
+    `CURRENT` pointer file. Published directories are never modified, so a
+    reader can never see a mix of old and new artifacts.
+
+    Requests take a reference to the current bundle once and keep using it,
+    so in-flight predictions finish on the version they started with. A
+    reload builds the new bundle off to the side and only then replaces the
+    reference, so it never blocks readers.
+
+    If the registry holds no versions, the flat artifacts in Config.MODEL_DIR
+    are served as version 'legacy'.
+    """
+
+    MANIFEST = 'manifest.json'
+    CURRENT = 'CURRENT'
+
+    def __init__(self, root=None, legacy_dir=None, refresh_interval=None):
+        self.root = root or Config.MODEL_REGISTRY_DIR
+        self.legacy_dir = legacy_dir or Config.MODEL_DIR
+        self.refresh_interval = Config.MODEL_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+
+        self._bundle = None
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._pointer_stamp = None
+        self._next_refresh = 0.0
+
+    def versions(self):
+        """
+        Return the published versions, oldest first.
+
+        Returns:
+            list: Version names.
+        """
+        if not os.path.isdir(self.root):
+            return []
+
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, self.MANIFEST)))
+
+    def active_version(self):
+        """
+        Return the version named in the CURRENT pointer file.
+
+        Returns:
+            str or None: Active version, or None if nothing is published.
+        """
+        pointer = os.path.join(self.root, self.CURRENT)
+        try:
+            with open(pointer, 'r') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def get_manifest(self, version):
+        """
+        Read the manifest of a published version.
+
+        Args:
+            version (str): Version name.
+
+        Returns:
+            dict: Manifest contents.
+        """
+        with open(os.path.join(self.root, version, self.MANIFEST), 'r') as f:
+            return json.load(f)
+
+    def load_version(self, version=None):
+        """
+        Load a bundle for a version after verifying its checksums.
+
+        Args:
+            version (str, optional): Version to load; the active version (or legacy) when omitted.
+
+        Returns:
+            ModelBundle: Loaded bundle.
+        """
+        version = version or self.active_version()
+        if version is None or version == 'legacy':
+            return ModelBundle.load(self.legacy_dir)
+
+        directory = os.path.join(self.root, version)
+        manifest = self.get_manifest(version)
+
+        for name, entry in manifest['files'].items():
+            checksum = _sha256(os.path.join(directory, entry['file']))
+            if checksum != entry['sha256']:
+                raise ValueError(f"Checksum mismatch for {name} in model version {version}")
+
+        return ModelBundle.load(directory, version=version, metrics=manifest.get('metrics', {}))
+
+    def current(self):
+        """
+        Return the bundle serving requests, loading it on first use.
+
+        Callers should take the reference once per request and keep using it,
+        so a concurrent swap does not change the model mid-prediction.
+
+        Returns:
+            ModelBundle: Current bundle.
+        """
+        bundle = self._bundle
+        if bundle is None:
+            with self._load_lock:
+                if self._bundle is None:
+                    self._pointer_stamp = self._read_pointer_stamp()
+                    self._bundle = self.load_version()
+                bundle = self._bundle
+        else:
+            self._refresh_if_changed()
+        return bundle
+
+    def reload(self, version=None):
+        """
+        Load a version and atomically make it the serving bundle.
+
+        The new bundle is loaded while the old one keeps serving requests.
+        If a version is given it also becomes the active one on disk.
+
+        Args:
+            version (str, optional): Version to switch to; re-reads CURRENT when omitted.
+
+        Returns:
+            ModelBundle: Newly active bundle.
+        """
+        with self._reload_lock:
+            if version is not None and version != 'legacy' and version not in self.versions():
+                raise ValueError(f"Unknown model version: {version}")
+
+            stamp = self._read_pointer_stamp()
+            bundle = self.load_version(version)
+
+            if version is not None:
+                self._write_pointer(version)
+                stamp = self._read_pointer_stamp()
+
+            self._pointer_stamp = stamp
+            self._bundle = bundle
+            return bundle
+
+    def publish(self, model, target_encoder, scaler, feature_names, metrics=None, activate=True):
+        """
+        Write a new immutable version directory with its manifest.
+
+        Artifacts are written into a temporary directory that is renamed into
+        place only when complete. The target encoder and scaler are exported
+        into the lookup tables and the model into the flattened trees used at
+        inference; their pickles are kept for reference.
+
+        Args:
+            model: Trained regressor.
+            target_encoder: Fitted target encoder.
+            scaler: Fitted scaler.
+            feature_names (list): Feature order expected by the model.
+            metrics (dict, optional): Evaluation metrics of the model.
+            activate (bool): Whether to point CURRENT at the new version.
+
+        Returns:
+            str: Name of the published version.
+        """
+        os.makedirs(self.root, exist_ok=True)
+
+        version = self._new_version_name()
+        tmp_dir = os.path.join(self.root, f'.tmp-{version}')
+        os.makedirs(tmp_dir)
+
+        try:
+            artifacts = {
+                'model': model,
+                'target_encoder': target_encoder,
+                'scaler': scaler,
+                'feature_names': list(feature_names)
+            }
+
+            files = {}
+            pickles = {'model': ModelBundle.MODEL_FILE, **ModelBundle.ARTIFACTS, **ModelBundle.ENCODER_ARTIFACTS}
+            for name, file_name in pickles.items():
+                path = os.path.join(tmp_dir, file_name)
+                joblib.dump(artifacts[name], path)
+                files[name] = {'file': file_name, 'sha256': _sha256(path)}
+
+            lookup_path = os.path.join(tmp_dir, ModelBundle.LOOKUP_TABLES)
+            Featurizer.from_artifacts(target_encoder, scaler, feature_names).save(lookup_path)
+            files['lookup_tables'] = {'file': ModelBundle.LOOKUP_TABLES, 'sha256': _sha256(lookup_path)}
+
+            try:
+                trees_path = os.path.join(tmp_dir, ModelBundle.TREES_FILE)
+                FlatForest.from_model(model).save(trees_path)
+                files['trees'] = {'file': ModelBundle.TREES_FILE, 'sha256': _sha256(trees_path)}
+            except NotImplementedError:
+                pass
+
+            metrics = metrics or {}
+            with open(os.path.join(tmp_dir, ModelBundle.METRICS_FILE), 'w') as f:
+                json.dump(metrics, f, indent=4)
+
+            manifest = {
+                'version': version,
+                'created_at': datetime.datetime.now().isoformat(),
+                'files': files,
+                'metrics': metrics
+            }
+            with open(os.path.join(tmp_dir, self.MANIFEST), 'w') as f:
+                json.dump(manifest, f, indent=4)
+
+            os.rename(tmp_dir, os.path.join(self.root, version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if activate:
+            self._write_pointer(version)
+
+        return version
+
+    def _refresh_if_changed(self):
+        """
+        Reload in the background when another process moved the CURRENT pointer.
+
+        The pointer stamp only advances when the reload succeeds, so a failed
+        load is retried at the next refresh interval.
+        """
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return
+        self._next_refresh = now + self.refresh_interval
+
+        stamp = self._read_pointer_stamp()
+        if stamp == self._pointer_stamp or self._reload_lock.locked():
+            return
+
+        threading.Thread(target=self._background_reload, daemon=True).start()
+
+    def _background_reload(self):
+        try:
+            self.reload()
+        except Exception as e:
+            logger.log_error(f"Model registry could not reload version {self.active_version()}",
+                             stack_trace=str(e))
+
+    def _read_pointer_stamp(self):
+        try:
+            stat = os.stat(os.path.join(self.root, self.CURRENT))
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, version):
+        os.makedirs(self.root, exist_ok=True)
+        pointer = os.path.join(self.root, self.CURRENT)
+        tmp_pointer = f'{pointer}.tmp'
+        with open(tmp_pointer, 'w') as f:
+            f.write(version)
+        os.replace(tmp_pointer, pointer)
+
+    def _new_version_name(self):
+        base = datetime.datetime.now().strftime('v%Y%m%d-%H%M%S')
+        version, suffix = base, 1
+        while os.path.exists(os.path.join(self.root, version)):
+            suffix += 1
+            version = f'{base}-{suffix}'
+        return version
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+model_registry = ModelRegistry()
+
+
+def get_model_bundle():
+    """
+    Return the process-wide model bundle currently serving requests.
+
+    Returns:
+        ModelBundle: Shared bundle instance.
+    """
+    return model_registry.current()
@@ -0,0 +1,148 @@
+# app/ml/prediction_cache.py
+import threading
+import time
+from collections import OrderedDict
+from app.config import Config
+
+KEY_FIELDS = ['district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'walls']
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results with optional expiry.
+
+    Entries are keyed on the model they were computed with and the
+    canonicalized listing, so repeated quotes skip featurization and
+    inference. When a lookup arrives for a different model than the one the
+    cache holds, the cache is cleared, which invalidates it on every model
+    swap; results of requests still running on the old model are not stored.
+
+    Attributes:
+        maxsize (int): Maximum number of entries.
+        ttl (float): Entry lifetime in seconds (0 disables expiry).
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        self.maxsize = Config.PREDICTION_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = Config.PREDICTION_CACHE_TTL if ttl is None else ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_key = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(input_data):
+        """
+        Build the canonical key of a validated listing.
+
+        Args:
+            input_data (dict): Validated listing with an optional description.
+
+        Returns:
+            tuple: Canonical feature tuple.
+        """
+        values = [input_data.get(field) for field in KEY_FIELDS]
+        values[1:4] = [int(value) for value in values[1:4]]
+        values[4] = float(values[4])
+        return tuple(values) + (input_data.get('desc') or None,)
+
+    def get(self, model_key, key):
+        """
+        Return a cached result.
+
+        Args:
+            model_key: Identifier of the serving model.
+            key (tuple): Listing key from `make_key`.
+
+        Returns:
+            dict or None: Cached result, or None on a miss.
+        """
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            self._check_model(model_key)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, model_key, key, result):
+        """
+        Store a result, evicting the least recently used entries if full.
+
+        Args:
+            model_key: Identifier of the model that produced the result.
+            key (tuple): Listing key from `make_key`.
+            result (dict): Prediction result.
+        """
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            if model_key != self._model_key:
+                return
+
+            self._entries[key] = (dict(result), expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return cache counters for monitoring.
+
+        Returns:
+            dict: Size, limits and hit/miss/eviction counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def _check_model(self, model_key):
+        if model_key != self._model_key:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._model_key = model_key
+
+
+prediction_cache = PredictionCache()
@@ -6,10 +6,10 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-import joblib
 import category_encoders as ce
 from ..utils.utils import Utils
-import json
+from ..utils.pipeline import training_pipeline, DerivedFeatures
+from .model_registry import model_registry
 
 
 
@@ -78,23 +78,11 @@ def calculate_metrics(y_true, y_pred, X_test, baseline_mae=None):
 
 utils = Utils()
 
-df = utils.filter_data()
-
-property_weights = {
-    1: 10.0,
-    2: 5.0,
-    3: 2.0,
-    4: 0.5,
-    5: 0.1
-}
-
-df['property_strength'] = df['property_level'].map(property_weights)
-
-df['high_quality_property'] = df['property_level'].apply(lambda x: 1 if x <= 2 else 0)
-
-df['property_area_factor'] = df['property_strength'] * df['area']
-
-df['is_luxury'] = df['property_level'].apply(lambda x: 1 if x == 1 else 0)
+pipeline = training_pipeline()
+df = utils.cleaned_frame('training', pipeline, categorical=False)
+if pipeline.stats:
+    print(pipeline.report())
+df = DerivedFeatures().process(df)
 
 X = df.drop(columns=['price'])
 
@@ -137,12 +125,11 @@ metrics = calculate_metrics(y_test, y_pred, X_test_enc)
 for metric, value in metrics.items():
     print(f"{metric}: {value:.4f}")
 
-with open("metrics_results.json", "w") as f:
-    json.dump({metric: round(value, 4) for metric, value in metrics.items()}, f, indent=4)
-
-joblib.dump(model, '../price_model.pkl')
-joblib.dump(target_encoder, '../target_encoder.pkl')
-joblib.dump(scaler, '../scaler.pkl')
 feature_names = list(X_train_enc.columns)
-joblib.dump(feature_names, '../feature_names.pkl')
+
+version = model_registry.publish(
+    model, target_encoder, scaler, feature_names,
+    metrics={metric: round(float(value), 4) for metric, value in metrics.items()}
+)
+print(f"Published model version: {version}")
 
@@ -1,5 +1,7 @@
 # app/models/predict/models.py
-import datetime
+
+REQUEST_FIELDS = ['district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'walls']
+
 
 class PredictDB:
     def __init__(self, db):
@@ -9,48 +11,66 @@ class PredictDB:
         self.__cur = db.cursor()
 
 
-    def save_request(self, data):
-        try:
-            data.pop('desc', None)
-            district, rooms, floor, floors, area, datatype, cond, walls = data.values()
-            timestamp = datetime.datetime.now()
+    def reserve_ids(self, count):
+        """
+        Reserve a block of ids for requests and predictions saved later with save_results.
 
-            last_id = self.__cur.execute('SELECT id FROM requests ORDER BY id DESC LIMIT 1').fetchone()
-            if not last_id:
-                last_id = 1
+        Both AUTOINCREMENT sequences are moved past the block, so rows inserted
+        by other connections or processes never take a reserved id.
 
-            last_id = int(last_id[0]) + 1
+        Args:
+            count (int): Number of ids to reserve.
 
-            self.__cur.execute('''
-                INSERT INTO requests (id, district, rooms, floor, floors, area, type, cond, walls, timestamp) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (last_id, district, rooms, floor, floors, area, datatype, cond, walls, timestamp))
+        Returns:
+            int: First id of the block, or None if the reservation failed.
+        """
+        try:
+            self.__cur.execute('BEGIN IMMEDIATE')
+            last_id = self.__cur.execute("""
+                SELECT MAX(COALESCE((SELECT MAX(seq) FROM sqlite_sequence WHERE name IN ('requests', 'predictions')), 0),
+                           COALESCE((SELECT MAX(id) FROM requests), 0),
+                           COALESCE((SELECT MAX(id) FROM predictions), 0))
+            """).fetchone()[0]
+            self.__cur.execute("DELETE FROM sqlite_sequence WHERE name IN ('requests', 'predictions')")
+            self.__cur.executemany('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)',
+                                   [('requests', last_id + count), ('predictions', last_id + count)])
             self.__db.commit()
-            return last_id
+            return last_id + 1
         except Exception as e:
+            self.__db.rollback()
             return None
 
+    def save_results(self, records):
+        """
+        Save prediction requests and their predicted prices under reserved ids in one transaction.
 
-    def save_prediction(self, data, req_id):
-        try:
-            price = data['predicted_price']
-            mean_error, mse = 9521.48 , 59999999
-            timestamp = datetime.datetime.now()
+        Args:
+            records (list): (id, input data, model output, timestamp) tuples; a request
+                and its prediction share the id.
 
-            last_id = self.__cur.execute('SELECT id FROM predictions ORDER BY id DESC LIMIT 1').fetchone()
-            if not last_id:
-                last_id = 1
+        Returns:
+            int: Number of saved predictions.
 
-            last_id = int(last_id[0]) + 1
-            self.__cur.execute('''
-                INSERT INTO predictions (id, price, mean_error, mse, request_id, timestamp) 
+        Raises:
+            Exception: If the records could not be saved; the transaction is rolled back.
+        """
+        try:
+            mean_error, mse = 9521.48 , 59999999
+            self.__cur.executemany('''
+                INSERT INTO requests (id, district, rooms, floor, floors, area, type, cond, walls, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(pr_id, *(data[field] for field in REQUEST_FIELDS), timestamp)
+                  for pr_id, data, result, timestamp in records])
+            self.__cur.executemany('''
+                INSERT INTO predictions (id, price, mean_error, mse, request_id, timestamp)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (last_id, price, mean_error, mse, req_id, timestamp))
+            ''', [(pr_id, result['predicted_price'], mean_error, mse, pr_id, timestamp)
+                  for pr_id, data, result, timestamp in records])
             self.__db.commit()
-            return last_id
-        except Exception as e:
-            print(e)
-            return None
+            return len(records)
+        except Exception:
+            self.__db.rollback()
+            raise
 
     def get_all_data(self):
         try:
@@ -85,6 +105,35 @@ class PredictDB:
         except Exception as e:
             return None
 
+    def get_predict_data_many(self, ids):
+        """
+        Return many predictions with their request data in one query.
+
+        Args:
+            ids (list): (prediction id, request id) pairs.
+
+        Returns:
+            list: Predictions found, in the order of `ids`, or None on error.
+        """
+        try:
+            ids = [(int(predict_id), int(request_id)) for predict_id, request_id in ids]
+            if not ids:
+                return []
+
+            query = f'''
+                SELECT p.*, r.district, r.rooms, r.floor, r.floors, r.area,
+                       r.type, r.cond, r.walls, r.timestamp AS request_timestamp
+                FROM predictions p
+                JOIN requests r ON p.request_id = r.id
+                WHERE p.id IN ({', '.join('?' * len(ids))})
+            '''
+            data = self.__cur.execute(query, [predict_id for predict_id, _ in ids]).fetchall()
+
+            found = {(item['id'], item['request_id']): dict(item) for item in data}
+            return [found[key] for key in ids if key in found]
+        except Exception as e:
+            return None
+
     def get_all_data_search(self, search_data):
         try:
             query = '''
@@ -1,11 +1,77 @@
 # app/models/real_estate/models.py
+import re
+
+
 class RealEstateDB:
+    COLUMNS = ['id', 'price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'walls', 'desc']
+    SORTABLE_COLUMNS = ['id', 'price', 'rooms', 'floor', 'floors', 'area']
+    SEARCH_COLUMNS = ['district', 'type', 'cond', 'walls', 'desc']
+    RANK = 'bm25(real_estate_fts, 10.0, 10.0, 5.0, 5.0, 1.0)'
+
     def __init__(self, db):
         if db is None:
             raise ValueError("Database connection is not established.")
         self.__db = db
         self.__cur = db.cursor()
 
+    def get_page(self, columns, sort='id', descending=False, after=None, limit=100, condition=None, params=()):
+        """
+        Read one page of rows with keyset pagination.
+
+        Rows are ordered by (sort, id); the page starts after the row whose id
+        is `after`, so each page is read through the index instead of
+        skipping the previous pages with OFFSET.
+
+        Args:
+            columns (list): Columns to return, from COLUMNS.
+            sort (str): Column to sort on, from SORTABLE_COLUMNS.
+            descending (bool): Whether to sort in descending order.
+            after (int, optional): Id of the last row of the previous page.
+            limit (int): Maximum number of rows.
+            condition (str, optional): SQL condition the rows must match.
+            params (tuple): Parameters of the condition.
+
+        Returns:
+            list or None: Rows as dicts, or None on error.
+        """
+        try:
+            direction, operator = ('DESC', '<') if descending else ('ASC', '>')
+            conditions = [f'({condition})'] if condition else []
+            args = list(params)
+
+            if after is not None:
+                if sort == 'id':
+                    conditions.append(f'id {operator} ?')
+                    args.append(after)
+                else:
+                    conditions.append(f'({sort}, id) {operator} ((SELECT {sort} FROM real_estate WHERE id = ?), ?)')
+                    args.extend([after, after])
+
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+            order = f'ORDER BY id {direction}' if sort == 'id' else f'ORDER BY {sort} {direction}, id {direction}'
+            data = self.__cur.execute(f"SELECT {', '.join(columns)} FROM real_estate {where} {order} LIMIT ?",
+                                      (*args, limit)).fetchall()
+            return [dict(item) for item in data]
+        except Exception as e:
+            return None
+
+    def count(self, condition=None, params=()):
+        """
+        Count the rows matching a condition.
+
+        Args:
+            condition (str, optional): SQL condition.
+            params (tuple): Parameters of the condition.
+
+        Returns:
+            int or None: Number of rows, or None on error.
+        """
+        try:
+            where = f'WHERE {condition}' if condition else ''
+            return self.__cur.execute(f'SELECT COUNT(*) FROM real_estate {where}', params).fetchone()[0]
+        except Exception as e:
+            return None
+
     def get_all_data(self):
         try:
             data = self.__cur.execute('select * from real_estate').fetchall()
@@ -25,14 +91,88 @@ class RealEstateDB:
 
     def get_all_data_search(self, table_name, search_text):
         try:
-            search_text = f"%{search_text}%"
-            data = self.__cur.execute(f'select * from real_estate where {table_name} LIKE ?', (search_text, )).fetchall()
+            match = self.match_expression(search_text, table_name)
+            if match is None:
+                return None
+
+            data = self.__cur.execute(f"""
+                SELECT r.* FROM real_estate_fts JOIN real_estate r ON r.id = real_estate_fts.rowid
+                WHERE real_estate_fts MATCH ? ORDER BY {self.RANK}, r.id
+            """, (match, )).fetchall()
 
             if data:
                 return [dict(item) for item in data]
         except Exception as e:
             return None
 
+    @classmethod
+    def match_expression(cls, text, column=None):
+        """
+        Build an FTS5 query matching every word of a text as a prefix.
+
+        Args:
+            text (str): Search text.
+            column (str, optional): Column to restrict the search to, from SEARCH_COLUMNS.
+
+        Returns:
+            str or None: MATCH expression, or None if the text has no words or the column is not indexed.
+        """
+        words = re.findall(r'\w+', text.lower())
+        if not words or (column is not None and column not in cls.SEARCH_COLUMNS):
+            return None
+
+        expression = ' '.join(f'"{word}"*' for word in words)
+        return f'"{column}" : ({expression})' if column else expression
+
+    def search_page(self, match, columns, after=None, limit=100):
+        """
+        Read one page of full-text search results, best matches first.
+
+        Rows are ordered by (bm25 rank, id) and paged with the same keyset
+        cursor as `get_page`: the rank of the `after` row is recomputed and
+        the page starts right after it.
+
+        Args:
+            match (str): MATCH expression from `match_expression`.
+            columns (list): Columns to return, from COLUMNS.
+            after (int, optional): Id of the last row of the previous page.
+            limit (int): Maximum number of rows.
+
+        Returns:
+            list or None: Rows as dicts, or None on error.
+        """
+        try:
+            condition, args = '', [match]
+            if after is not None:
+                condition = f"""AND ({self.RANK}, real_estate_fts.rowid) > ((SELECT {self.RANK} FROM real_estate_fts
+                                WHERE real_estate_fts MATCH ? AND rowid = ?), ?)"""
+                args.extend([match, after, after])
+
+            data = self.__cur.execute(f"""
+                SELECT {', '.join(f'r.{column}' for column in columns)}
+                FROM real_estate_fts JOIN real_estate r ON r.id = real_estate_fts.rowid
+                WHERE real_estate_fts MATCH ? {condition}
+                ORDER BY {self.RANK}, real_estate_fts.rowid LIMIT ?
+            """, (*args, limit)).fetchall()
+            return [dict(item) for item in data]
+        except Exception as e:
+            return None
+
+    def count_matches(self, match):
+        """
+        Count the rows matching a full-text search.
+
+        Args:
+            match (str): MATCH expression from `match_expression`.
+
+        Returns:
+            int or None: Number of rows, or None on error.
+        """
+        try:
+            return self.__cur.execute('SELECT COUNT(*) FROM real_estate_fts WHERE real_estate_fts MATCH ?',
+                                      (match, )).fetchone()[0]
+        except Exception as e:
+            return None
 
     def get_search_digit(self, table_name, search_num):
         try:
@@ -48,22 +188,26 @@ class RealEstateDB:
     def get_min_max_data(self):
         try:
 
-            min_result = self.__cur.execute("SELECT MIN(rooms), MIN(floor), MIN(floors), MIN(area) FROM real_estate").fetchone()
-            max_result = self.__cur.execute("SELECT MAX(rooms), MAX(floor), MAX(floors), MAX(area) FROM real_estate").fetchone()
+            result = self.__cur.execute("""
+                SELECT (SELECT MIN(rooms) FROM real_estate), (SELECT MIN(floor) FROM real_estate),
+                       (SELECT MIN(floors) FROM real_estate), (SELECT MIN(area) FROM real_estate),
+                       (SELECT MAX(rooms) FROM real_estate), (SELECT MAX(floor) FROM real_estate),
+                       (SELECT MAX(floors) FROM real_estate), (SELECT MAX(area) FROM real_estate)
+            """).fetchone()
 
-            if min_result and max_result:
+            if result:
                 min_data = {
-                    'min_rooms': min_result[0],
-                    'min_floor': min_result[1],
-                    'min_floors': min_result[2],
-                    'min_area': min_result[3],
+                    'min_rooms': result[0],
+                    'min_floor': result[1],
+                    'min_floors': result[2],
+                    'min_area': result[3],
                 }
 
                 max_data = {
-                    'max_rooms': max_result[0],
-                    'max_floor': max_result[1],
-                    'max_floors': max_result[2],
-                    'max_area': max_result[3],
+                    'max_rooms': result[4],
+                    'max_floor': result[5],
+                    'max_floors': result[6],
+                    'max_area': result[7],
                 }
 
                 return min_data, max_data
@@ -71,6 +215,27 @@ class RealEstateDB:
         except Exception as e:
             return None
 
+    def get_descriptions(self, ids):
+        """
+        Read the descriptions of many rows in one query.
+
+        Args:
+            ids (list): Row ids.
+
+        Returns:
+            dict or None: Row id to description, or None on error.
+        """
+        try:
+            ids = [int(row_id) for row_id in ids]
+            if not ids:
+                return {}
+
+            data = self.__cur.execute(f"SELECT id, desc FROM real_estate WHERE id IN ({', '.join('?' * len(ids))})",
+                                      ids).fetchall()
+            return {row[0]: row[1] for row in data}
+        except Exception as e:
+            return None
+
     def get_data_from_id(self, num_id):
         try:
             search_value = int(num_id)
@@ -80,3 +245,59 @@ class RealEstateDB:
                 return [dict(item) for item in data]
         except Exception as e:
             return None
+
+
+class DescriptionFeaturesDB:
+    """
+    Cache of the description-based features of real_estate rows.
+
+    Rows are keyed by the hash of the description and tagged with the hash of
+    the pattern set they were computed with, so entries for unchanged
+    descriptions are reused and all of them are dropped once the patterns
+    change.
+    """
+
+    def __init__(self, db):
+        if db is None:
+            raise ValueError("Database connection is not established.")
+        self.__db = db
+        self.__cur = db.cursor()
+
+    def create_table(self):
+        try:
+            self.__cur.execute('''
+                CREATE TABLE IF NOT EXISTS description_features (
+                    desc_hash TEXT PRIMARY KEY,
+                    pattern_hash TEXT NOT NULL,
+                    property_level INTEGER NOT NULL,
+                    warning TEXT
+                ) WITHOUT ROWID
+            ''')
+            self.__db.commit()
+            return True
+        except Exception as e:
+            return None
+
+    def get_features(self, pattern_hash):
+        try:
+            stale = self.__cur.execute('SELECT 1 FROM description_features WHERE pattern_hash != ? LIMIT 1',
+                                       (pattern_hash, )).fetchone()
+            if stale:
+                self.__cur.execute('DELETE FROM description_features WHERE pattern_hash != ?', (pattern_hash, ))
+                self.__db.commit()
+
+            data = self.__cur.execute('SELECT desc_hash, property_level, warning FROM description_features').fetchall()
+            return {item[0]: (item[1], item[2]) for item in data}
+        except Exception as e:
+            return None
+
+    def save_features(self, pattern_hash, features):
+        try:
+            self.__cur.executemany('''
+                INSERT OR REPLACE INTO description_features (desc_hash, pattern_hash, property_level, warning)
+                VALUES (?, ?, ?, ?)
+            ''', [(desc_hash, pattern_hash, level, warning) for desc_hash, level, warning in features])
+            self.__db.commit()
+            return True
+        except Exception as e:
+            return None
@@ -1,5 +1,7 @@
 # app/models/users/models.py
 class UserDB:
+    PREDICTIONS_SCHEMA = 'predictions_db'
+
     def __init__(self, db):
         if db is None:
             raise ValueError("Database connection is not established.")
@@ -18,6 +20,19 @@ class UserDB:
         except Exception as e:
             return None
 
+    def add_user_predictions_many(self, links):
+        try:
+            links = [(int(user_id), int(req_id), int(pr_id)) for user_id, req_id, pr_id in links]
+            self.__cur.executemany('''
+                INSERT INTO user_predictions (user_id, request_id, prediction_id)
+                VALUES (?, ?, ?)
+            ''', links)
+            self.__db.commit()
+            return len(links)
+        except Exception as e:
+            self.__db.rollback()
+            return None
+
     def get_user_predictions(self, user_id):
         try:
             user_pr_data = self.__cur.execute('select * from user_predictions where user_id = ? ORDER BY id DESC', (user_id, )).fetchall()
@@ -26,6 +41,40 @@ class UserDB:
         except Exception as e:
             return None
 
+    def get_prediction_history(self, user_id, after=None, limit=-1):
+        """
+        Return the predictions of a user, newest first, joined with the predictions
+        database attached to the connection as `predictions_db`.
+
+        Args:
+            user_id (int): User id.
+            after (int, optional): `history_id` of the last prediction already received.
+            limit (int, optional): Maximum number of predictions; all of them by default.
+
+        Returns:
+            list: Predictions with their request data and `history_id`, or None on error.
+        """
+        try:
+            user_id = int(user_id)
+            condition, params = 'up.user_id = ?', (user_id,)
+            if after is not None:
+                condition, params = condition + ' AND up.id < ?', params + (int(after),)
+
+            query = f'''
+                SELECT up.id AS history_id, p.*, r.district, r.rooms, r.floor, r.floors, r.area,
+                       r.type, r.cond, r.walls, r.timestamp AS request_timestamp
+                FROM user_predictions up
+                JOIN {self.PREDICTIONS_SCHEMA}.predictions p ON p.id = up.prediction_id
+                JOIN {self.PREDICTIONS_SCHEMA}.requests r ON r.id = up.request_id AND r.id = p.request_id
+                WHERE {condition}
+                ORDER BY up.id DESC
+                LIMIT ?
+            '''
+            data = self.__cur.execute(query, params + (int(limit),)).fetchall()
+            return [dict(item) for item in data]
+        except Exception as e:
+            return None
+
     def get_user_data_from_id(self, user_id):
         try:
             user_id = int(user_id)
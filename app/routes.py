@@ -1,11 +1,11 @@
 # app/route.py
 from flask import *
 from flask_login import login_required, current_user
-from .services.services import predict_pr, real_estate_data, predictions_data, statistics_data, predict_user, \
-     get_user_data, del_user_pr, delete_predictions
+from .ml.model_registry import get_model_bundle
+from .services.services import predict_pr, predict_batch, real_estate_data, predictions_data, statistics_data, predict_user, \
+     get_user_data, del_user_pr, delete_predictions, model_status_data, reload_model
 from logs.logclass import logger
 from werkzeug.exceptions import HTTPException
-import json
 
 predict = Blueprint('predict', __name__)
 
@@ -17,8 +17,7 @@ def index():
     try:
         logger.log_request(request)
 
-        with open('app/ml/metrics_results.json', 'r') as f:
-            metrics = json.load(f)
+        metrics = get_model_bundle().metrics
 
         return render_template('main.html', title='Home', metrics=metrics, style_href='css/main.css',
                                js_href1='js/main/main.js', js_href2='js/main/faq.js')
@@ -32,8 +31,7 @@ def predict_():
     try:
         logger.log_request(request)
 
-        with open('app/ml/metrics_results.json', 'r') as f:
-            metrics = json.load(f)
+        metrics = get_model_bundle().metrics
 
         return render_template('predict.html', title='Predict',
                                style_href='css/predict.css', metrics=metrics, js_href1='js/predict/predict_form.js',
@@ -48,10 +46,7 @@ def get_predict():
     try:
         logger.log_request(request)
 
-        db_re = g.get_db('real_estate')
-        db_pr = g.get_db('predictions')
-        db_us = g.get_db('users')
-        response, status_code = predict_pr(request, db_re, db_pr, db_us)
+        response, status_code = predict_pr(request)
         import time
         time.sleep(3.35)
         return jsonify(response), status_code
@@ -59,6 +54,19 @@ def get_predict():
         logger.log_error("Internal Server Error", stack_trace=str(e))
 
 
+@predict.route('/predict_batch', methods=['POST'])
+def predict_batch_():
+    try:
+        logger.log_request(request)
+
+        db_re = g.get_db('real_estate')
+        response, status_code = predict_batch(request, db_re)
+
+        return jsonify(response), status_code
+    except Exception as e:
+        logger.log_error("Internal Server Error", stack_trace=str(e))
+
+
 @predict.route('/user_predictions', methods=['GET'])
 def user_predictions():
     try:
@@ -67,8 +75,13 @@ def user_predictions():
         db_pr = g.get_db('predictions')
         db_us = g.get_db('users')
         response, status_code = predict_user(request, db_pr, db_us)
+        if status_code != 200:
+            return jsonify(response), status_code
 
-        return jsonify(response), status_code
+        headers = {}
+        if response['next'] is not None:
+            headers['X-Next-Cursor'] = str(response['next'])
+        return jsonify(response['records']), status_code, headers
     except Exception as e:
         logger.log_error("Internal Server Error", stack_trace=str(e))
 
@@ -106,8 +119,13 @@ def sort_dataframe():
 
         db = g.get_db('real_estate')
         response, status_code = real_estate_data(request, db)
+        if status_code != 200:
+            return jsonify(response), status_code
 
-        return jsonify(response), status_code
+        headers = {'X-Total-Count': str(response['total'])}
+        if response['next'] is not None:
+            headers['X-Next-Cursor'] = str(response['next'])
+        return jsonify(response['records']), status_code, headers
     except Exception as e:
         logger.log_error("Internal Server Error", stack_trace=str(e))
 
@@ -163,6 +181,32 @@ def get_statistics():
 
 
 
+@predict.route('/model_status', methods=['GET'])
+@login_required
+def model_status():
+    try:
+        logger.log_request(request)
+
+        response, status_code = model_status_data()
+
+        return jsonify(response), status_code
+    except Exception as e:
+        logger.log_error("Internal Server Error", stack_trace=str(e))
+
+
+@predict.route('/reload_model', methods=['POST'])
+@login_required
+def reload_model_():
+    try:
+        logger.log_request(request)
+
+        response, status_code = reload_model(request)
+
+        return jsonify(response), status_code
+    except Exception as e:
+        logger.log_error("Internal Server Error", stack_trace=str(e))
+
+
 @predict.route('/get_user', methods=['POST', 'GET'])
 @login_required
 def get_user():
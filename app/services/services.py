@@ -3,37 +3,50 @@ import json
 
 from flask import session, url_for
 from flask_login import current_user
+import numpy as np
 import pandas as pd
 
 from ..controllers.real_estate_controller import Controller
 from ..models.real_estate.models import RealEstateDB
 from ..models.predicts.models import PredictDB
-from ..ml.ml_service import process_model
+from ..config import Config
+from ..ml.ml_service import process_model, predict_many
+from ..ml.model_registry import get_model_bundle, model_registry
+from ..ml.prediction_cache import prediction_cache
 from ..utils.utils import Utils
+from ..utils.dataset_cache import cleaned_real_estate_data, feature_bounds
+from ..database.prediction_writer import prediction_writer
+from ..database.dbconnection import db_instance
 from logs.logclass import logger
 from ..models.users.model import UserDB
 
 
 def real_estate_data(req, db):
     """
-    Handles requests for retrieving, filtering, and searching real estate data.
+    Handles requests for retrieving, filtering, and searching real estate data, one page at a time.
+
+    Without a search or filter the cleaned listings are paged from the in-memory dataset;
+    filters and searches page through the real_estate table. Text searches use the
+    full-text index and are ranked by relevance unless a sort column is given.
 
     Args:
-        req: HTTP request with method and form parameters.
+        req: HTTP request with method, form parameters and the pagination parameters
+            'limit', 'after', 'columns', 'sort' and 'order'.
         db: Database connection.
 
     Returns:
-        tuple: (results or error message, HTTP status code)
+        tuple: (page with 'records', 'total' and 'next' cursor, or error message, HTTP status code)
     """
     try:
         if not req:
             return {'error': 'Invalid input'}, 400
 
-        re_data = []
         re_db = RealEstateDB(db)
         utils = Utils()
 
-        re_data = utils.real_estate_data_filter()
+        page = utils.parse_page_args(req.values)
+        if page is None:
+            return {'error': 'Invalid pagination parameters'}, 400
 
         if req.method == 'POST':
 
@@ -42,13 +55,15 @@ def real_estate_data(req, db):
             if not datatype:
                 return {'error': 'Invalid input'}, 400
 
+            condition, params, match = None, (), None
+
             if datatype == 'filter':
                 filter_type = req.form.get('filter_value')
                 filter_text = utils.process_filter_text(filter_type)
                 if not filter_text:
                     return {'error': 'Invalid input filter value'}, 400
 
-                re_data = re_db.get_all_data_filter(filter_text)
+                page['columns'] = ['id', filter_text]
 
             elif datatype == 'search':
                 search_value = req.form.get('search_value').lower()
@@ -64,34 +79,132 @@ def real_estate_data(req, db):
                         found_table_name, search_value_type = utils.filter_numbers_by_range(search_value_type)
                         if not search_value_type:
                             return {'error': 'No data found'}, 404
-                    re_data = re_db.get_search_digit(found_table_name, search_value_type)
+                    condition, params = f'{found_table_name} = ?', (int(search_value_type),)
 
                 else:
-                    if found_table_name is None:
-                        found_table_name, search_value_type = utils.search_text_filter(search_value_type)
-                        if not search_value_type:
-                            return {'error': 'No data found'}, 404
-                    re_data = re_db.get_all_data_search(found_table_name, search_value_type)
+                    match = re_db.match_expression(search_value_type, found_table_name)
+                    if match is None:
+                        return {'error': 'No data found'}, 404
             else:
                 return {'error': 'Invalid data type'}, 400
 
-        if not re_data:
+            if match is not None and page['sort'] is None:
+                records = re_db.search_page(match, page['columns'], page['after'], page['limit'] + 1)
+                total = re_db.count_matches(match)
+            else:
+                if match is not None:
+                    condition = 'id IN (SELECT rowid FROM real_estate_fts WHERE real_estate_fts MATCH ?)'
+                    params = (match,)
+                records = re_db.get_page(page['columns'], page['sort'] or 'id', page['descending'], page['after'],
+                                         page['limit'] + 1, condition, params)
+                total = re_db.count(condition, params)
+            if records is None or total is None:
+                return {'error': 'No data found'}, 404
+        else:
+            records, total = cleaned_page(page, re_db)
+            if records is None:
+                return {'error': 'Invalid cursor'}, 400
+
+        if not records and page['after'] is None:
             return {'error': 'No data found'}, 404
 
-        return re_data, 200
+        has_more = len(records) > page['limit']
+        records = records[:page['limit']]
+
+        return {'records': records, 'total': total, 'next': records[-1]['id'] if has_more else None}, 200
     except Exception as e:
         logger.log_error("Internal server error in services", stack_trace=str(e))
 
 
-def predict_pr(req, db_re, db_pr, db_us):
+def cleaned_page(page, re_db):
+    """
+    Reads one page of the cleaned listings with keyset pagination.
+
+    The order of the rows for every sort column is computed once per dataset
+    build; a page is located from the rank of the `after` row, so its cost
+    does not depend on how deep the page is.
+
+    Args:
+        page (dict): Page parameters from `Utils.parse_page_args`.
+        re_db (RealEstateDB): Real estate database the descriptions are read from.
+
+    Returns:
+        tuple: (records, including one extra row if more pages follow, or None for an unknown cursor; total rows)
+    """
+    df = cleaned_real_estate_data.get()
+    sort = page['sort'] or 'id'
+    order, ranks = cleaned_real_estate_data.derived(f'order:{sort}', lambda data: sort_order(data, sort))
+    total = len(df)
+
+    start = 0
+    if page['after'] is not None:
+        ids = cleaned_real_estate_data.derived('ids', lambda data: pd.Index(data['id']))
+        position = ids.get_indexer([page['after']])[0]
+        if position < 0:
+            return None, total
+        start = ranks[position] + 1 if not page['descending'] else total - ranks[position]
+
+    if page['descending']:
+        order = order[::-1]
+
+    rows = order[start:start + page['limit'] + 1]
+    columns = [column for column in page['columns'] if column != 'desc']
+    records = Utils.to_records(df.iloc[rows][columns])
+    if 'desc' in page['columns']:
+        records = with_descriptions(records, re_db)
+    return records, total
+
+
+def with_descriptions(records, re_db):
+    """
+    Adds the description of every record, read from the real_estate table.
+
+    The cleaned listings dataset leaves the free-text descriptions out, so
+    they are only read for the rows returned.
+
+    Args:
+        records (list): Records with an 'id'.
+        re_db (RealEstateDB): Real estate database.
+
+    Returns:
+        list: The records, each with its 'desc'.
+    """
+    descriptions = re_db.get_descriptions([record['id'] for record in records])
+    if descriptions is None:
+        raise RuntimeError('Could not read listing descriptions')
+
+    for record in records:
+        record['desc'] = descriptions.get(record['id'])
+    return records
+
+
+def sort_order(df, column):
+    """
+    Computes the ascending (column, id) order of a dataset and the rank of every row in it.
+
+    Args:
+        df (pd.DataFrame): Dataset with an 'id' column.
+        column (str): Sort column.
+
+    Returns:
+        tuple: (row positions in order, rank of each row)
+    """
+    order = np.lexsort((df['id'].to_numpy(), df[column].to_numpy()))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return order, ranks
+
+
+def predict_pr(req):
     """
     Processes a POST request to predict real estate value based on input data.
 
+    The prediction is saved in the background by the prediction writer; its ids are
+    assigned before the response is returned. No request connection is needed: the
+    feature bounds are cached and the writer uses its own connections.
+
     Args:
         req: HTTP request (expected to be POST with JSON or form data).
-        db_re: Connection to the real estate data database.
-        db_pr: Connection to the database for storing predictions.
-        db_us: Connection to the user database.
 
     Returns:
         tuple: (prediction result or error message, HTTP status code)
@@ -107,8 +220,7 @@ def predict_pr(req, db_re, db_pr, db_us):
         input_data = None
         controller = Controller(req)
 
-        re_con = RealEstateDB(db_re)
-        min_data, max_data = re_con.get_min_max_data()
+        min_data, max_data = feature_bounds.get()
 
         if json_data:
             input_data = controller.filter_input_data_json(min_data, max_data)
@@ -123,15 +235,13 @@ def predict_pr(req, db_re, db_pr, db_us):
         if 'error_list' in input_data:
             return input_data, 422
 
-        result = process_model(input_data, db_re)
+        result = process_model(input_data)
 
         if result is None:
             return {'error': 'Data processing error'}, 422
 
-        rec_pr = PredictDB(db_pr)
-
-        last_id_req = rec_pr.save_request(input_data)
-        last_id_pr = rec_pr.save_prediction(result, last_id_req)
+        user_id = current_user.get_id() if current_user.is_authenticated else None
+        last_id_req, last_id_pr = prediction_writer.submit(input_data, result, user_id)
 
         predict_list = session.get('predictions', [])
         predict_info = {
@@ -142,12 +252,46 @@ def predict_pr(req, db_re, db_pr, db_us):
 
         session['predictions'] = predict_list
 
-        if current_user.is_authenticated:
-            user_db = UserDB(db_us)
-            user_db.add_user_predictions(current_user.get_id(), last_id_req, last_id_pr)
+        return result, 201
 
+    except Exception as e:
+        logger.log_error("Internal server error in services", stack_trace=str(e))
 
-        return result, 201
+
+def predict_batch(req, db_re):
+    """
+    Processes a POST request with many listings and predicts their prices in one model call.
+
+    Args:
+        req: HTTP request with a JSON list of listings or a JSON object with a 'records' list.
+        db_re: Connection to the real estate data database.
+
+    Returns:
+        tuple: (per-record predictions and errors or error message, HTTP status code)
+    """
+    try:
+        if req is None or req.method != 'POST':
+            return {'error': 'Invalid input data'}, 400
+
+        json_data = req.get_json(silent=True)
+        records = json_data.get('records') if isinstance(json_data, dict) else json_data
+
+        if not isinstance(records, list) or not records:
+            return {'error': 'Invalid input'}, 400
+
+        if len(records) > Config.PREDICT_BATCH_LIMIT:
+            return {'error': f'Too many records, the limit is {Config.PREDICT_BATCH_LIMIT}'}, 413
+
+        min_data, max_data = feature_bounds.get()
+
+        results = predict_many(records, min_data, max_data)
+
+        if results is None:
+            return {'error': 'Data processing error'}, 422
+
+        failed = sum(1 for item in results if 'error' in item)
+
+        return {'predictions': results, 'count': len(results), 'failed': failed}, 200
 
     except Exception as e:
         logger.log_error("Internal server error in services", stack_trace=str(e))
@@ -168,6 +312,8 @@ def predictions_data(req, db):
         if not req:
             return {'error': 'Invalid input'}, 400
 
+        prediction_writer.flush(Config.PREDICTION_QUEUE_TIMEOUT)
+
         pr_data = []
         pr_db = PredictDB(db)
         pr_data = pr_db.get_all_data()
@@ -206,134 +352,155 @@ def statistics_data(db):
         tuple: (dictionary with statistics or error message, HTTP status code)
     """
     try:
-        utils = Utils()
-
-        re_data = utils.real_estate_data_filter()
+        re_data = cleaned_real_estate_data.get()
 
-        if not re_data:
+        if re_data.empty:
             return {'error': 'No data found'}, 404
 
-        df = pd.DataFrame(re_data)
-
-        top_expensive = df.nlargest(5, 'price')[
-            ['id', 'price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'desc']].to_dict(orient='records')
-
-        top_cheap = df.nsmallest(5, 'price')[
-            ['id', 'price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'desc']].to_dict(orient='records')
-
-        avg_price_district = df.groupby('district')['price'].mean().to_dict()
-
-        type_distribution = df['type'].value_counts().to_dict()
-        condition_distribution = df['cond'].value_counts().to_dict()
-        rooms_distribution = df['rooms'].value_counts().to_dict()
-        floors_distribution = df['floors'].value_counts().to_dict()
-        floor_distribution = df['floor'].value_counts().to_dict()
-
-        area_bins = pd.cut(df['area'], bins=[0, 30, 50, 70, 100, 150, 200, float('inf')])
-        area_distribution = area_bins.value_counts(sort=False).astype(int).to_dict()
-        area_distribution = {f"{interval.left}-{interval.right}": count for interval, count in area_distribution.items()}
-
-        summary_stats = {
-            'price': {
-                'min': float(df['price'].min()),
-                'max': float(df['price'].max()),
-                'mean': float(df['price'].mean())
-            },
-            'area': {
-                'min': float(df['area'].min()),
-                'max': float(df['area'].max()),
-                'mean': float(df['area'].mean())
-            },
-            'floor': {
-                'min': int(df['floor'].min()),
-                'max': int(df['floor'].max()),
-                'mean': float(df['floor'].mean())
-            },
-            'floors': {
-                'min': int(df['floors'].min()),
-                'max': int(df['floors'].max()),
-                'mean': float(df['floors'].mean())
-            },
-            'rooms': {
-                'min': int(df['rooms'].min()),
-                'max': int(df['rooms'].max()),
-                'mean': float(df['rooms'].mean())
-            }
-        }
-
-        statistics = {
-            'top_expensive': top_expensive,
-            'top_cheap': top_cheap,
-            'avg_price_district': avg_price_district,
-            'type_distribution': type_distribution,
-            'condition_distribution': condition_distribution,
-            'rooms_distribution': rooms_distribution,
-            'floors_distribution': floors_distribution,
-            'floor_distribution': floor_distribution,
-            'area_distribution': area_distribution,
-            'summary_stats': summary_stats
-        }
-
-        return statistics, 200
+        re_db = RealEstateDB(db)
+        return cleaned_real_estate_data.derived('statistics', lambda data: build_statistics(data, re_db)), 200
 
     except Exception as e:
         logger.log_error("Internal server error in services", stack_trace=str(e))
 
 
+def build_statistics(df, re_db):
+    """
+    Computes the statistics shown on the statistics page.
+
+    Args:
+        df (pd.DataFrame): Cleaned real estate data, as loaded from its snapshot.
+        re_db (RealEstateDB): Real estate database the descriptions of the top listings are read from.
+
+    Returns:
+        dict: Top listings, distributions and summary statistics.
+    """
+    top_expensive = with_descriptions(Utils.to_records(df.nlargest(5, 'price')[
+        ['id', 'price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond']]), re_db)
+
+    top_cheap = with_descriptions(Utils.to_records(df.nsmallest(5, 'price')[
+        ['id', 'price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond']]), re_db)
+
+    avg_price_district = df.groupby('district', observed=True)['price'].mean().to_dict()
+
+    type_distribution = df['type'].value_counts().to_dict()
+    condition_distribution = df['cond'].value_counts().to_dict()
+    rooms_distribution = df['rooms'].value_counts().to_dict()
+    floors_distribution = df['floors'].value_counts().to_dict()
+    floor_distribution = df['floor'].value_counts().to_dict()
+
+    area_bins = pd.cut(df['area'], bins=[0, 30, 50, 70, 100, 150, 200, float('inf')])
+    area_distribution = area_bins.value_counts(sort=False).astype(int).to_dict()
+    area_distribution = {f"{interval.left}-{interval.right}": count for interval, count in area_distribution.items()}
+
+    summary_stats = {
+        'price': {
+            'min': float(df['price'].min()),
+            'max': float(df['price'].max()),
+            'mean': float(df['price'].mean())
+        },
+        'area': {
+            'min': float(df['area'].min()),
+            'max': float(df['area'].max()),
+            'mean': float(df['area'].mean())
+        },
+        'floor': {
+            'min': int(df['floor'].min()),
+            'max': int(df['floor'].max()),
+            'mean': float(df['floor'].mean())
+        },
+        'floors': {
+            'min': int(df['floors'].min()),
+            'max': int(df['floors'].max()),
+            'mean': float(df['floors'].mean())
+        },
+        'rooms': {
+            'min': int(df['rooms'].min()),
+            'max': int(df['rooms'].max()),
+            'mean': float(df['rooms'].mean())
+        }
+    }
+
+    statistics = {
+        'top_expensive': top_expensive,
+        'top_cheap': top_cheap,
+        'avg_price_district': avg_price_district,
+        'type_distribution': type_distribution,
+        'condition_distribution': condition_distribution,
+        'rooms_distribution': rooms_distribution,
+        'floors_distribution': floors_distribution,
+        'floor_distribution': floor_distribution,
+        'area_distribution': area_distribution,
+        'summary_stats': summary_stats
+    }
+
+    return statistics
+
 
 def predict_user(req, db_pr, db_us):
     """
-    Returns a list of user predictions (for an authenticated user or guest).
+    Returns the predictions of the current user (authenticated user or guest), newest first.
+
+    The history of an authenticated user is read in one query joining user_predictions
+    with the attached predictions database; a guest's session list is read in one query too.
+    Without a 'limit' parameter the whole history is returned.
 
     Args:
-        req: HTTP request (expected to be a GET method).
+        req: HTTP request (expected to be a GET method) with optional 'limit' and 'after'
+            (cursor returned with the previous page) parameters.
         db_pr: Connection to the predictions database.
-        db_us: Connection to the user database.
+        db_us: Connection to the user database, with the predictions database attached.
 
     Returns:
-        tuple: (list of predictions or error message, HTTP status code)
+        tuple: (page with 'records' and 'next' cursor, or error message, HTTP status code)
     """
     try:
         if req is None or req.method != 'GET':
             return {'error': 'Invalid input'}, 400
 
-        data_list = []
+        try:
+            limit = int(req.args.get('limit') or -1)
+            after = req.args.get('after')
+            after = int(after) if after not in (None, '') else None
+        except ValueError:
+            return {'error': 'Invalid pagination parameters'}, 400
 
-        pr_db = PredictDB(db_pr)
+        if limit == 0 or limit < -1 or limit > Config.HISTORY_PAGE_LIMIT or (after is not None and after < 0):
+            return {'error': 'Invalid pagination parameters'}, 400
+
+        prediction_writer.flush(Config.PREDICTION_QUEUE_TIMEOUT)
+
+        next_cursor = None
 
         if current_user.is_authenticated:
             user_db = UserDB(db_us)
-            req_pr_list = user_db.get_user_predictions(current_user.get_id())
-            if not req_pr_list:
+            history = user_db.get_prediction_history(current_user.get_id(), after, limit + 1 if limit > 0 else -1)
+            if not history:
                 return {'error': 'No data found'}, 404
 
-            user_pr_list = []
-
-            for item in req_pr_list:
-                req_id = item['request_id']
-                pr_id = item['prediction_id']
-
-                user_pr_list.append(pr_db.get_predict_data(pr_id, req_id))
+            if 0 < limit < len(history):
+                history = history[:limit]
+                next_cursor = history[-1]['history_id']
 
-            data_list = user_pr_list
+            data_list = [[item] for item in history]
             data_list.append({'user': 'authenticated'})
         else:
-            session_data = session.get('predictions', [])
+            session_data = session.get('predictions', [])[::-1]
 
-            if not session_data:
-                return {'error': 'No data found'}, 404
-
-            last_request_id = [item['last_id_pr'] for item in session_data[::-1]]
-            last_request_req = [item['last_id_req'] for item in session_data[::-1]]
+            start = after or 0
+            end = start + limit if limit > 0 else len(session_data)
+            if end < len(session_data):
+                next_cursor = end
 
-            for i in range(len(last_request_id)):
-                data_list.append(pr_db.get_predict_data(last_request_id[i], last_request_req[i]))
+            ids = [(item['last_id_pr'], item['last_id_req']) for item in session_data[start:end]]
+            history = PredictDB(db_pr).get_predict_data_many(ids)
+            if not history:
+                return {'error': 'No data found'}, 404
 
+            data_list = [[item] for item in history]
             data_list.append({'user': 'not authenticated'})
-        if not data_list:
-            return {'error': 'No data found'}, 404
 
-        return data_list, 200
+        return {'records': data_list, 'next': next_cursor}, 200
     except Exception as e:
         logger.log_error("Internal server error in services", stack_trace=str(e))
 
@@ -396,6 +563,8 @@ def del_user_pr(req, db_us, db_pr):
 
         predict_id = data['request_id']
 
+        prediction_writer.flush(Config.PREDICTION_QUEUE_TIMEOUT)
+
         user_db = UserDB(db_us)
         prediction_db = PredictDB(db_pr)
 
@@ -442,6 +611,8 @@ def delete_predictions(req, db_us, db_pr):
         if not all([delete_mode, value]):
             return {'error': 'Invalid input data'}, 400
 
+        prediction_writer.flush(Config.PREDICTION_QUEUE_TIMEOUT)
+
         user_db = UserDB(db_us)
         pred_db = PredictDB(db_pr)
 
@@ -472,3 +643,58 @@ def delete_predictions(req, db_us, db_pr):
 
     except Exception as e:
         logger.log_error("Internal server error in services", stack_trace=str(e))
+
+
+def model_status_data():
+    """
+    Returns monitoring information about the in-memory model bundle. Admin access required.
+
+    Returns:
+        tuple: (model bundle information or error message, HTTP status code)
+    """
+    try:
+        if not current_user.is_admin():
+            return {'error': 'Access denied: insufficient permissions'}, 403
+
+        bundle = get_model_bundle()
+        if bundle is None:
+            return {'error': 'Model is not loaded'}, 503
+
+        data = bundle.info()
+        data['versions'] = model_registry.versions()
+        data['prediction_cache'] = prediction_cache.stats()
+        data['prediction_writer'] = prediction_writer.stats()
+        data['db_pools'] = db_instance.stats()
+
+        return data, 200
+    except Exception as e:
+        logger.log_error("Internal server error in services", stack_trace=str(e))
+
+
+def reload_model(req):
+    """
+    Switches the serving model to another registry version without downtime. Admin access required.
+
+    Args:
+        req: HTTP request with optional form parameter 'version' (defaults to the active version on disk).
+
+    Returns:
+        tuple: (information about the new bundle or error message, HTTP status code)
+    """
+    try:
+        if req is None or req.method != 'POST':
+            return {'error': 'Invalid input data'}, 400
+
+        if not current_user.is_admin():
+            return {'error': 'Access denied: insufficient permissions'}, 403
+
+        version = req.form.get('version') or None
+
+        try:
+            bundle = model_registry.reload(version)
+        except (ValueError, FileNotFoundError) as e:
+            return {'error': str(e)}, 422
+
+        return bundle.info(), 200
+    except Exception as e:
+        logger.log_error("Internal server error in services", stack_trace=str(e))
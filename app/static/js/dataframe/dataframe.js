@@ -1,6 +1,9 @@
 let loadedRecords = 0;
 let totalRecords = 0;
+let nextCursor = null;
+let currentQuery = null;
 const recordsPerPage = 100;
+const maxRecordsPerPage = 1000;
 
 function showLoading() {
     document.body.classList.add("loading");
@@ -12,71 +15,49 @@ function hideLoading() {
     document.getElementById('loadingAnimation').style.display = 'none';
 }
 
-function searchData() {
-    const searchValue = document.getElementById('searchInput').value.trim();
-
-    if (!searchValue) {
-        toastr.options = {
-            "closeButton": true,
-            "preventDuplicates": true,
-            "hideEasing": "linear"
-        };
-        toastr.error('Please check the entered values and try again.', 'Error!');
-        return;
+function fetchPage(query, limit, after = null) {
+    const params = new URLSearchParams(query || {});
+    params.set('limit', limit);
+    if (after !== null) {
+        params.set('after', after);
     }
 
-    showLoading();
+    const request = query
+        ? fetch('/sort_dataframe', { method: 'POST', body: params })
+        : fetch(`/sort_dataframe?${params.toString()}`, { method: 'GET' });
 
-    fetch('/sort_dataframe', {
-        method: 'POST',
-        body: new URLSearchParams({
-            datatype: 'search',
-            search_value: searchValue
-        })
-    })
-    .then(response => response.json())
-    .then(data => {
-        hideLoading();
+    return request.then(response => response.json().then(data => ({
+        data: data,
+        total: parseInt(response.headers.get('X-Total-Count'), 10) || 0,
+        next: response.headers.get('X-Next-Cursor')
+    })));
+}
 
-        if (data.error) {
-            toastr.error('Information not found', 'Error!');
-            return;
-        }
+function showPage(page, append) {
+    totalRecords = page.total;
+    nextCursor = page.next;
 
-        renderTable(data);
-        loadedRecords = data.length;
-        document.getElementById('totalRecordsLabel').textContent = `Total records: ${data.length}`;
-        document.getElementById('loadMoreButton').style.display = 'none';
-    })
-    .catch(error => {
-        console.error('Error:', error);
-        hideLoading();
-    });
+    renderTable(page.data, append);
+    loadedRecords = append ? loadedRecords + page.data.length : page.data.length;
+
+    document.getElementById('totalRecordsLabel').textContent = `Total records: ${totalRecords}`;
+    document.getElementById('loadMoreButton').style.display = nextCursor ? 'inline-block' : 'none';
 }
 
-function filterData(filterType) {
+function loadQuery(query, onError) {
     showLoading();
+    currentQuery = query;
 
-    fetch('/sort_dataframe', {
-        method: 'POST',
-        body: new URLSearchParams({
-            datatype: 'filter',
-            filter_value: filterType
-        })
-    })
-    .then(response => response.json())
-    .then(data => {
+    fetchPage(query, recordsPerPage)
+    .then(page => {
         hideLoading();
 
-        if (data.error) {
-            alert(data.error);
+        if (page.data.error) {
+            onError(page.data.error);
             return;
         }
 
-        renderTable(data);
-        loadedRecords = data.length;
-        document.getElementById('totalRecordsLabel').textContent = `Total records: ${data.length}`;
-        document.getElementById('loadMoreButton').style.display = 'none';
+        showPage(page, false);
     })
     .catch(error => {
         console.error('Error:', error);
@@ -84,57 +65,72 @@ function filterData(filterType) {
     });
 }
 
+function searchData() {
+    const searchValue = document.getElementById('searchInput').value.trim();
+
+    if (!searchValue) {
+        toastr.options = {
+            "closeButton": true,
+            "preventDuplicates": true,
+            "hideEasing": "linear"
+        };
+        toastr.error('Please check the entered values and try again.', 'Error!');
+        return;
+    }
+
+    loadQuery({ datatype: 'search', search_value: searchValue }, () => {
+        toastr.error('Information not found', 'Error!');
+    });
+}
+
+function filterData(filterType) {
+    loadQuery({ datatype: 'filter', filter_value: filterType }, error => alert(error));
+}
+
 function getData(allData = false) {
+    if (!allData) {
+        loadQuery(null, error => console.error('Error:', error));
+        return;
+    }
+
     showLoading();
+    currentQuery = null;
 
-    fetch('/sort_dataframe', {
-        method: 'GET'
-    })
-    .then(response => response.json())
-    .then(data => {
-        hideLoading();
+    const loadAll = (after, append) => fetchPage(null, maxRecordsPerPage, after).then(page => {
+        if (page.data.error) {
+            hideLoading();
+            return;
+        }
 
-        totalRecords = data.totalRecords || data.length;
-        if (allData) {
-            renderTable(data);
-            loadedRecords = totalRecords;
-            document.getElementById('totalRecordsLabel').textContent = `Total records: ${totalRecords}`;
-            document.getElementById('loadMoreButton').style.display = 'none';
-        } else {
-            renderTable(data.slice(0, recordsPerPage));
-            loadedRecords = recordsPerPage;
-            document.getElementById('totalRecordsLabel').textContent = `Total records: ${totalRecords}`;
-
-            if (totalRecords > recordsPerPage) {
-                document.getElementById('loadMoreButton').style.display = 'inline-block';
-            }
+        showPage(page, append);
+        if (page.next) {
+            return loadAll(page.next, true);
         }
-    })
-    .catch(error => {
+        hideLoading();
+    });
+
+    loadAll(null, false).catch(error => {
         console.error('Error:', error);
         hideLoading();
     });
 }
 
 function loadMoreData() {
-    showLoading();
+    if (!nextCursor) {
+        return;
+    }
 
-    fetch('/sort_dataframe', {
-        method: 'GET'
-    })
-    .then(response => response.json())
-    .then(data => {
-        const nextRecords = data.slice(loadedRecords, loadedRecords + recordsPerPage);
-        renderTable(nextRecords, true);
-        loadedRecords += nextRecords.length;
+    showLoading();
 
-        document.getElementById('totalRecordsLabel').textContent = `Total records: ${totalRecords}`;
+    fetchPage(currentQuery, recordsPerPage, nextCursor)
+    .then(page => {
+        hideLoading();
 
-        if (loadedRecords >= totalRecords) {
-            document.getElementById('loadMoreButton').style.display = 'none';
+        if (page.data.error) {
+            return;
         }
 
-        hideLoading();
+        showPage(page, true);
     })
     .catch(error => {
         console.error('Error:', error);
@@ -22,6 +22,29 @@ function getStatistics() {
 
 let chartInstance = null;
 
+async function fetchPriceArea() {
+    const records = [];
+    let after = null;
+
+    do {
+        const params = new URLSearchParams({ columns: 'price,area', limit: 1000 });
+        if (after !== null) {
+            params.set('after', after);
+        }
+
+        const response = await fetch(`/sort_dataframe?${params.toString()}`);
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error);
+        }
+
+        records.push(...data);
+        after = response.headers.get('X-Next-Cursor');
+    } while (after !== null);
+
+    return records;
+}
+
 async function renderChartData() {
     const chartElement = document.getElementById('priceAreaChart');
 
@@ -33,8 +56,7 @@ async function renderChartData() {
     }
 
     try {
-        const response = await fetch('/sort_dataframe');
-        const data = await response.json();
+        const data = await fetchPriceArea();
 
         const prices = data.map(item => item.price);
         const areas = data.map(item => item.area);
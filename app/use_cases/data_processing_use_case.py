@@ -1,6 +1,10 @@
 # app/use_cases/data_processing_use_case.py
 
+import hashlib
+import json
 import re
+import numpy as np
+import pandas as pd
 
 level_patterns = {
     1: {
@@ -93,26 +97,273 @@ level_patterns = {
 }
 
 
+class DescriptionMatcher:
+    """
+    Description scorer compiled once from a set of level patterns.
+
+    Every pattern is an alternation of plain phrases, optionally joined by
+    `.*`. Plain phrases are matched as substrings of the lowercased
+    description, and the `.*` branches only run their compiled regex when
+    all of their phrases occur in it, so a description is scanned with fast
+    substring searches instead of one regex search per pattern. Descriptions
+    with non-ASCII characters, where lowercasing and `re.IGNORECASE` may
+    disagree, and patterns using any other regex syntax are matched with
+    their compiled regexes.
+
+    Attributes:
+        patterns (dict): Level patterns the matcher was compiled from.
+        fingerprint (str): Hash of the patterns, used to invalidate stored results.
+    """
+
+    LITERAL = re.compile(r'[\w \-]+')
+    GRAM = 3
+    CHUNK_ROWS = 20000
+
+    def __init__(self, patterns):
+        self.patterns = patterns
+        self.fingerprint = hashlib.sha256(json.dumps(patterns, sort_keys=True).encode('utf-8')).hexdigest()
+        self._regexes = []
+        self._phrases = []
+        self._gated = []
+        self._fallback = []
+
+        for level, features in patterns.items():
+            for pattern in features.values():
+                index = len(self._regexes)
+                self._regexes.append((level, re.compile(pattern, re.IGNORECASE)))
+
+                branches = self._split_branches(pattern)
+                if branches is None:
+                    self._fallback.append(index)
+                    continue
+
+                for parts in branches:
+                    if len(parts) == 1:
+                        self._phrases.append((parts[0].lower(), index))
+                    else:
+                        self._gated.append(([part.lower() for part in parts],
+                                            re.compile('.*'.join(parts), re.IGNORECASE), index))
+
+        vocabulary = sorted({phrase for phrase, index in self._phrases} |
+                            {part for parts, regex, index in self._gated for part in parts})
+        self._vocabulary = {phrase: position for position, phrase in enumerate(vocabulary)}
+
+        self._grams = {}
+        self._short_phrases = []
+        for phrase, position in self._vocabulary.items():
+            encoded = np.frombuffer(phrase.encode('ascii'), dtype=np.uint8)
+            if len(encoded) < self.GRAM:
+                self._short_phrases.append((phrase, position))
+            else:
+                self._grams.setdefault(self._gram_code(encoded), []).append((position, encoded))
+
+        self._gram_keys = np.array(sorted(self._grams), dtype=np.uint32)
+        self._gram_table = np.zeros(1 << (8 * self.GRAM), dtype=bool)
+        self._gram_table[self._gram_keys] = True
+        self._max_phrase_length = max(map(len, vocabulary), default=0)
+
+    @classmethod
+    def _split_branches(cls, pattern):
+        branches = [branch.split('.*') for branch in pattern.split('|')]
+        if not all(part.isascii() and cls.LITERAL.fullmatch(part) for parts in branches for part in parts):
+            return None
+        return branches
+
+    def matched_features(self, description):
+        """
+        Return the indexes of the patterns found in a description.
+
+        Args:
+            description (str): Listing description.
+
+        Returns:
+            set: Indexes into the flattened pattern list.
+        """
+        if not description.isascii():
+            return {index for index, (level, regex) in enumerate(self._regexes) if regex.search(description)}
+
+        text = description.lower()
+        matched = {index for phrase, index in self._phrases if phrase in text}
+
+        for parts, regex, index in self._gated:
+            if index not in matched and all(part in text for part in parts) and regex.search(description):
+                matched.add(index)
+
+        for index in self._fallback:
+            if self._regexes[index][1].search(description):
+                matched.add(index)
+
+        return matched
+
+    def score(self, description):
+        """
+        Count the matched features of every level.
+
+        Args:
+            description (str): Listing description.
+
+        Returns:
+            dict: Number of matched features per level.
+        """
+        level_scores = {level: 0 for level in self.patterns}
+        for index in self.matched_features(description):
+            level_scores[self._regexes[index][0]] += 1
+        return level_scores
+
+    def score_many(self, descriptions):
+        """
+        Count the matched features of every level for a column of descriptions.
+
+        All phrases are located in the lowercased column at once with NumPy
+        (see `_scan_chunk`), and the `.*` branches run their regex only on the
+        rows that contain all of their phrases.
+
+        Args:
+            descriptions (iterable): Non-empty description strings.
+
+        Returns:
+            np.ndarray: Matched feature counts of shape (n_rows, n_levels), levels in ascending order.
+        """
+        descriptions = pd.Series(descriptions, dtype=object).reset_index(drop=True)
+        matched = np.zeros((len(descriptions), len(self._regexes)), dtype=bool)
+
+        is_ascii = descriptions.map(str.isascii).to_numpy(dtype=bool)
+        rows = np.flatnonzero(is_ascii)
+        originals = descriptions[is_ascii].tolist()
+        found = self._find_phrases([description.lower() for description in originals])
+
+        for phrase, index in self._phrases:
+            matched[rows, index] |= found[:, self._vocabulary[phrase]]
+
+        for parts, regex, index in self._gated:
+            candidates = ~matched[rows, index]
+            for part in parts:
+                candidates &= found[:, self._vocabulary[part]]
+            for position in np.flatnonzero(candidates):
+                matched[rows[position], index] = regex.search(originals[position]) is not None
+
+        for index in self._fallback:
+            regex = self._regexes[index][1]
+            matched[rows, index] = [regex.search(description) is not None for description in originals]
+
+        for row in np.flatnonzero(~is_ascii):
+            matched[row, list(self.matched_features(descriptions[row]))] = True
+
+        feature_levels = np.array([level for level, regex in self._regexes])
+        return np.stack([matched[:, feature_levels == level].sum(axis=1) for level in sorted(self.patterns)],
+                        axis=1)
+
+    def _find_phrases(self, texts):
+        """Return a (n_texts, n_phrases) matrix of which vocabulary phrases occur in each lowercased text."""
+
+        found = np.zeros((len(texts), len(self._vocabulary)), dtype=bool)
+        for start in range(0, len(texts), self.CHUNK_ROWS):
+            chunk = texts[start:start + self.CHUNK_ROWS]
+            self._scan_chunk(chunk, found[start:start + len(chunk)])
+        return found
+
+    def _scan_chunk(self, texts, found):
+        """
+        Mark the phrases occurring in a chunk of lowercased ASCII texts.
+
+        The texts are joined into one byte buffer. Every position whose first
+        `GRAM` bytes start some phrase is found with a single table lookup,
+        and only those candidates are compared with the rest of the phrases.
+
+        Args:
+            texts (list): Lowercased ASCII descriptions.
+            found (np.ndarray): Output rows for the chunk, updated in place.
+        """
+        ends = np.cumsum([len(text) + 1 for text in texts])
+        data = np.frombuffer(('\n'.join(texts) + '\n').encode('ascii'), dtype=np.uint8)
+        padded = np.concatenate([data, np.zeros(max(self._max_phrase_length, self.GRAM), dtype=np.uint8)])
+
+        codes = np.zeros(len(data), dtype=np.uint32)
+        for offset in range(self.GRAM):
+            codes |= padded[offset:offset + len(data)].astype(np.uint32) << np.uint32(8 * offset)
+
+        candidates = np.flatnonzero(self._gram_table[codes])
+        order = np.argsort(codes[candidates], kind='stable')
+        candidates = candidates[order]
+        candidate_codes = codes[candidates]
+
+        lows = np.searchsorted(candidate_codes, self._gram_keys, side='left')
+        highs = np.searchsorted(candidate_codes, self._gram_keys, side='right')
+
+        for key, low, high in zip(self._gram_keys.tolist(), lows, highs):
+            if low == high:
+                continue
+            positions = candidates[low:high]
+            for position, encoded in self._grams[key]:
+                keep = np.ones(len(positions), dtype=bool)
+                for offset in range(self.GRAM, len(encoded)):
+                    keep &= padded[positions + offset] == encoded[offset]
+                found[np.searchsorted(ends, positions[keep], side='right'), position] = True
+
+        for phrase, position in self._short_phrases:
+            found[:, position] = [phrase in text for text in texts]
+
+    @classmethod
+    def _gram_code(cls, encoded):
+        return sum(int(byte) << (8 * offset) for offset, byte in enumerate(encoded[:cls.GRAM]))
+
+
+description_matcher = DescriptionMatcher(level_patterns)
+
+
+MISSING_DESCRIPTION_WARNING = 'Description is missing, assigned lowest quality level (5)'
+NO_FEATURES_WARNING = 'No key features found, assigned lowest quality level (5)'
+
+
 # Function to extract features from the description
 def extract_features(description):
     if not isinstance(description, str) or not description.strip():
-        return {'property_level': 5, 'warning': 'Description is missing, assigned lowest quality level (5)'}
+        return {'property_level': 5, 'warning': MISSING_DESCRIPTION_WARNING}
 
     # Count matches for each level
-    level_scores = {level: 0 for level in range(1, 6)}
-
-    for level, patterns in level_patterns.items():
-        for feature, pattern in patterns.items():
-            if re.search(pattern, description, re.IGNORECASE):
-                level_scores[level] += 1
+    level_scores = description_matcher.score(description)
 
     # Determine the level with the most matches
     max_score = max(level_scores.values())
     if max_score == 0:
-        return {'property_level': 5, 'warning': 'No key features found, assigned lowest quality level (5)'}
+        return {'property_level': 5, 'warning': NO_FEATURES_WARNING}
 
     # Choose the highest quality level (lowest number) among those with max score
     selected_level = min([level for level, score in level_scores.items() if score == max_score])
 
     return {'property_level': selected_level}
 
+
+def extract_features_bulk(descriptions):
+    """
+    Extract the property level of a whole column of descriptions.
+
+    Gives the same result as calling `extract_features` on every
+    description, without building a dict per row. Repeated descriptions are
+    scored once.
+
+    Args:
+        descriptions (iterable): Descriptions; missing or blank values are allowed.
+
+    Returns:
+        tuple: (np.ndarray of property levels, np.ndarray of warnings with None where there is no warning)
+    """
+    descriptions = pd.Series(descriptions, dtype=object).reset_index(drop=True)
+    present = descriptions.map(lambda description: isinstance(description, str) and bool(description.strip()))
+    present = present.to_numpy(dtype=bool)
+
+    property_levels = np.full(len(descriptions), 5, dtype=np.int64)
+    warnings = np.full(len(descriptions), None, dtype=object)
+    warnings[~present] = MISSING_DESCRIPTION_WARNING
+
+    if present.any():
+        codes, uniques = pd.factorize(descriptions[present])
+        scores = description_matcher.score_many(uniques)[codes]
+        max_scores = scores.max(axis=1)
+        selected = np.array(sorted(level_patterns))[scores.argmax(axis=1)]
+
+        rows = np.flatnonzero(present)
+        property_levels[rows] = np.where(max_scores == 0, 5, selected)
+        warnings[rows[max_scores == 0]] = NO_FEATURES_WARNING
+
+    return property_levels, warnings
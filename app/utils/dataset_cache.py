@@ -0,0 +1,133 @@
+# app/utils/dataset_cache.py
+import os
+import threading
+from app.config import Config
+from app.database.dbconnection import db_instance
+from app.models.real_estate.models import RealEstateDB
+from app.utils.utils import Utils
+
+
+class DatasetCache:
+    """
+    Process-level cache of a dataset built from an SQLite database.
+
+    The cached value is tagged with the modification time and size of the
+    database file and its WAL file, and with a data version counter bumped by
+    `invalidate()`. A lookup only stats the files; when the stamp differs the
+    dataset is rebuilt. Concurrent misses wait for a single rebuild instead of
+    each running the builder. Values computed from the dataset with
+    `derived()` are cached until the next rebuild.
+
+    Attributes:
+        builder (callable): Function returning the dataset.
+        path (str): Database file the dataset is built from.
+    """
+
+    def __init__(self, builder, path):
+        self.builder = builder
+        self.path = path
+
+        self._value = None
+        self._stamp = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._derived = {}
+
+        self.hits = 0
+        self.builds = 0
+
+    def get(self):
+        """
+        Return the dataset, rebuilding it if the database changed.
+
+        The returned value is shared between requests and must not be modified.
+
+        Returns:
+            The cached dataset.
+        """
+        stamp = self._read_stamp()
+        if stamp == self._stamp:
+            self.hits += 1
+            return self._value
+
+        with self._lock:
+            stamp = self._read_stamp()
+            if stamp == self._stamp:
+                self.hits += 1
+                return self._value
+
+            value = self.builder()
+            self._value, self._stamp = value, stamp
+            self.builds += 1
+            return value
+
+    def derived(self, key, func):
+        """
+        Return a value computed from the dataset, computing it once per build.
+
+        Args:
+            key (str): Name of the derived value.
+            func (callable): Function of the dataset computing the value.
+
+        Returns:
+            The cached derived value.
+        """
+        value = self.get()
+        with self._lock:
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] is value:
+                return cached[1]
+
+            result = func(value)
+            self._derived[key] = (value, result)
+            return result
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup, e.g. after the application wrote to the database."""
+
+        with self._lock:
+            self._version += 1
+
+    def stats(self):
+        """
+        Return cache counters for monitoring.
+
+        Returns:
+            dict: Number of hits and rebuilds.
+        """
+        return {'hits': self.hits, 'builds': self.builds, 'cached': self._stamp is not None}
+
+    def _read_stamp(self):
+        stamp = [self._version]
+        for path in (self.path, f'{self.path}-wal'):
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+
+def load_feature_bounds(pool):
+    """
+    Read the lower and upper bounds of the numeric listing features used to validate prediction input.
+
+    Args:
+        pool (ConnectionPool): Connection pool of the real estate database.
+
+    Returns:
+        tuple: (min_data, max_data) as returned by RealEstateDB.get_min_max_data().
+    """
+    conn = pool.acquire()
+    try:
+        bounds = RealEstateDB(conn).get_min_max_data()
+    finally:
+        pool.release(conn)
+
+    if bounds is None:
+        raise RuntimeError(f'Could not read feature bounds from {pool.path}')
+    return bounds
+
+
+cleaned_real_estate_data = DatasetCache(lambda: Utils.cleaned_frame('listings'), Config.DATABASE_REAL_ESTATE)
+feature_bounds = DatasetCache(lambda: load_feature_bounds(db_instance.pools['real_estate']), Config.DATABASE_REAL_ESTATE)
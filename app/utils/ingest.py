@@ -0,0 +1,268 @@
+# app/utils/ingest.py
+import hashlib
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+from app.config import Config
+
+COLUMNS = ['price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'walls', 'desc']
+TEXT_COLUMNS = ['district', 'type', 'cond', 'walls']
+INTEGER_COLUMNS = ['rooms', 'floor', 'floors']
+REAL_COLUMNS = ['price', 'area']
+REQUIRED_TEXT_COLUMNS = ['district', 'type']
+
+LOAD_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+    'temp_store': 'MEMORY',
+    'cache_size': -262144
+}
+
+
+def normalize_text(series):
+    """
+    Normalize a text column: strip and collapse whitespace, missing values becoming ''.
+
+    Distinct values are normalized once, as listing columns hold few of them.
+
+    Args:
+        series (pd.Series): Raw values.
+
+    Returns:
+        pd.Series: Normalized values.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    normalized = pd.Series(uniques, dtype=object).fillna('').astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
+    return pd.Series(normalized.to_numpy(dtype=object)[codes], index=series.index)
+
+
+def normalize_rows(df):
+    """
+    Convert raw CSV rows to the real_estate column types.
+
+    Text columns are stripped (e.g. the "New " type becomes "New"), counts
+    are parsed as integers and blank descriptions become None. Rows with a
+    missing or non-numeric price, area or count, a fractional count, or an
+    empty district or type are rejected.
+
+    Args:
+        df (pd.DataFrame): Raw rows, text columns read as strings.
+
+    Returns:
+        tuple: (normalized rows, number of rejected rows)
+    """
+    missing = [column for column in COLUMNS if column != 'desc' and column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    rows = pd.DataFrame(index=df.index)
+    valid = np.ones(len(df), dtype=bool)
+
+    for column in REAL_COLUMNS + INTEGER_COLUMNS:
+        values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+        valid &= np.isfinite(values)
+        if column in INTEGER_COLUMNS:
+            valid &= np.mod(values, 1) == 0
+        rows[column] = values
+
+    for column in TEXT_COLUMNS:
+        rows[column] = normalize_text(df[column])
+    for column in REQUIRED_TEXT_COLUMNS:
+        valid &= (rows[column] != '').to_numpy()
+
+    if 'desc' in df.columns:
+        desc = df['desc'].fillna('').astype(str)
+        rows['desc'] = desc.where(~((desc == '') | desc.str.isspace()), None)
+    else:
+        rows['desc'] = None
+
+    rows = rows[valid]
+    rows = rows.astype({column: np.int64 for column in INTEGER_COLUMNS})
+    return rows[COLUMNS], int((~valid).sum())
+
+
+def content_hashes(rows):
+    """
+    Hash the normalized content of each row.
+
+    Args:
+        rows (pd.DataFrame): Normalized rows with the real_estate columns.
+
+    Returns:
+        np.ndarray: First 64 bits of the SHA-1 digest of each row, as int64.
+    """
+    fields = []
+    for column in COLUMNS:
+        values = rows[column]
+        if column == 'desc':
+            fields.append(values.fillna('').tolist())
+            continue
+
+        if column in REAL_COLUMNS:
+            values = values.astype(np.float64)
+        codes, uniques = pd.factorize(values)
+        text = np.array([repr(value) if column in REAL_COLUMNS else str(value) for value in uniques.tolist()], dtype=object)
+        fields.append(text[codes].tolist())
+
+    sha1 = hashlib.sha1
+    digests = b''.join([sha1(key.encode('utf-8')).digest()[:8] for key in map('\x1f'.join, zip(*fields))])
+    return np.frombuffer(digests, dtype='>i8').astype(np.int64)
+
+
+class RealEstateIngestor:
+    """
+    Bulk loader of listing CSV files into the real_estate table.
+
+    Files are read in chunks; every chunk is normalized, hashed, and written
+    with `executemany` in a single transaction. The content hash of every
+    row is kept in the `real_estate_ingest` side table, so rows already in
+    the database are skipped and re-running a load is idempotent. The known
+    hashes are read once per load into a sorted array, so duplicates are
+    found without a query per row. Rows that were in the table before the
+    first load are hashed (and their text columns normalized) once.
+
+    The connection uses bulk-load PRAGMAs (WAL journal, no fsync per
+    commit, a large page cache); the original journal mode is restored
+    when the load finishes.
+
+    Attributes:
+        db_path (str): Database to load into.
+        chunk_size (int): Rows per chunk and transaction.
+    """
+
+    def __init__(self, db_path=None, chunk_size=None):
+        self.db_path = db_path or Config.DATABASE_REAL_ESTATE
+        self.chunk_size = chunk_size or Config.INGEST_CHUNK_SIZE
+
+    def ingest(self, path):
+        """
+        Load a CSV file.
+
+        Args:
+            path (str): CSV file with a header naming the real_estate columns.
+
+        Returns:
+            dict: Rows read, inserted, skipped as duplicates and rejected, the time taken and rows per second.
+        """
+        start = time.perf_counter()
+        stats = {'read': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0}
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        try:
+            for name, value in LOAD_PRAGMAS.items():
+                conn.execute(f"PRAGMA {name}={value}")
+
+            known = self._prepare(conn)
+
+            reader = pd.read_csv(path, dtype={column: str for column in TEXT_COLUMNS + ['desc']}, keep_default_na=False,
+                                 na_values={column: [''] for column in REAL_COLUMNS + INTEGER_COLUMNS},
+                                 chunksize=self.chunk_size)
+            for chunk in reader:
+                rows, rejected = normalize_rows(chunk)
+                hashes = content_hashes(rows)
+                new = self._new_positions(hashes, known)
+
+                self._insert(conn, rows.iloc[new], hashes[new])
+                known = np.union1d(known, hashes[new])
+
+                stats['read'] += len(chunk)
+                stats['rejected'] += rejected
+                stats['inserted'] += len(new)
+                stats['duplicates'] += len(rows) - len(new)
+        finally:
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.close()
+
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        stats['rows_per_second'] = int(stats['read'] / stats['seconds']) if stats['seconds'] else 0
+        return stats
+
+    def _prepare(self, conn):
+        """Create the side table, hash the rows it does not cover yet and return the sorted known hashes."""
+
+        conn.execute("BEGIN")
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS real_estate_ingest (
+                    real_estate_id INTEGER PRIMARY KEY,
+                    content_hash INTEGER NOT NULL
+                )
+            """)
+            conn.execute("DELETE FROM real_estate_ingest WHERE real_estate_id NOT IN (SELECT id FROM real_estate)")
+
+            query = f"""
+                SELECT id, {', '.join(COLUMNS)} FROM real_estate
+                WHERE id NOT IN (SELECT real_estate_id FROM real_estate_ingest)
+            """
+            pending = pd.read_sql(query, conn)
+            for offset in range(0, len(pending), self.chunk_size):
+                existing = pending.iloc[offset:offset + self.chunk_size]
+                normalized = existing.copy()
+                for column in TEXT_COLUMNS:
+                    normalized[column] = normalize_text(existing[column])
+
+                changed = (normalized[TEXT_COLUMNS] != existing[TEXT_COLUMNS]).any(axis=1)
+                if changed.any():
+                    conn.executemany(
+                        f"UPDATE real_estate SET {', '.join(f'{column} = ?' for column in TEXT_COLUMNS)} WHERE id = ?",
+                        normalized.loc[changed, TEXT_COLUMNS + ['id']].itertuples(index=False, name=None))
+
+                conn.executemany("INSERT INTO real_estate_ingest (real_estate_id, content_hash) VALUES (?, ?)",
+                                 zip(existing['id'].tolist(), content_hashes(normalized[COLUMNS]).tolist()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        known = np.array([value for (value,) in conn.execute("SELECT content_hash FROM real_estate_ingest")],
+                         dtype=np.int64)
+        return np.unique(known)
+
+    @staticmethod
+    def _new_positions(hashes, known):
+        """Return the positions of the first occurrence of every hash not in `known`, in file order."""
+
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        return first[~np.isin(hashes[first], known, assume_unique=True)]
+
+    @staticmethod
+    def _insert(conn, rows, hashes):
+        """Insert rows and their hashes in one transaction, assigning ids after the current maximum."""
+
+        conn.execute("BEGIN")
+        try:
+            next_id = conn.execute("""
+                SELECT MAX(COALESCE((SELECT MAX(id) FROM real_estate), 0),
+                           COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'real_estate'), 0)) + 1
+            """).fetchone()[0]
+            ids = list(range(next_id, next_id + len(rows)))
+
+            conn.executemany(
+                f"INSERT INTO real_estate (id, {', '.join(COLUMNS)}) VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                zip(ids, *(rows[column].tolist() for column in COLUMNS)))
+            conn.executemany("INSERT INTO real_estate_ingest (real_estate_id, content_hash) VALUES (?, ?)",
+                             zip(ids, hashes.tolist()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Load listing CSV files into the real_estate table.')
+    parser.add_argument('files', nargs='+', help='CSV files to load')
+    parser.add_argument('--db', default=None, help='Database to load into (the application database by default)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Rows per chunk and transaction')
+    args = parser.parse_args()
+
+    ingestor = RealEstateIngestor(args.db, args.chunk_size)
+    for file_path in args.files:
+        result = ingestor.ingest(file_path)
+        print(f"{file_path}: {result['read']} rows read, {result['inserted']} inserted, "
+              f"{result['duplicates']} duplicates, {result['rejected']} rejected "
+              f"in {result['seconds']}s ({result['rows_per_second']} rows/s)")
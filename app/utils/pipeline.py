@@ -0,0 +1,644 @@
+# app/utils/pipeline.py
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+from app.config import Config
+from app.ml.featurizer import property_features
+from app.models.real_estate.models import DescriptionFeaturesDB
+from app.use_cases.data_processing_use_case import description_matcher
+from app.utils.quantile_sketch import QuantileSketch
+from app.utils.utils import Utils
+
+CRITICAL_COLUMNS = ['area', 'rooms', 'floor', 'floors', 'type', 'cond', 'walls']
+CATEGORICAL_COLUMNS = ['district', 'type', 'cond', 'walls']
+NULL_VALUES = ['', ' ', 'None']
+
+
+class Stage:
+    """
+    One step of a cleaning pipeline.
+
+    Stages that only look at a row at a time can run on chunks independently;
+    stages with `is_global = True` (deduplication, quantiles, cross-column
+    statistics) need every row at once.
+
+    In streaming mode global stages work on chunks too: stages with
+    `needs_fit = True` first collect their statistics over a full pass with
+    `begin_fit`/`fit`/`end_fit`, and `stream` then filters chunk by chunk.
+
+    Attributes:
+        name (str): Name shown in the pipeline statistics.
+        is_global (bool): Whether the stage needs the whole dataset.
+        needs_fit (bool): Whether streaming needs a statistics pass for the stage.
+    """
+
+    name = 'stage'
+    is_global = False
+    needs_fit = False
+
+    def reset(self):
+        """Forget state kept from a previous run."""
+
+    def finish(self):
+        """Called once all rows of a run went through the stage."""
+
+    def start_pass(self):
+        """Called before every streaming pass over the source."""
+
+    def begin_fit(self):
+        """Start collecting streaming statistics."""
+
+    def fit(self, df):
+        """
+        Collect streaming statistics from a chunk.
+
+        Args:
+            df (pd.DataFrame): Chunk as it reaches the stage.
+        """
+
+    def end_fit(self):
+        """Finalize the streaming statistics."""
+
+    def stream(self, df):
+        """
+        Apply the stage to a chunk in streaming mode.
+
+        Args:
+            df (pd.DataFrame): Chunk.
+
+        Returns:
+            pd.DataFrame: Output rows of the chunk.
+        """
+        return self.process(df)
+
+    def process(self, df):
+        """
+        Apply the stage.
+
+        Args:
+            df (pd.DataFrame): Input rows.
+
+        Returns:
+            pd.DataFrame: Output rows.
+        """
+        raise NotImplementedError
+
+
+class DescriptionFeatures(Stage):
+    """
+    Replace the description with its property level and warning.
+
+    Known results are read from the description features cache once per run
+    and new ones are written back when the run finishes, so the cache is not
+    written while the source table may still be read in chunks. Whether
+    descriptions are used and whether a warning column is added is decided on
+    the first rows seen, so every chunk of a run gets the same columns.
+    """
+
+    name = 'description_features'
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or Config.DATABASE_REAL_ESTATE
+        self.reset()
+
+    def reset(self):
+        self._use_descriptions = None
+        self._with_warning = None
+        self._stored = None
+        self._computed = []
+
+    def process(self, df):
+        if self._use_descriptions is None:
+            self._use_descriptions = 'desc' in df.columns and len(df) > 0 and not pd.isna(df['desc']).iloc[0]
+
+        if not self._use_descriptions:
+            return df.assign(property_level=5,
+                             warning='Description (desc) missing, lowest quality level assigned (5)')
+
+        if self._stored is None:
+            self._stored = self._with_cache(lambda cache: cache.get_features(description_matcher.fingerprint)) or {}
+
+        property_levels, warnings, computed = Utils.match_description_features(df['desc'], self._stored)
+        self._computed.extend(computed)
+
+        if self._with_warning is None:
+            self._with_warning = len(warnings) > 0 and warnings[0] is not None
+
+        columns = {'property_level': property_levels}
+        if self._with_warning:
+            columns['warning'] = warnings
+        return df.assign(**columns).drop(columns=['desc'])
+
+    def finish(self):
+        if self._computed:
+            self._with_cache(lambda cache: cache.save_features(description_matcher.fingerprint, self._computed))
+        self._computed = []
+
+    def _with_cache(self, action):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cache = DescriptionFeaturesDB(conn)
+            return action(cache) if cache.create_table() else None
+        finally:
+            conn.close()
+
+
+class NullCleanup(Stage):
+    """Drop rows with a missing or blank value in any of the given columns."""
+
+    name = 'null_cleanup'
+
+    def __init__(self, columns, null_values=None):
+        self.columns = list(columns)
+        self.null_values = NULL_VALUES if null_values is None else null_values
+
+    def process(self, df):
+        values = df[self.columns]
+        return df[~(values.isna() | values.isin(self.null_values)).any(axis=1)]
+
+
+class DropDuplicates(Stage):
+    """
+    Drop fully duplicated rows.
+
+    In streaming mode rows are compared by a 64-bit hash of their values,
+    with numeric columns hashed as float64 so chunk dtypes do not matter.
+    The hashes of the rows kept in the pass go to a temporary on-disk SQLite
+    database, so memory stays bounded by the chunk and the SQLite page cache
+    however many rows the source has.
+    """
+
+    name = 'drop_duplicates'
+    is_global = True
+
+    def __init__(self):
+        self._seen = None
+
+    def process(self, df):
+        return df.drop_duplicates()
+
+    def reset(self):
+        self.finish()
+
+    def finish(self):
+        if self._seen is not None:
+            self._seen.close()
+            self._seen = None
+
+    def start_pass(self):
+        self.finish()
+        self._seen = sqlite3.connect('')
+        self._seen.execute('CREATE TABLE seen (hash INTEGER PRIMARY KEY)')
+        self._seen.execute('CREATE TABLE chunk (hash INTEGER PRIMARY KEY)')
+
+    def stream(self, df):
+        numeric = {column: np.float64 for column in df.columns if pd.api.types.is_numeric_dtype(df[column])}
+        hashes = pd.util.hash_pandas_object(df.astype(numeric), index=False).to_numpy().view(np.int64)
+
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        with self._seen:
+            self._seen.execute('DELETE FROM chunk')
+            self._seen.executemany('INSERT INTO chunk VALUES (?)', ((value,) for value in np.sort(hashes[keep]).tolist()))
+            seen = [row[0] for row in self._seen.execute('SELECT hash FROM chunk JOIN seen USING (hash)')]
+            self._seen.execute('INSERT OR IGNORE INTO seen SELECT hash FROM chunk')
+        keep &= ~np.isin(hashes, np.array(seen, dtype=np.int64))
+        return df[keep]
+
+
+class RangeFilter(Stage):
+    """Keep rows whose column lies within inclusive bounds."""
+
+    def __init__(self, column, low=None, high=None):
+        self.column = column
+        self.low = low
+        self.high = high
+        self.name = f'range_{column}'
+
+    def process(self, df):
+        values = df[self.column]
+        mask = np.ones(len(df), dtype=bool)
+        if self.low is not None:
+            mask &= (values >= self.low).to_numpy()
+        if self.high is not None:
+            mask &= (values <= self.high).to_numpy()
+        return df[mask]
+
+
+class RowFilter(Stage):
+    """Keep rows for which a condition holds."""
+
+    def __init__(self, name, condition):
+        self.name = name
+        self.condition = condition
+
+    def process(self, df):
+        return df[self.condition(df)]
+
+
+class QuantileTrim(Stage):
+    """
+    Keep rows whose value lies between quantiles computed on the whole dataset.
+
+    In streaming mode the quantiles come from a QuantileSketch filled in the
+    statistics pass; they are exact while the data fits in the sketch.
+    """
+
+    is_global = True
+    needs_fit = True
+
+    def __init__(self, name, lower=None, upper=None, value=None, sketch_capacity=None):
+        self.name = f'quantile_{name}'
+        self.lower = lower
+        self.upper = upper
+        self.value = value or (lambda df: df[name])
+        self.sketch_capacity = sketch_capacity or Config.PIPELINE_SKETCH_CAPACITY
+        self._sketch = None
+        self._bounds = (None, None)
+
+    def bounds(self, values):
+        """
+        Compute the trimming bounds.
+
+        Args:
+            values (pd.Series): Values of the whole dataset.
+
+        Returns:
+            tuple: (lower bound or None, upper bound or None)
+        """
+        lower = values.quantile(self.lower) if self.lower is not None else None
+        upper = values.quantile(self.upper) if self.upper is not None else None
+        return lower, upper
+
+    def process(self, df):
+        values = self.value(df)
+        return self._trim(df, values, *self.bounds(values))
+
+    def begin_fit(self):
+        self._sketch = QuantileSketch(self.sketch_capacity)
+
+    def fit(self, df):
+        self._sketch.add(self.value(df))
+
+    def end_fit(self):
+        self._bounds = tuple(self._sketch.quantile(q) if q is not None else None for q in (self.lower, self.upper))
+        self._sketch = None
+
+    def stream(self, df):
+        return self._trim(df, self.value(df), *self._bounds)
+
+    @staticmethod
+    def _trim(df, values, lower, upper):
+        mask = np.ones(len(df), dtype=bool)
+        if lower is not None:
+            mask &= (values >= lower).to_numpy()
+        if upper is not None:
+            mask &= (values <= upper).to_numpy()
+        return df[mask]
+
+
+class CategoryConflicts(Stage):
+    """Drop rows holding a categorical value that belongs to another column."""
+
+    name = 'category_conflicts'
+    is_global = True
+    needs_fit = True
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._counts = None
+        self._wrong = {}
+
+    def process(self, df):
+        return Utils.remove_category_conflicts(df, self.columns)
+
+    def begin_fit(self):
+        self._counts = {column: pd.Series(dtype=np.int64) for column in self.columns}
+
+    def fit(self, df):
+        for column in self.columns:
+            self._counts[column] = self._counts[column].add(df[column].value_counts(), fill_value=0)
+
+    def end_fit(self):
+        counts = pd.DataFrame(self._counts).reindex(columns=self.columns).fillna(0)
+        if counts.empty:
+            self._wrong, self._counts = {}, None
+            return
+
+        found = counts > 0
+        conflicting = found.sum(axis=1) > 1
+        correct = counts.idxmax(axis=1)
+
+        self._wrong = {column: set(counts.index[found[column] & conflicting & (correct != column)])
+                       for column in self.columns}
+        self._counts = None
+
+    def stream(self, df):
+        mask = np.zeros(len(df), dtype=bool)
+        for column, values in self._wrong.items():
+            if values:
+                mask |= df[column].isin(values).to_numpy()
+        return df[~mask]
+
+
+class DerivedFeatures(Stage):
+    """Add the features derived from the property level, as computed at serving time."""
+
+    name = 'derived_features'
+
+    def process(self, df):
+        features = property_features(df['property_level'].to_numpy(), df['area'].to_numpy(dtype=np.float64))
+        return df.assign(**{column: features[column] for column in
+                            ['property_strength', 'high_quality_property', 'property_area_factor', 'is_luxury']})
+
+
+class Pipeline:
+    """
+    Ordered list of stages applied to a DataFrame.
+
+    Every run records the rows entering and leaving each stage and the time
+    spent in it.
+
+    Attributes:
+        stages (list): Stages in order.
+        stats (list): Per-stage statistics of the last run.
+        passes (int): Number of passes over the source in the last streaming run.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.stats = []
+        self.passes = 0
+
+    def run(self, df):
+        """
+        Apply all stages to a DataFrame.
+
+        Args:
+            df (pd.DataFrame): Input rows.
+
+        Returns:
+            pd.DataFrame: Cleaned rows.
+        """
+        self._start()
+        for position, stage in enumerate(self.stages):
+            df = self._apply(position, stage.process, df)
+        self._finish()
+        return df
+
+    def run_chunks(self, chunks):
+        """
+        Apply the stages to an iterable of DataFrame chunks.
+
+        The stages before the first global stage run chunk by chunk; the
+        chunks are then concatenated for the remaining stages. Chunk indexes
+        are renumbered consecutively, as if the rows had been read at once.
+
+        Args:
+            chunks (iterable): DataFrame chunks with the same columns.
+
+        Returns:
+            pd.DataFrame: Cleaned rows.
+        """
+        self._start()
+        split = next((position for position, stage in enumerate(self.stages) if stage.is_global), len(self.stages))
+
+        parts = []
+        offset = 0
+        for chunk in chunks:
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            for position, stage in enumerate(self.stages[:split]):
+                chunk = self._apply(position, stage.process, chunk)
+            parts.append(chunk)
+
+        df = pd.concat(parts) if parts else pd.DataFrame()
+        for position, stage in enumerate(self.stages[split:], start=split):
+            df = self._apply(position, stage.process, df)
+        self._finish()
+        return df
+
+    def stream(self, source, writer=None):
+        """
+        Clean a dataset that does not fit in memory, chunk by chunk.
+
+        Every global stage that needs statistics gets its own pass over the
+        source: the chunks go through the stages before it (using the
+        statistics fitted in earlier passes) and are fed to its `fit`. A last
+        pass applies all stages and hands the cleaned chunks to the writer.
+        Only one chunk and the stage statistics are held in memory; the
+        statistics are bounded (quantile sketches, category counts) except for
+        the hashes of kept rows, which deduplication keeps on disk.
+
+        Args:
+            source (iterable): Re-iterable source of DataFrame chunks, e.g. SQLiteSource.
+            writer (optional): Object with `write(df)` and `close()` receiving the cleaned chunks.
+
+        Returns:
+            int: Number of cleaned rows.
+        """
+        self._start()
+        self.passes = 0
+
+        for target, fitted_stage in enumerate(self.stages):
+            if not fitted_stage.needs_fit:
+                continue
+
+            fitted_stage.begin_fit()
+            for chunk in self._pass(source):
+                for stage in self.stages[:target]:
+                    chunk = stage.stream(chunk)
+                fitted_stage.fit(chunk)
+            fitted_stage.end_fit()
+
+        rows = 0
+        try:
+            for chunk in self._pass(source):
+                for position, stage in enumerate(self.stages):
+                    chunk = self._apply(position, stage.stream, chunk)
+                if writer is not None:
+                    writer.write(chunk)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        self._finish()
+        return rows
+
+    def report(self):
+        """
+        Format the statistics of the last run as a table.
+
+        Returns:
+            str: One line per stage.
+        """
+        lines = [f"{'stage':<28}{'rows in':>10}{'rows out':>10}{'ms':>10}"]
+        for item in self.stats:
+            lines.append(f"{item['stage']:<28}{item['rows_in']:>10}{item['rows_out']:>10}"
+                         f"{item['seconds'] * 1000:>10.1f}")
+        return '\n'.join(lines)
+
+    def _start(self):
+        for stage in self.stages:
+            stage.reset()
+        self.stats = [{'stage': stage.name, 'rows_in': 0, 'rows_out': 0, 'seconds': 0.0} for stage in self.stages]
+
+    def _finish(self):
+        for stage in self.stages:
+            stage.finish()
+
+    def _pass(self, source):
+        self.passes += 1
+        for stage in self.stages:
+            stage.start_pass()
+
+        offset = 0
+        for chunk in source:
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+    def _apply(self, position, method, df):
+        start = time.perf_counter()
+        rows_in = len(df)
+        df = method(df)
+
+        item = self.stats[position]
+        item['rows_in'] += rows_in
+        item['rows_out'] += len(df)
+        item['seconds'] += time.perf_counter() - start
+        return df
+
+
+class SQLiteSource:
+    """
+    Re-iterable chunked reader of an SQL query.
+
+    Every iteration opens its own connection and reads the query result with
+    a cursor in chunks of `chunk_size` rows.
+    """
+
+    def __init__(self, query, db_path=None, chunk_size=None):
+        self.query = query
+        self.db_path = db_path or Config.DATABASE_REAL_ESTATE
+        self.chunk_size = chunk_size or Config.PIPELINE_CHUNK_SIZE
+
+    def __iter__(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield from pd.read_sql(self.query, conn, chunksize=self.chunk_size)
+        finally:
+            conn.close()
+
+
+class TableWriter:
+    """
+    Write cleaned chunks to an SQLite table, replacing it on the first chunk.
+
+    The table should live in a different database file than the source, which
+    is still being read while chunks are written.
+    """
+
+    def __init__(self, db_path, table):
+        self.db_path = db_path
+        self.table = table
+        self._conn = None
+
+    def write(self, df):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            df.to_sql(self.table, self._conn, if_exists='replace', index=False)
+        else:
+            df.to_sql(self.table, self._conn, if_exists='append', index=False)
+        self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class CsvWriter:
+    """Write cleaned chunks to a CSV file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._started = False
+
+    def write(self, df):
+        df.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        self._started = False
+
+
+def cleaning_stages():
+    """
+    Return the cleaning stages shared by training and the data views.
+
+    Returns:
+        list: Null cleanup, duplicates, range filters, price trim, category conflicts and price per m² trim.
+    """
+    return [
+        NullCleanup(CRITICAL_COLUMNS),
+        DropDuplicates(),
+        RangeFilter('price', low=10000),
+        RangeFilter('area', 10, 300),
+        RangeFilter('rooms', 1, 10),
+        RowFilter('floor_within_floors', lambda df: df['floor'] <= df['floors']),
+        QuantileTrim('price', upper=0.995),
+        CategoryConflicts(CATEGORICAL_COLUMNS),
+        QuantileTrim('price_per_sqm', lower=0.025, upper=0.995, value=lambda df: df['price'] / df['area'])
+    ]
+
+
+def listing_pipeline():
+    """
+    Build the pipeline cleaning the listings shown in the dataframe and statistics views.
+
+    Returns:
+        Pipeline: Cleaning pipeline.
+    """
+    return Pipeline(cleaning_stages())
+
+
+def training_pipeline(derived_features=False, db_path=None):
+    """
+    Build the pipeline preparing the training data.
+
+    Args:
+        derived_features (bool): Whether to add the features derived from the property level.
+        db_path (str, optional): Database holding the description features cache.
+
+    Returns:
+        Pipeline: Training pipeline.
+    """
+    stages = [DescriptionFeatures(db_path)] + cleaning_stages()
+    if derived_features:
+        stages.append(DerivedFeatures())
+    return Pipeline(stages)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Clean the real_estate table in streaming mode.')
+    parser.add_argument('output', help='Output .csv file, or .db file to write the real_estate_clean table to')
+    parser.add_argument('--training', action='store_true', help='Run the training pipeline instead of the listing one')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Rows per chunk')
+    args = parser.parse_args()
+
+    if args.training:
+        query = "SELECT price, district, rooms, floor, floors, area, type, cond, walls, desc FROM real_estate"
+        pipeline = training_pipeline()
+    else:
+        query = "SELECT * FROM real_estate"
+        pipeline = listing_pipeline()
+
+    output = CsvWriter(args.output) if args.output.endswith('.csv') else TableWriter(args.output, 'real_estate_clean')
+    rows = pipeline.stream(SQLiteSource(query, chunk_size=args.chunk_size), output)
+
+    print(pipeline.report())
+    print(f"{rows} rows written to {args.output} in {pipeline.passes} passes")
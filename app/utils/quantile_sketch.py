@@ -0,0 +1,96 @@
+# app/utils/quantile_sketch.py
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded memory.
+
+    Values are kept in levels, an item of level i standing for 2**i input
+    values. When a level holds more than `capacity` items it is sorted and
+    every other item is promoted to the next level (the offset alternates, so
+    the compaction error does not drift in one direction). Sketches built on
+    different chunks are combined with `merge`.
+
+    As long as no more than `capacity` values were added the sketch holds all
+    of them, and `quantile` is exact and equal to pandas' linear quantile.
+    Past that, the rank error is about `log2(count / capacity) / capacity`.
+
+    Attributes:
+        capacity (int): Maximum number of items per level.
+        count (int): Number of values added.
+    """
+
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.count = 0
+        self.levels = []
+        self._offset = 0
+
+    def add(self, values):
+        """
+        Add values to the sketch; NaN values are ignored.
+
+        Args:
+            values (array-like): Numeric values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self._push(0, values)
+
+    def merge(self, other):
+        """
+        Add the contents of another sketch.
+
+        Args:
+            other (QuantileSketch): Sketch to merge.
+        """
+        self.count += other.count
+        for level, values in enumerate(other.levels):
+            self._push(level, values)
+
+    def quantile(self, q):
+        """
+        Estimate a quantile.
+
+        Args:
+            q (float): Quantile between 0 and 1.
+
+        Returns:
+            float: Estimated quantile, NaN for an empty sketch.
+        """
+        if self.count == 0:
+            return float('nan')
+
+        if len(self.levels) == 1:
+            return float(np.quantile(self.levels[0], q))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level, dtype=np.float64)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(values[order][min(position, len(values) - 1)])
+
+    def _push(self, level, values):
+        while True:
+            if level == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+
+            items = np.concatenate([self.levels[level], values])
+            if len(items) <= self.capacity:
+                self.levels[level] = items
+                return
+
+            items.sort()
+            if len(items) % 2:
+                self.levels[level], items = items[-1:], items[:-1]
+            else:
+                self.levels[level] = np.empty(0, dtype=np.float64)
+
+            values = items[self._offset::2]
+            self._offset ^= 1
+            level += 1
@@ -0,0 +1,183 @@
+# app/utils/snapshot.py
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_FORMAT = 2
+
+
+class ColumnarSnapshot:
+    """
+    Columnar on-disk copy of a cleaned dataset, loaded with memory mapping.
+
+    Every version is a directory (`<root>/<version>/`) holding one `.npy`
+    array per column, the row index, and a `manifest.json` with the column
+    dtypes and the dictionaries of the text columns, which are stored as
+    integer codes (-1 for missing values). Versions are written into a
+    temporary directory renamed into place when complete, and never modified
+    afterwards.
+
+    Numeric columns are opened with `np.load(mmap_mode='r')`, so worker
+    processes loading the same version share the page cache instead of each
+    holding its own copy. The arrays are read-only.
+
+    Saving a version keeps the `keep` most recent older versions, so a
+    process that is still loading one of them does not lose its files.
+
+    Attributes:
+        root (str): Directory holding the versions.
+        keep (int): Number of older versions kept when a new one is saved.
+    """
+
+    MANIFEST = 'manifest.json'
+    INDEX_FILE = 'index.npy'
+
+    def __init__(self, root, keep=1):
+        self.root = root
+        self.keep = keep
+
+    def versions(self):
+        """
+        Return the complete versions on disk.
+
+        Returns:
+            list: Version names.
+        """
+        if not os.path.isdir(self.root):
+            return []
+
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, self.MANIFEST)))
+
+    def load(self, version, categorical=True):
+        """
+        Load a version of the dataset.
+
+        Args:
+            version (str): Data version to load.
+            categorical (bool): Whether text columns are returned as pandas
+                categoricals (codes and dictionary) or as object columns.
+
+        Returns:
+            pd.DataFrame or None: Dataset, or None if the version is not (or no longer) on disk.
+        """
+        directory = os.path.join(self.root, version)
+        try:
+            with open(os.path.join(directory, self.MANIFEST), 'r') as f:
+                manifest = json.load(f)
+
+            if manifest.get('format') != SNAPSHOT_FORMAT:
+                return None
+
+            columns = {}
+            for column in manifest['columns']:
+                values = np.asarray(np.load(os.path.join(directory, column['file']), mmap_mode='r'))
+                if column['kind'] == 'numeric':
+                    columns[column['name']] = values
+                elif categorical:
+                    columns[column['name']] = pd.Categorical.from_codes(values, categories=column['categories'])
+                else:
+                    dictionary = np.empty(len(column['categories']) + 1, dtype=object)
+                    dictionary[:-1] = column['categories']
+                    columns[column['name']] = dictionary[values]
+
+            index = np.asarray(np.load(os.path.join(directory, self.INDEX_FILE), mmap_mode='r'))
+        except FileNotFoundError:
+            return None
+
+        return pd.DataFrame(columns, index=pd.Index(index), copy=False)
+
+    def save(self, df, version):
+        """
+        Write a version of the dataset and remove the older ones beyond `keep`.
+
+        If the version already exists (written by another process) it is kept
+        as is.
+
+        Args:
+            df (pd.DataFrame): Dataset with numeric and text columns.
+            version (str): Data version of the dataset.
+
+        Returns:
+            str: Directory of the version.
+        """
+        os.makedirs(self.root, exist_ok=True)
+
+        directory = os.path.join(self.root, version)
+        tmp_dir = os.path.join(self.root, f'.tmp-{version}-{os.getpid()}')
+        os.makedirs(tmp_dir)
+
+        try:
+            columns = []
+            for position, name in enumerate(df.columns):
+                series = df[name]
+                file_name = f'{position}.npy'
+                column = {'name': name, 'file': file_name}
+
+                if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+                    column['kind'] = 'numeric'
+                    np.save(os.path.join(tmp_dir, file_name), series.to_numpy())
+                else:
+                    codes, categories = pd.factorize(series, sort=True)
+                    column['kind'] = 'text'
+                    column['categories'] = categories.tolist()
+                    np.save(os.path.join(tmp_dir, file_name), codes.astype(np.int32))
+
+                columns.append(column)
+
+            np.save(os.path.join(tmp_dir, self.INDEX_FILE), df.index.to_numpy())
+
+            manifest = {'format': SNAPSHOT_FORMAT, 'version': version, 'rows': len(df), 'columns': columns}
+            with open(os.path.join(tmp_dir, self.MANIFEST), 'w') as f:
+                json.dump(manifest, f)
+
+            try:
+                os.rename(tmp_dir, directory)
+            except OSError:
+                if not os.path.exists(os.path.join(directory, self.MANIFEST)):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        older = sorted((name for name in self.versions() if name != version), key=self._mtime, reverse=True)
+        for name in older[self.keep:]:
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+        return directory
+
+    def _mtime(self, version):
+        try:
+            return os.path.getmtime(os.path.join(self.root, version))
+        except FileNotFoundError:
+            return 0
+
+
+def data_version(path, *salt):
+    """
+    Compute the data version of an SQLite database.
+
+    The version changes whenever the database file or its WAL file changes,
+    or when one of the salt values does (e.g. the description patterns).
+
+    Args:
+        path (str): Database file.
+        *salt: Additional values the dataset depends on.
+
+    Returns:
+        str: Version name.
+    """
+    stamp = [SNAPSHOT_FORMAT]
+    for file_path in (path, f'{path}-wal'):
+        try:
+            stat = os.stat(file_path)
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stamp.append(None)
+    stamp.extend(salt)
+
+    return hashlib.sha1(repr(stamp).encode('utf-8')).hexdigest()[:16]
@@ -1,6 +1,10 @@
 # app/utils/utils.py
-from app.use_cases.data_processing_use_case import extract_features
+from app.use_cases.data_processing_use_case import (extract_features_bulk, description_matcher,
+                                                    MISSING_DESCRIPTION_WARNING)
+from app.models.real_estate.models import RealEstateDB
 from app.config import Config
+import hashlib
+import os
 import sqlite3
 import pandas as pd
 import numpy as np
@@ -11,58 +15,52 @@ class Utils:
         pass
 
     @staticmethod
-    def search_text_filter(text, found_table_name=None):
+    def process_filter_text(text):
         try:
+            if not text:
+                return None
 
-            district = ['primorsky', 'malinovsky', 'kievsky', 'suvorovsky']
-
-            types_of_houses = ["new", "new ", "czech", "special project", "khrushchevka", "guest", "old fund",
-                               "kharkiv",
-                               "moscow", "cellular", "belgian", "stalinka", "jugoslavsky", "a small family",
-                               "private house", "under construction", "house under construction"]
-
-            cond = ["renovation", "after builders", "after overhaul", "after makeup", "residential clean",
-                    "need. in cap. renovation", "need. in cosm. renovation", "need. in tech. renovation",
-                    "author's design", "modern design", "expanded clay-concrete", "building materials",
-                    "design classic", "house under construction"]
-
-            walls = ["brick", "monolith", "panel", "block-brick", "shell rock", "aerated concrete",
-                     "foam concrete", "reed, dranka", "blocky", "plastic", "mixed", "concrete",
-                     "reinforced concrete", "shell brick", "metal-plastic", "metalwork", "wood",
-                     "silicate brick"]
-
-            found_value = None
+            allowed_columns = ['price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'walls', 'desc']
+            if text in allowed_columns:
+                return text
+        except Exception as e:
+            return None
 
-            for list_name, list_data in [('district', district), ('type', types_of_houses),
-                                         ('cond', cond), ('walls', walls)]:
-                for item in list_data:
-                    if text in item:
-                        found_value = item
-                        if found_table_name is None:
-                            found_table_name = list_name
-                        break
-                if found_value:
-                    break
+    @staticmethod
+    def parse_page_args(values):
+        """
+        Parse the pagination parameters of the dataframe API.
 
-            if found_value:
-                return found_table_name, found_value
+        Args:
+            values: Request values with optional 'limit', 'after' (id of the last row received),
+                'columns' (comma-separated), 'sort' and 'order' ('asc' or 'desc').
+                Without 'sort' rows are ordered by id, or by relevance for full-text searches.
 
-            return None, None
-        except Exception as e:
-            return None, None
+        Returns:
+            dict or None: Page parameters, or None if a parameter is invalid.
+        """
+        try:
+            limit = int(values.get('limit') or Config.DATAFRAME_PAGE_SIZE)
+            if not 0 < limit <= Config.DATAFRAME_PAGE_LIMIT:
+                return None
 
+            after = values.get('after')
+            after = int(after) if after not in (None, '') else None
 
+            columns = RealEstateDB.COLUMNS
+            if values.get('columns'):
+                requested = [column.strip() for column in values.get('columns').split(',') if column.strip()]
+                if not set(requested) <= set(RealEstateDB.COLUMNS):
+                    return None
+                columns = ['id'] + [column for column in RealEstateDB.COLUMNS if column in requested and column != 'id']
 
-    @staticmethod
-    def process_filter_text(text):
-        try:
-            if not text:
+            sort = values.get('sort') or None
+            order = values.get('order') or 'asc'
+            if (sort is not None and sort not in RealEstateDB.SORTABLE_COLUMNS) or order not in ('asc', 'desc'):
                 return None
 
-            allowed_columns = ['price', 'district', 'rooms', 'floor', 'floors', 'area', 'type', 'cond', 'walls', 'desc']
-            if text in allowed_columns:
-                return text
-        except Exception as e:
+            return {'limit': limit, 'after': after, 'columns': columns, 'sort': sort, 'descending': order == 'desc'}
+        except (TypeError, ValueError):
             return None
 
     @staticmethod
@@ -199,135 +197,178 @@ class Utils:
 
             if data_list and len(data_list) == 2:
                 if data_list[0] in table_list:
-                    if data_list[1].isdigit():
-                        return data_list[0], data_list[1]
-                    else:
-                        found_table_name, found_value = self.search_text_filter(data_list[1], found_table_name=data_list[0])
-                        return found_table_name, found_value
+                    return data_list[0], data_list[1]
             return None, None
 
         except Exception as e:
             return None
 
     @staticmethod
-    def filter_data():
+    def match_description_features(descriptions, stored):
+        """
+        Extract description features using already known results.
+
+        Args:
+            descriptions (pd.Series): Description column.
+            stored (dict): Known results {description hash: (property level, warning)}; updated in place.
+
+        Returns:
+            tuple: (np.ndarray of property levels, np.ndarray of warnings, list of newly computed
+                (description hash, property level, warning) entries)
+        """
+        codes, uniques = pd.factorize(pd.Series(descriptions, dtype=object).reset_index(drop=True))
+        uniques = [str(description) for description in uniques]
+        hashes = [hashlib.sha1(description.encode('utf-8')).hexdigest() for description in uniques]
+
+        computed = []
+        missing = [index for index, desc_hash in enumerate(hashes) if desc_hash not in stored]
+        if missing:
+            levels, warnings = extract_features_bulk([uniques[index] for index in missing])
+            computed = list(zip([hashes[index] for index in missing], levels.tolist(), warnings.tolist()))
+            stored.update({desc_hash: (level, warning) for desc_hash, level, warning in computed})
+
+        unique_levels = np.array([stored[desc_hash][0] for desc_hash in hashes], dtype=np.int64)
+        unique_warnings = np.array([stored[desc_hash][1] for desc_hash in hashes], dtype=object)
+
+        property_levels = np.full(len(codes), 5, dtype=np.int64)
+        warnings = np.full(len(codes), MISSING_DESCRIPTION_WARNING, dtype=object)
+        present = codes >= 0
+        property_levels[present] = unique_levels[codes[present]]
+        warnings[present] = unique_warnings[codes[present]]
+
+        return property_levels, warnings, computed
+
+    @staticmethod
+    def remove_category_conflicts(df, columns):
+        """
+        Drop rows whose categorical value belongs to a different column.
+
+        A value found in several categorical columns is kept in the column
+        where it occurs most often (the first such column on ties), and rows
+        holding it in any other column are dropped. The values of all columns
+        are factorized together, so the per-column counts are one `bincount`
+        per column and the rows to drop are found with one table lookup.
+
+        Args:
+            df (pd.DataFrame): Data to clean.
+            columns (list): Categorical columns, in tie-breaking order.
+
+        Returns:
+            pd.DataFrame: Data without the conflicting rows.
+        """
+        codes, uniques = pd.factorize(df[columns].to_numpy(dtype=object).ravel())
+        codes = codes.reshape(len(df), len(columns))
+        present = codes >= 0
+
+        counts = np.stack([np.bincount(codes[present[:, index], index], minlength=len(uniques))
+                           for index in range(len(columns))], axis=1)
+        found = counts > 0
+        wrong = found & (found.sum(axis=1) > 1)[:, None]
+        wrong[np.arange(len(uniques)), counts.argmax(axis=1)] = False
+
+        rows_to_drop = np.zeros(len(df), dtype=bool)
+        for index in range(len(columns)):
+            rows_to_drop[present[:, index]] |= wrong[codes[present[:, index], index], index]
+
+        return df.drop(index=df.index[rows_to_drop].unique())
+
+    @staticmethod
+    def filter_data(pipeline=None):
         """
         Load data from SQLite database, clean and preprocess it for model training.
         Extract features from descriptions and remove invalid, duplicate, and outlier records.
         Return cleaned DataFrame.
+
+        Args:
+            pipeline (Pipeline, optional): Pipeline to run; the training pipeline when omitted.
         """
+        from app.utils.pipeline import training_pipeline
 
         query = "SELECT price, district, rooms, floor, floors, area, type, cond, walls, desc FROM real_estate"
         conn = sqlite3.connect(Config.DATABASE_REAL_ESTATE)
-        df = pd.read_sql(query, conn)
-
-        critical_columns = ['area', 'rooms', 'floor', 'floors', 'type', 'cond', 'walls']
-
-        if 'desc' in df.columns and not pd.isna(df['desc']).iloc[0]:
-            features = df['desc'].apply(extract_features)
-            df['property_level'] = features.apply(lambda x: x['property_level'])
-            if 'warning' in features.iloc[0]:
-                df['warning'] = features.apply(lambda x: x.get('warning', None))
-            df = df.drop(columns=['desc'])
-        else:
-            df['property_level'] = 5
-            df['warning'] = 'Description (desc) missing, lowest quality level assigned (5)'
-
-        df[critical_columns] = df[critical_columns].replace(['', ' ', 'None'], np.nan)
-        df.dropna(subset=critical_columns, how='any', inplace=True)
-
-        df.drop_duplicates(inplace=True)
-
-        df = df[(df['price'] >= 10000)]
-        df = df[df['area'].between(10, 300)]
-        df = df[df['rooms'].between(1, 10)]
-        df = df[df['floor'] <= df['floors']]
-
-        price_upper = df['price'].quantile(0.995)
-        df = df[df['price'] <= price_upper]
-
-        categorical_columns = ['district', 'type', 'cond', 'walls']
-        from collections import defaultdict
-        value_counts_by_column = defaultdict(lambda: defaultdict(int))
-
-        for col in categorical_columns:
-            for value, count in df[col].value_counts().items():
-                value_counts_by_column[value][col] = count
-
-        rows_to_drop = set()
-        for value, columns_dict in value_counts_by_column.items():
-            if len(columns_dict) <= 1:
-                continue
-            correct_column = max(columns_dict, key=columns_dict.get)
-            for wrong_column in columns_dict:
-                if wrong_column != correct_column:
-                    bad_rows = df[df[wrong_column] == value].index
-                    rows_to_drop.update(bad_rows)
-
-        df.drop(index=rows_to_drop, inplace=True)
-
-        df['price_per_sqm'] = df['price'] / df['area']
-        lower_bound = df['price_per_sqm'].quantile(0.025)
-        upper_bound = df['price_per_sqm'].quantile(0.995)
-        df = df[(df['price_per_sqm'] >= lower_bound) & (df['price_per_sqm'] <= upper_bound)]
-        df.drop(columns=['price_per_sqm'], inplace=True)
+        try:
+            df = pd.read_sql(query, conn)
+        finally:
+            conn.close()
 
-        return df
+        pipeline = pipeline or training_pipeline()
+        return pipeline.run(df)
 
     @staticmethod
-    def real_estate_data_filter():
+    def real_estate_frame(pipeline=None):
         """
-        Load data from SQLite database, clean and preprocess it for model training.
-        Extract features from descriptions and remove invalid, duplicate, and outlier records.
-        Return cleaned DataFrame and count of records with price > 150000.
+        Load data from SQLite database and clean it for the dataframe and statistics views.
+        Remove invalid, duplicate, and outlier records.
+        Return cleaned DataFrame.
+
+        Args:
+            pipeline (Pipeline, optional): Pipeline to run; the listing pipeline when omitted.
         """
+        from app.utils.pipeline import listing_pipeline
 
         query = "SELECT * FROM real_estate"
         conn = sqlite3.connect(Config.DATABASE_REAL_ESTATE)
-        df = pd.read_sql(query, conn)
+        try:
+            df = pd.read_sql(query, conn)
+        finally:
+            conn.close()
 
-        critical_columns = ['area', 'rooms', 'floor', 'floors', 'type', 'cond', 'walls']
+        pipeline = pipeline or listing_pipeline()
+        return pipeline.run(df)
 
-        df[critical_columns] = df[critical_columns].replace(['', ' ', 'None'], np.nan)
-        df.dropna(subset=critical_columns, how='any', inplace=True)
+    @staticmethod
+    def real_estate_data_filter(pipeline=None):
+        """
+        Load data from SQLite database and clean it for the dataframe and statistics views.
+        Return cleaned records.
 
-        df.drop_duplicates(inplace=True)
+        Args:
+            pipeline (Pipeline, optional): Pipeline to run; the listing pipeline when omitted.
+        """
+        return Utils.to_records(Utils.real_estate_frame(pipeline))
 
-        df = df[(df['price'] >= 10000)]
-        df = df[df['area'].between(10, 300)]
-        df = df[df['rooms'].between(1, 10)]
-        df = df[df['floor'] <= df['floors']]
+    @staticmethod
+    def cleaned_frame(name, pipeline=None, categorical=True):
+        """
+        Load a cleaned dataset from its columnar snapshot, memory-mapped.
 
-        price_upper = df['price'].quantile(0.995)
-        df = df[df['price'] <= price_upper]
+        The snapshot is versioned on the real estate database and the
+        description patterns; when it is missing or stale the dataset is
+        rebuilt from SQLite and exported first.
 
-        categorical_columns = ['district', 'type', 'cond', 'walls']
-        from collections import defaultdict
-        value_counts_by_column = defaultdict(lambda: defaultdict(int))
+        Args:
+            name (str): 'training' (the `filter_data` rows) or 'listings' (the `real_estate_frame` rows
+                without the free-text `desc`, which is read from SQLite for the rows shown).
+            pipeline (Pipeline, optional): Pipeline used on a rebuild; it must produce the same dataset.
+            categorical (bool): Whether text columns are loaded as categoricals or as object columns.
 
-        for col in categorical_columns:
-            for value, count in df[col].value_counts().items():
-                value_counts_by_column[value][col] = count
+        Returns:
+            pd.DataFrame: Cleaned dataset backed by read-only arrays.
+        """
+        from app.utils.snapshot import ColumnarSnapshot, data_version
 
-        rows_to_drop = set()
-        for value, columns_dict in value_counts_by_column.items():
-            if len(columns_dict) <= 1:
-                continue
-            correct_column = max(columns_dict, key=columns_dict.get)
-            for wrong_column in columns_dict:
-                if wrong_column != correct_column:
-                    bad_rows = df[df[wrong_column] == value].index
-                    rows_to_drop.update(bad_rows)
+        builders = {'training': Utils.filter_data,
+                    'listings': lambda pipeline: Utils.real_estate_frame(pipeline).drop(columns=['desc'])}
 
-        df.drop(index=rows_to_drop, inplace=True)
+        snapshot = ColumnarSnapshot(os.path.join(Config.SNAPSHOT_DIR, name))
+        version = data_version(Config.DATABASE_REAL_ESTATE, description_matcher.fingerprint)
 
-        df['price_per_sqm'] = df['price'] / df['area']
-        lower_bound = df['price_per_sqm'].quantile(0.025)
-        upper_bound = df['price_per_sqm'].quantile(0.995)
-        df = df[(df['price_per_sqm'] >= lower_bound) & (df['price_per_sqm'] <= upper_bound)]
-        df.drop(columns=['price_per_sqm'], inplace=True)
+        df = snapshot.load(version, categorical)
+        if df is None:
+            snapshot.save(builders[name](pipeline), version)
+            df = snapshot.load(version, categorical)
+        return df
 
-        count_price_above_150k = df[df['price'] > 150000].shape[0]
+    @staticmethod
+    def to_records(df):
+        """
+        Convert a DataFrame to JSON-ready records, missing values becoming None.
 
+        Args:
+            df (pd.DataFrame): Rows to convert.
 
-        return df.to_dict(orient='records')
+        Returns:
+            list: One dict per row.
+        """
+        df = df.astype(object)
+        return df.where(df.notna(), None).to_dict(orient='records')
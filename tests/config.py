@@ -1,5 +1,7 @@
 # test/config.py
 class ServiceUrl:
     SERVICE_URL_PREDICT = 'http://127.0.0.1:5000/get_predict'
+    SERVICE_URL_PREDICT_BATCH = 'http://127.0.0.1:5000/predict_batch'
     SERVICE_URL_DATAFRAME = 'http://127.0.0.1:5000/sort_dataframe'
     SERVICE_URL_PREDICTIONS = 'http://127.0.0.1:5000/sort_predictions'
+    SERVICE_URL_USER_PREDICTIONS = 'http://127.0.0.1:5000/user_predictions'
@@ -33,6 +33,40 @@ def post_request_predict(test_session):
     return _post_request_predict
 
 
+@pytest.fixture
+def post_request_predict_batch(test_session):
+
+    def _post_request_predict_batch():
+
+        records = [
+            {
+                'district': 'Kievsky',
+                'rooms': 1,
+                'floor': 1,
+                'floors': 3,
+                'area': 50,
+                'type': 'Czech',
+                'cond': 'Renovation',
+                'walls': 'Monolith'
+            },
+            {
+                'district': 'Primorsky',
+                'rooms': 'three',
+                'floor': 5,
+                'floors': 9,
+                'area': 90,
+                'type': 'New',
+                'cond': 'Renovation',
+                'walls': 'Brick',
+                'desc': 'Fully renovated apartment with sea view'
+            }
+        ]
+
+        response = test_session.post(url=ServiceUrl.SERVICE_URL_PREDICT_BATCH, json={'records': records})
+        return response
+
+    return _post_request_predict_batch
+
 
 @pytest.fixture
 def get_request_predictions(test_session):
@@ -44,11 +78,31 @@ def get_request_predictions(test_session):
     return _get_request_predictions
 
 
+@pytest.fixture
+def get_request_user_predictions(test_session):
+
+    def _get_request_user_predictions(params=None):
+        response = test_session.get(url=ServiceUrl.SERVICE_URL_USER_PREDICTIONS, params=params)
+        return response
+
+    return _get_request_user_predictions
+
+
 @pytest.fixture
 def get_request_dataframe(test_session):
 
-    def _get_request_dataframe():
-        response = requests.get(url=ServiceUrl.SERVICE_URL_DATAFRAME)
+    def _get_request_dataframe(params=None):
+        response = requests.get(url=ServiceUrl.SERVICE_URL_DATAFRAME, params=params)
+        return response
+
+    return _get_request_dataframe
+
+
+@pytest.fixture
+def post_request_dataframe(test_session):
+
+    def _post_request_dataframe(data):
+        response = requests.post(url=ServiceUrl.SERVICE_URL_DATAFRAME, data=data)
         return response
 
-    return _get_request_dataframe
\ No newline at end of file
+    return _post_request_dataframe
\ No newline at end of file
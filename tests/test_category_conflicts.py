@@ -0,0 +1,43 @@
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from app.utils.utils import Utils
+
+COLUMNS = ['district', 'type', 'cond', 'walls']
+
+
+def _reference(df):
+    value_counts_by_column = defaultdict(lambda: defaultdict(int))
+    for col in COLUMNS:
+        for value, count in df[col].value_counts().items():
+            value_counts_by_column[value][col] = count
+
+    rows_to_drop = set()
+    for value, columns_dict in value_counts_by_column.items():
+        if len(columns_dict) <= 1:
+            continue
+        correct_column = max(columns_dict, key=columns_dict.get)
+        for wrong_column in columns_dict:
+            if wrong_column != correct_column:
+                rows_to_drop.update(df[df[wrong_column] == value].index)
+
+    return df.drop(index=rows_to_drop)
+
+
+def test_remove_category_conflicts_matches_reference():
+    rng = np.random.default_rng(0)
+    values = np.array(['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'brick', 'new', None], dtype=object)
+
+    for seed in range(20):
+        size = int(rng.integers(1, 300))
+        df = pd.DataFrame({column: rng.choice(values[seed % 5:], size) for column in COLUMNS})
+        df.index = rng.permutation(size * 3)[:size]
+
+        pd.testing.assert_frame_equal(Utils.remove_category_conflicts(df, COLUMNS), _reference(df))
+
+
+def test_remove_category_conflicts_tie_keeps_first_column():
+    df = pd.DataFrame({'district': ['x', 'y'], 'type': ['y', 'x'], 'cond': ['p', 'p'], 'walls': ['q', 'q']})
+    assert Utils.remove_category_conflicts(df, COLUMNS).empty
+    df = pd.DataFrame({'district': ['x', 'z'], 'type': ['y', 'x'], 'cond': ['p', 'p'], 'walls': ['q', 'q']})
+    assert Utils.remove_category_conflicts(df, COLUMNS).index.tolist() == [0]
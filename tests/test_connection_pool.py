@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+import time
+import pytest
+from app.database.dbconnection import ConnectionPool
+
+
+def test_pool_reuses_configured_connections(tmp_path):
+    path = str(tmp_path / 'data.db')
+    pool = ConnectionPool(path, size=2)
+
+    first = pool.acquire()
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert first.execute("PRAGMA synchronous").fetchone()[0] == 1
+    first.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    first.commit()
+    first.execute("INSERT INTO items DEFAULT VALUES")
+    pool.release(first)
+
+    second = pool.acquire()
+    assert second is first
+    assert second.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    third = pool.acquire()
+    overflow = pool.acquire()
+    assert overflow.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    stats = pool.stats()
+    assert (stats['size'], stats['in_use'], stats['checkouts'], stats['overflows']) == (3, 3, 4, 1)
+
+    pool.release(overflow)
+    pool.release(third)
+    pool.release(second)
+    stats = pool.stats()
+    assert (stats['size'], stats['idle'], stats['peak_in_use']) == (2, 2, 3)
+
+    pool.close()
+    assert pool.stats()['size'] == 0
+
+
+def test_requests_beyond_the_pool_size_succeed(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'data.db'), size=2)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    pool.release(conn)
+
+    threads = 10
+    barrier = threading.Barrier(threads)
+    results, errors = [], []
+
+    def handle_request():
+        try:
+            conn = pool.acquire()
+            try:
+                barrier.wait(timeout=5)
+                results.append(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+            finally:
+                pool.release(conn)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=handle_request) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert not errors
+    assert results == [0] * threads
+    stats = pool.stats()
+    assert (stats['peak_in_use'], stats['overflows'], stats['in_use'], stats['idle']) == (threads, threads - 2, 0, 2)
+    pool.close()
+
+
+def test_readers_do_not_block_the_writer(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'data.db'), size=2)
+    reader, writer = pool.acquire(), pool.acquire()
+    writer.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    writer.commit()
+
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    start = time.perf_counter()
+    writer.execute("INSERT INTO items DEFAULT VALUES")
+    writer.commit()
+    assert time.perf_counter() - start < 1
+
+    assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    pool.release(reader)
+    assert pool.acquire().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+
+def test_read_only_modes(tmp_path):
+    path = str(tmp_path / 'data.db')
+    writer = sqlite3.connect(path)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("PRAGMA wal_autocheckpoint=0")
+    writer.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    writer.executemany("INSERT INTO items (id) VALUES (?)", [(1,), (2,)])
+    writer.commit()
+    writer.close()
+
+    immutable = ConnectionPool(path, size=1, mode='immutable')
+    memory = ConnectionPool(path, size=1, mode='memory')
+    immutable.open()
+    memory.open()
+
+    locker = sqlite3.connect(path, isolation_level=None)
+    locker.execute("BEGIN EXCLUSIVE")
+    for pool in (immutable, memory):
+        conn = pool.acquire()
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items (id) VALUES (3)")
+        pool.release(conn)
+    locker.execute("ROLLBACK")
+    locker.close()
+
+    memory.close()
+    assert memory.stats()['size'] == 0
+
+    with pytest.raises(ValueError):
+        ConnectionPool(path, mode='shared')
@@ -10,3 +10,28 @@ def test_get_request_dataframe(get_request_dataframe):
     assert 'error' not in response.response_json, f"Response should not contain error: {response.response_json}"
     print(response.__str__())
 
+
+
+def test_get_request_dataframe_pages(get_request_dataframe):
+    first = get_request_dataframe({'limit': 50, 'sort': 'price', 'columns': 'price,area'})
+    Response(first).assert_status_code(200)
+    assert len(first.json()) == 50
+    assert set(first.json()[0]) == {'id', 'price', 'area'}
+    assert int(first.headers['X-Total-Count']) > 50
+
+    second = get_request_dataframe({'limit': 50, 'sort': 'price', 'columns': 'price,area',
+                                    'after': first.headers['X-Next-Cursor']})
+    Response(second).assert_status_code(200)
+    keys = [(row['price'], row['id']) for row in first.json() + second.json()]
+    assert keys == sorted(keys) and len(set(keys)) == 100
+
+    Response(get_request_dataframe({'sort': 'desc'})).assert_status_code(400)
+
+
+def test_post_request_dataframe_search(post_request_dataframe):
+    request = post_request_dataframe({'datatype': 'search', 'search_value': 'prim', 'limit': 20})
+
+    Response(request).assert_status_code(200)
+    assert len(request.json()) == 20
+    assert int(request.headers['X-Total-Count']) > 20
+    assert request.json()[0]['district'] == 'Primorsky'
@@ -0,0 +1,65 @@
+import os
+import sqlite3
+import threading
+import time
+from app.database.dbconnection import ConnectionPool
+from app.utils.dataset_cache import DatasetCache, load_feature_bounds
+
+
+def test_dataset_cache_rebuilds_on_change(tmp_path):
+    path = tmp_path / 'data.db'
+    path.write_bytes(b'1')
+    calls = []
+
+    def builder():
+        calls.append(1)
+        time.sleep(0.05)
+        return [len(calls)]
+
+    cache = DatasetCache(builder, str(path))
+
+    threads = [threading.Thread(target=cache.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert cache.get() == [1]
+    assert cache.derived('size', len) == 1
+
+    path.write_bytes(b'22')
+    assert cache.get() == [2]
+
+    cache.invalidate()
+    assert cache.get() == [3]
+    assert cache.derived('first', lambda value: value[0]) == 3
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.get() == [4]
+
+
+def test_feature_bounds_follow_writes(tmp_path):
+    path = str(tmp_path / 'real_estate.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE real_estate (id INTEGER PRIMARY KEY, rooms INTEGER, floor INTEGER, "
+                     "floors INTEGER, area REAL)")
+        conn.executemany("INSERT INTO real_estate (rooms, floor, floors, area) VALUES (?, ?, ?, ?)",
+                         [(1, 2, 9, 30.0), (4, 16, 25, 120.5)])
+    conn.close()
+
+    pool = ConnectionPool(path, size=1)
+    conn = pool.acquire()
+    conn.execute("SELECT COUNT(*) FROM real_estate").fetchone()
+    pool.release(conn)
+    cache = DatasetCache(lambda: load_feature_bounds(pool), path)
+    min_data, max_data = cache.get()
+    assert min_data == {'min_rooms': 1, 'min_floor': 2, 'min_floors': 9, 'min_area': 30.0}
+    assert max_data == {'max_rooms': 4, 'max_floor': 16, 'max_floors': 25, 'max_area': 120.5}
+    assert cache.get()[0] is min_data
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO real_estate (rooms, floor, floors, area) VALUES (6, 1, 30, 250.0)")
+    conn.close()
+    assert cache.get()[1]['max_area'] == 250.0
+    assert cache.stats()['builds'] == 2
@@ -0,0 +1,49 @@
+import sqlite3
+import pandas as pd
+import app.utils.utils as utils_module
+from app.use_cases.data_processing_use_case import extract_features, description_matcher
+from app.utils.pipeline import DescriptionFeatures, Pipeline
+
+DESCRIPTIONS = ['nothing special', 'Fully renovated, parquet', None, 'Sea view and sauna', 'nothing special']
+
+
+def _expected(descriptions):
+    features = [extract_features(description) for description in descriptions]
+    return [item['property_level'] for item in features], [item.get('warning') for item in features]
+
+
+def _run(path, descriptions):
+    df = Pipeline([DescriptionFeatures(path)]).run(pd.DataFrame({'id': range(len(descriptions)), 'desc': descriptions}))
+    return df['property_level'].tolist(), df['warning'].tolist()
+
+
+def _query(path, query):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+def test_description_features_are_stored_and_reused(tmp_path, monkeypatch):
+    path = str(tmp_path / 'real_estate.db')
+
+    assert _run(path, DESCRIPTIONS) == _expected(DESCRIPTIONS)
+    assert _query(path, 'SELECT COUNT(*) FROM description_features') == [(3, )]
+
+    def fail(descriptions):
+        raise AssertionError(f'recomputed {list(descriptions)}')
+
+    monkeypatch.setattr(utils_module, 'extract_features_bulk', fail)
+    assert _run(path, DESCRIPTIONS) == _expected(DESCRIPTIONS)
+
+
+def test_description_features_invalidated_by_pattern_change(tmp_path, monkeypatch):
+    path = str(tmp_path / 'real_estate.db')
+    _run(path, DESCRIPTIONS)
+
+    monkeypatch.setattr(description_matcher, 'fingerprint', 'changed')
+    assert _run(path, DESCRIPTIONS[:2]) == _expected(DESCRIPTIONS[:2])
+
+    assert _query(path, 'SELECT DISTINCT pattern_hash FROM description_features') == [('changed', )]
+    assert _query(path, 'SELECT COUNT(*) FROM description_features') == [(2, )]
@@ -0,0 +1,41 @@
+import os
+import re
+import pandas as pd
+from app.use_cases.data_processing_use_case import (level_patterns, description_matcher, extract_features,
+                                                    extract_features_bulk)
+
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'real_estate_prices_en_2020.csv')
+
+
+def _reference_scores(description):
+    level_scores = {level: 0 for level in range(1, 6)}
+    for level, patterns in level_patterns.items():
+        for pattern in patterns.values():
+            if re.search(pattern, description, re.IGNORECASE):
+                level_scores[level] += 1
+    return level_scores
+
+
+def test_matcher_matches_regex_scores_on_corpus():
+    df = pd.read_csv(CORPUS)
+    descriptions = df['desc'].dropna().astype(str).tolist()
+    descriptions += ['MARBLE staircase, Design Project as a GIFT', 'Straße near the sea, Sauna', 'walking distance to\nsea']
+
+    for description in descriptions:
+        assert description_matcher.score(description) == _reference_scores(description), description
+
+
+def test_bulk_matches_extract_features_on_corpus():
+    descriptions = pd.read_csv(CORPUS)['desc'].tolist() + [None, '', '  ', 'Straße, sauna', 'nothing here']
+    property_levels, warnings = extract_features_bulk(descriptions)
+
+    expected = [extract_features(description) for description in descriptions]
+    assert property_levels.tolist() == [features['property_level'] for features in expected]
+    assert warnings.tolist() == [features.get('warning') for features in expected]
+
+
+def test_extract_features_levels():
+    assert extract_features('Sea view, sauna and smart home') == {'property_level': 1}
+    assert extract_features('nothing special')['property_level'] == 5
+    assert 'warning' in extract_features(None)
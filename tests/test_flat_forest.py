@@ -0,0 +1,47 @@
+import os
+import joblib
+import numpy as np
+import pytest
+from app.config import Config
+from app.ml.flat_forest import FlatForest
+
+pytestmark = pytest.mark.filterwarnings('ignore:X does not have valid feature names')
+
+
+def _load_model():
+    return joblib.load(os.path.join(Config.MODEL_DIR, 'price_model.pkl'))
+
+
+def test_flat_forest_matches_sklearn():
+    model = _load_model()
+    forest = FlatForest.from_model(model)
+    rng = np.random.default_rng(0)
+
+    X = rng.standard_normal((5000, forest.n_features)) * 2
+    X[rng.random(X.shape) < 0.02] = np.nan
+
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(forest.predict(X[:1]), model.predict(X[:1]), rtol=0, atol=1e-9)
+
+
+def test_flat_forest_matches_sklearn_on_split_thresholds():
+    model = _load_model()
+    forest = FlatForest.from_model(model)
+    rng = np.random.default_rng(1)
+
+    X = rng.standard_normal((500, forest.n_features))
+    is_split = forest.left != np.arange(len(forest.left))
+    for feature in range(forest.n_features):
+        thresholds = forest.threshold[is_split & (forest.feature == feature)]
+        if len(thresholds):
+            X[:, feature] = rng.choice(thresholds, len(X))
+
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=0, atol=1e-9)
+
+
+def test_exported_trees_match_model():
+    model = _load_model()
+    forest = FlatForest.load(os.path.join(Config.MODEL_DIR, 'price_model_trees.npz'))
+    X = np.random.default_rng(2).standard_normal((1000, forest.n_features))
+
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=0, atol=1e-9)
@@ -0,0 +1,52 @@
+import sqlite3
+from app.utils.ingest import RealEstateIngestor
+
+SCHEMA = """
+    CREATE TABLE real_estate (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        price REAL NOT NULL,
+        district TEXT NOT NULL,
+        rooms INTEGER NOT NULL,
+        floor INTEGER NOT NULL,
+        floors INTEGER NOT NULL,
+        area REAL NOT NULL,
+        type TEXT NOT NULL,
+        cond TEXT NOT NULL,
+        walls TEXT NOT NULL,
+        desc TEXT
+    )
+"""
+
+CSV = """price,district,rooms,floor,floors,area,type,cond,walls,desc
+95000.0,Malinovsky,3.0,10,10.0,100.0,New ,Renovation,Brick,"Sea view, sauna "
+55000.0,Kievsky,2.0,5,14.0,76.0,Old fund,After builders,,
+55000.0,Kievsky,2.0,5,14.0,76.0,Old fund ,After builders,,
+abc,Kievsky,2.0,5,14.0,76.0,Old fund,After builders,,
+40000.0,Primorsky,1.5,2,9.0,30.0,Czech,Renovation,Panel,
+"""
+
+
+def test_ingest_normalizes_and_is_idempotent(tmp_path):
+    db_path = str(tmp_path / 'real_estate.db')
+    csv_path = tmp_path / 'feed.csv'
+    csv_path.write_text(CSV)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(SCHEMA)
+    conn.execute("INSERT INTO real_estate (price, district, rooms, floor, floors, area, type, cond, walls, desc) "
+                 "VALUES (95000.0, 'Malinovsky', 3, 10, 10, 100.0, 'New ', 'Renovation', 'Brick', 'Sea view, sauna ')")
+    conn.commit()
+
+    ingestor = RealEstateIngestor(db_path, chunk_size=2)
+    stats = ingestor.ingest(str(csv_path))
+    assert (stats['read'], stats['inserted'], stats['duplicates'], stats['rejected']) == (5, 1, 2, 2)
+
+    rows = conn.execute("SELECT id, price, rooms, type, walls, desc FROM real_estate ORDER BY id").fetchall()
+    assert rows == [(1, 95000.0, 3, 'New', 'Brick', 'Sea view, sauna '),
+                    (2, 55000.0, 2, 'Old fund', '', None)]
+
+    stats = ingestor.ingest(str(csv_path))
+    assert (stats['inserted'], stats['duplicates']) == (0, 3)
+    assert conn.execute("SELECT COUNT(*) FROM real_estate").fetchone()[0] == 2
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+    conn.close()
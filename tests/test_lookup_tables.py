@@ -0,0 +1,56 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from app.config import Config
+from app.ml.featurizer import Featurizer, CATEGORICAL, NUMERIC
+
+
+def _load_artifacts():
+    target_encoder = joblib.load(os.path.join(Config.MODEL_DIR, 'target_encoder.pkl'))
+    scaler = joblib.load(os.path.join(Config.MODEL_DIR, 'scaler.pkl'))
+    feature_names = joblib.load(os.path.join(Config.MODEL_DIR, 'feature_names.pkl'))
+    featurizer = Featurizer.load(os.path.join(Config.MODEL_DIR, 'lookup_tables.json'))
+    return target_encoder, scaler, feature_names, featurizer
+
+
+def _parity_rows(target_encoder):
+    categories = {item['col']: [value for value in item['mapping'].index if isinstance(value, str)]
+                  for item in target_encoder.ordinal_encoder.mapping}
+    size = max(len(values) for values in categories.values()) + 2
+
+    rows = []
+    for index in range(size):
+        row = {}
+        for column in CATEGORICAL:
+            values = categories[column] + ['Unknown category', None]
+            row[column] = values[index % len(values)]
+        row.update({'rooms': 1 + index % 5, 'floor': 1 + index % 9, 'floors': 9 + index % 16,
+                    'area': 30.5 + index * 7, 'desc': 'Fully renovated flat with sea view' if index % 2 else None})
+        rows.append(row)
+    return rows
+
+
+def test_lookup_tables_match_target_encoder():
+    target_encoder, scaler, feature_names, featurizer = _load_artifacts()
+    rows = _parity_rows(target_encoder)
+
+    df = pd.DataFrame(rows)
+    derived = [Featurizer.derive(row['area'], row['desc'])[0] for row in rows]
+    df[NUMERIC[4:]] = pd.DataFrame(derived, columns=NUMERIC[4:])
+
+    expected = target_encoder.transform(df[feature_names])
+    expected[NUMERIC] = scaler.transform(expected[NUMERIC])
+    expected = expected.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float64)
+
+    matrix, _ = featurizer.transform_many(rows)
+    single = np.vstack([featurizer.transform(row)[0] for row in rows])
+
+    assert np.array_equal(matrix, expected)
+    assert np.array_equal(single, expected)
+
+
+def test_lookup_tables_match_exported_encoder():
+    target_encoder, scaler, feature_names, featurizer = _load_artifacts()
+
+    assert Featurizer.from_artifacts(target_encoder, scaler, feature_names).to_dict() == featurizer.to_dict()
@@ -0,0 +1,78 @@
+import os
+import time
+import joblib
+import pytest
+from app.config import Config
+from app.ml import model_registry as registry_module
+from app.ml.model_bundle import ModelBundle
+from app.ml.model_registry import ModelRegistry
+
+
+def _publish(registry, activate=True):
+    artifacts = {name: joblib.load(os.path.join(Config.MODEL_DIR, file_name))
+                 for name, file_name in ModelBundle.ARTIFACTS.items()}
+    artifacts.update({name: joblib.load(os.path.join(Config.MODEL_DIR, file_name))
+                      for name, file_name in ModelBundle.ENCODER_ARTIFACTS.items()})
+    model = joblib.load(os.path.join(Config.MODEL_DIR, ModelBundle.MODEL_FILE))
+    return registry.publish(model, artifacts['target_encoder'], artifacts['scaler'], artifacts['feature_names'],
+                            metrics={'mae': 1.0}, activate=activate)
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_publish_writes_an_immutable_version(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    version = _publish(registry)
+
+    assert registry.versions() == [version]
+    assert registry.active_version() == version
+    assert registry.get_manifest(version)['metrics'] == {'mae': 1.0}
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.tmp-')]
+
+    bundle = registry.current()
+    assert bundle.version == version
+    assert registry.current() is bundle
+
+    with pytest.raises(ValueError):
+        registry.reload('v00000000-000000')
+
+
+def test_current_hot_reloads_a_version_published_by_another_process(tmp_path):
+    serving = ModelRegistry(str(tmp_path), refresh_interval=0)
+    first = _publish(serving)
+    assert serving.current().version == first
+
+    second = _publish(ModelRegistry(str(tmp_path)))
+    old = serving.current()
+    assert old.version == first
+    assert _wait_for(lambda: serving.current().version == second)
+
+
+def test_failed_reload_is_logged_and_retried(tmp_path, monkeypatch):
+    errors = []
+    monkeypatch.setattr(registry_module.logger, 'log_error', lambda message, stack_trace=None: errors.append(message))
+
+    serving = ModelRegistry(str(tmp_path), refresh_interval=0)
+    first = _publish(serving)
+    assert serving.current().version == first
+
+    second = _publish(ModelRegistry(str(tmp_path)), activate=False)
+    model_path = os.path.join(tmp_path, second, ModelBundle.MODEL_FILE)
+    with open(model_path, 'rb') as f:
+        content = f.read()
+    with open(model_path, 'wb') as f:
+        f.write(content[:-1])
+    ModelRegistry(str(tmp_path))._write_pointer(second)
+
+    assert _wait_for(lambda: serving.current() and errors)
+    assert serving.current().version == first
+    assert second in errors[0]
+
+    with open(model_path, 'wb') as f:
+        f.write(content)
+    assert _wait_for(lambda: serving.current().version == second)
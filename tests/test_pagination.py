@@ -0,0 +1,111 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from app.models.real_estate.models import RealEstateDB
+from app.services import services
+from app.utils.dataset_cache import DatasetCache
+from app.utils.utils import Utils
+
+ROWS = 47
+
+
+def _listings():
+    rng = np.random.default_rng(3)
+    ids = rng.permutation(np.arange(1, 200))[:ROWS]
+    return pd.DataFrame({
+        'id': ids,
+        'price': rng.choice([40000, 50000, 65000], ROWS),
+        'district': rng.choice(['Primorsky', 'Kievsky'], ROWS),
+        'rooms': rng.integers(1, 4, ROWS),
+        'floor': rng.integers(1, 4, ROWS),
+        'floors': rng.choice([5, 9], ROWS),
+        'area': rng.choice([30.5, 45.0, 61.2], ROWS),
+        'type': 'Czech',
+        'cond': 'Renovation',
+        'walls': 'Brick',
+        'desc': [f'listing {row_id}' for row_id in ids]
+    })
+
+
+@pytest.fixture
+def listings(tmp_path):
+    path = str(tmp_path / 'real_estate.db')
+    df = _listings()
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE real_estate (id INTEGER PRIMARY KEY, price INTEGER, district TEXT, rooms INTEGER, "
+                 "floor INTEGER, floors INTEGER, area REAL, type TEXT, cond TEXT, walls TEXT, desc TEXT)")
+    conn.executemany(f"INSERT INTO real_estate VALUES ({', '.join('?' * len(RealEstateDB.COLUMNS))})",
+                     df[RealEstateDB.COLUMNS].astype(object).itertuples(index=False))
+    conn.commit()
+    conn.row_factory = sqlite3.Row
+    yield path, conn, df
+    conn.close()
+
+
+def _expected(df, sort, descending):
+    ordered = df.sort_values([sort, 'id'], kind='stable')['id'].tolist()
+    return ordered[::-1] if descending else ordered
+
+
+def _pages(read_page, limit):
+    ids, after = [], None
+    while True:
+        records = read_page(after, limit + 1)
+        ids.extend(record['id'] for record in records[:limit])
+        if len(records) <= limit:
+            return ids
+        after = records[limit - 1]['id']
+
+
+def test_parse_page_args():
+    assert Utils.parse_page_args({}) == {'limit': 100, 'after': None, 'columns': RealEstateDB.COLUMNS,
+                                         'sort': None, 'descending': False}
+    assert Utils.parse_page_args({'limit': '5', 'after': '12', 'columns': 'area, price', 'sort': 'area',
+                                  'order': 'desc'}) == \
+           {'limit': 5, 'after': 12, 'columns': ['id', 'price', 'area'], 'sort': 'area', 'descending': True}
+
+    for values in ({'limit': '0'}, {'limit': '1001'}, {'limit': 'many'}, {'after': 'x'},
+                   {'columns': 'price,password'}, {'sort': 'desc'}, {'sort': 'district'}, {'order': 'up'}):
+        assert Utils.parse_page_args(values) is None, values
+
+
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('sort', RealEstateDB.SORTABLE_COLUMNS)
+def test_get_page_returns_every_row_once_in_order(listings, sort, descending):
+    path, conn, df = listings
+    re_db = RealEstateDB(conn)
+
+    columns = list(dict.fromkeys(['id', sort]))
+    ids = _pages(lambda after, limit: re_db.get_page(columns, sort, descending, after, limit), 6)
+    assert ids == _expected(df, sort, descending)
+
+
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('sort', RealEstateDB.SORTABLE_COLUMNS)
+def test_cleaned_page_returns_every_row_once_in_order(listings, monkeypatch, sort, descending):
+    path, conn, df = listings
+    monkeypatch.setattr(services, 'cleaned_real_estate_data',
+                        DatasetCache(lambda: df.drop(columns=['desc']).sample(frac=1, random_state=0), path))
+    re_db = RealEstateDB(conn)
+    columns = list(dict.fromkeys(['id', sort, 'desc']))
+
+    def read_page(after, limit):
+        page = {'limit': limit - 1, 'after': after, 'columns': columns, 'sort': sort, 'descending': descending}
+        records, total = services.cleaned_page(page, re_db)
+        assert total == ROWS
+        assert all(record['desc'] == f"listing {record['id']}" for record in records)
+        return records
+
+    assert _pages(read_page, 6) == _expected(df, sort, descending)
+
+
+def test_unknown_cursor(listings, monkeypatch):
+    path, conn, df = listings
+    monkeypatch.setattr(services, 'cleaned_real_estate_data', DatasetCache(lambda: df, path))
+    re_db = RealEstateDB(conn)
+    unknown = int(df['id'].max()) + 1
+
+    page = {'limit': 5, 'after': unknown, 'columns': ['id', 'price'], 'sort': 'price', 'descending': False}
+    assert services.cleaned_page(page, re_db) == (None, ROWS)
+    assert re_db.get_page(['id', 'price'], 'price', False, unknown, 5) == []
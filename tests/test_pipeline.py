@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from app.ml.featurizer import PROPERTY_WEIGHTS
+from app.utils.pipeline import Pipeline, DerivedFeatures, DropDuplicates, listing_pipeline
+
+
+def _listings(size=500):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'id': np.arange(size),
+        'price': rng.integers(5000, 200000, size),
+        'district': rng.choice(['primorsky', 'kievsky', 'Brick'], size),
+        'rooms': rng.integers(0, 5, size),
+        'floor': rng.integers(1, 12, size),
+        'floors': rng.integers(5, 16, size),
+        'area': rng.uniform(5, 150, size).round(1),
+        'type': rng.choice(['new', 'czech', '', 'None'], size),
+        'cond': rng.choice(['renovation', 'after builders'], size),
+        'walls': rng.choice(['Brick', 'panel'], size)
+    })
+
+
+def test_pipeline_runs_the_same_in_chunks():
+    df = _listings()
+    pipeline = listing_pipeline()
+
+    eager = pipeline.run(df.copy())
+    eager_stats = [dict(item) for item in pipeline.stats]
+    chunked = pipeline.run_chunks(df.iloc[start:start + 64].copy() for start in range(0, len(df), 64))
+
+    pd.testing.assert_frame_equal(eager, chunked)
+    assert [(item['rows_in'], item['rows_out']) for item in eager_stats] == \
+           [(item['rows_in'], item['rows_out']) for item in pipeline.stats]
+    assert eager_stats[0]['rows_in'] == len(df) and eager_stats[-1]['rows_out'] == len(eager)
+
+
+def test_derived_features_match_training_formulas():
+    df = pd.DataFrame({'property_level': [1, 2, 3, 4, 5, 2], 'area': [30.0, 45.5, 60.0, 80.2, 120.0, 33.3]})
+    result = Pipeline([DerivedFeatures()]).run(df)
+
+    expected = df.copy()
+    expected['property_strength'] = expected['property_level'].map(PROPERTY_WEIGHTS)
+    expected['high_quality_property'] = expected['property_level'].apply(lambda x: 1 if x <= 2 else 0)
+    expected['property_area_factor'] = expected['property_strength'] * expected['area']
+    expected['is_luxury'] = expected['property_level'].apply(lambda x: 1 if x == 1 else 0)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+class _CollectingWriter:
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, df):
+        self.chunks.append(df)
+
+    def close(self):
+        self.closed = True
+
+
+def test_streaming_matches_eager_run():
+    df = _listings(2000)
+    chunks = [df.iloc[start:start + 150].reset_index(drop=True) for start in range(0, len(df), 150)]
+
+    eager = listing_pipeline().run(df.copy())
+
+    pipeline = listing_pipeline()
+    writer = _CollectingWriter()
+    rows = pipeline.stream(chunks, writer)
+
+    assert writer.closed and rows == len(eager)
+    assert pipeline.passes == 1 + sum(stage.needs_fit for stage in pipeline.stages)
+    pd.testing.assert_frame_equal(pd.concat(writer.chunks), eager)
+
+
+def test_streaming_drops_duplicates_across_chunks():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'rooms': rng.integers(1, 4, 3000), 'area': rng.integers(30, 40, 3000).astype(float),
+                       'type': rng.choice(['new', 'czech'], 3000)})
+    chunks = [df.iloc[start:start + 256].reset_index(drop=True) for start in range(0, len(df), 256)]
+    chunks[1]['rooms'] = chunks[1]['rooms'].astype(float)
+
+    pipeline = Pipeline([DropDuplicates()])
+    writer = _CollectingWriter()
+    rows = pipeline.stream(chunks, writer)
+
+    expected = df.drop_duplicates()
+    assert rows == len(expected) == 3 * 10 * 2
+    assert pd.concat(writer.chunks).index.tolist() == expected.index.tolist()
+    assert pipeline.stages[0]._seen is None
@@ -0,0 +1,12 @@
+from tests.responsclass.responsclass import Response
+
+
+def test_post_request_predict_batch(post_request_predict_batch):
+    request = post_request_predict_batch()
+
+    response = Response(request)
+    response.assert_status_code(200)
+    assert response.response_json['count'] == 2, f"Response should contain every record: {response.response_json}"
+    assert 'predicted_price' in response.response_json['predictions'][0], response.response_json
+    assert 'error' in response.response_json['predictions'][1], response.response_json
+    print(response.__str__())
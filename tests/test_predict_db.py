@@ -0,0 +1,56 @@
+import sqlite3
+import pytest
+from app.database.migrations import migrate
+from app.models.predicts.models import PredictDB
+
+LEGACY_SCHEMA = [
+    """
+    CREATE TABLE requests (
+        id INTEGER NOT NULL, district TEXT NOT NULL, rooms INTEGER NOT NULL, floor INTEGER NOT NULL,
+        floors INTEGER NOT NULL, area REAL NOT NULL, type TEXT NOT NULL, cond TEXT NOT NULL, walls TEXT NOT NULL,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE predictions (
+        id INTEGER NOT NULL, price REAL NOT NULL, mean_error REAL NOT NULL, mse REAL NOT NULL,
+        request_id INTEGER NOT NULL, timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+]
+
+REQUEST = {'district': 'Primorsky', 'rooms': 2, 'floor': 3, 'floors': 9, 'area': 55.0,
+           'type': 'Czech', 'cond': 'Renovation', 'walls': 'Brick', 'desc': None}
+
+
+def test_save_results_is_one_transaction_under_reserved_ids(tmp_path):
+    path = str(tmp_path / 'predictions.db')
+    with sqlite3.connect(path) as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(statement)
+        conn.execute("INSERT INTO requests (id, district, rooms, floor, floors, area, type, cond, walls) "
+                     "VALUES (41, 'Kievsky', 1, 2, 9, 30.0, 'Czech', 'Renovation', 'Brick')")
+        conn.execute("INSERT INTO predictions (id, price, mean_error, mse, request_id) VALUES (41, 40000.0, 1.0, 1.0, 41)")
+    conn.close()
+
+    assert migrate({'predictions': path})['predictions'][:2] == ['requests', 'predictions']
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    pr_db = PredictDB(conn)
+
+    assert pr_db.reserve_ids(2) == 42
+    timestamp = '2025-01-01 00:00:00'
+    with pytest.raises(KeyError):
+        pr_db.save_results([(42, REQUEST, {'predicted_price': 50000.0}, timestamp), (43, REQUEST, {}, timestamp)])
+    assert conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0] == 1
+    assert pr_db.save_results([(42, REQUEST, {'predicted_price': 50000.0}, timestamp),
+                               (43, REQUEST, {'predicted_price': 51000.0}, timestamp)]) == 2
+
+    assert [dict(row) for row in conn.execute("SELECT id, request_id, price FROM predictions ORDER BY id")] == [
+        {'id': 41, 'request_id': 41, 'price': 40000.0},
+        {'id': 42, 'request_id': 42, 'price': 50000.0},
+        {'id': 43, 'request_id': 43, 'price': 51000.0}]
+    assert conn.execute("INSERT INTO requests (district, rooms, floor, floors, area, type, cond, walls) "
+                        "VALUES ('Kievsky', 1, 2, 9, 30.0, 'Czech', 'Renovation', 'Brick')").lastrowid == 44
+    conn.close()
@@ -0,0 +1,81 @@
+from app.ml import prediction_cache as cache_module
+from app.ml.prediction_cache import PredictionCache
+
+LISTING = {'district': 'Primorsky', 'rooms': '2', 'floor': 3, 'floors': 9, 'area': '55',
+           'type': 'Czech', 'cond': 'Renovation', 'walls': 'Brick', 'desc': ''}
+
+
+def _key(rooms):
+    return PredictionCache.make_key(dict(LISTING, rooms=rooms))
+
+
+def test_make_key_canonicalizes_listings():
+    assert PredictionCache.make_key(LISTING) == \
+           ('Primorsky', 2, 3, 9, 55.0, 'Czech', 'Renovation', 'Brick', None)
+    assert PredictionCache.make_key(dict(LISTING, rooms=2, area=55.0, desc=None)) == PredictionCache.make_key(LISTING)
+
+
+def test_cache_evicts_least_recently_used_entries():
+    cache = PredictionCache(maxsize=2, ttl=0)
+
+    assert cache.get('v1', _key(1)) is None
+    cache.put('v1', _key(1), {'predicted_price': 1.0})
+    cache.put('v1', _key(2), {'predicted_price': 2.0})
+    assert cache.get('v1', _key(1)) == {'predicted_price': 1.0}
+    cache.put('v1', _key(3), {'predicted_price': 3.0})
+
+    assert cache.get('v1', _key(2)) is None
+    assert cache.get('v1', _key(1)) == {'predicted_price': 1.0}
+    assert cache.get('v1', _key(3)) == {'predicted_price': 3.0}
+
+    stats = cache.stats()
+    assert (stats['size'], stats['hits'], stats['misses'], stats['evictions']) == (2, 3, 2, 1)
+    assert stats['hit_rate'] == 0.6
+
+
+def test_cached_results_are_copies():
+    cache = PredictionCache(maxsize=2, ttl=0)
+    result = {'predicted_price': 1.0}
+    cache.get('v1', _key(1))
+    cache.put('v1', _key(1), result)
+
+    result['predicted_price'] = 2.0
+    cache.get('v1', _key(1))['predicted_price'] = 3.0
+    assert cache.get('v1', _key(1)) == {'predicted_price': 1.0}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    cache = PredictionCache(maxsize=10, ttl=60)
+
+    cache.get('v1', _key(1))
+    cache.put('v1', _key(1), {'predicted_price': 1.0})
+    now[0] = 159.0
+    assert cache.get('v1', _key(1)) == {'predicted_price': 1.0}
+    now[0] = 161.0
+    assert cache.get('v1', _key(1)) is None
+
+    stats = cache.stats()
+    assert (stats['size'], stats['expirations'], stats['hits'], stats['misses']) == (0, 1, 1, 2)
+
+
+def test_model_change_clears_the_cache():
+    cache = PredictionCache(maxsize=10, ttl=0)
+    cache.get('v1', _key(1))
+    cache.put('v1', _key(1), {'predicted_price': 1.0})
+
+    assert cache.get('v2', _key(1)) is None
+    assert cache.stats()['invalidations'] == 1 and cache.stats()['size'] == 0
+
+    cache.put('v1', _key(1), {'predicted_price': 1.0})
+    assert cache.stats()['size'] == 0
+    cache.put('v2', _key(1), {'predicted_price': 2.0})
+    assert cache.get('v2', _key(1)) == {'predicted_price': 2.0}
+
+
+def test_zero_maxsize_disables_the_cache():
+    cache = PredictionCache(maxsize=0, ttl=0)
+    cache.put('v1', _key(1), {'predicted_price': 1.0})
+    assert cache.get('v1', _key(1)) is None
+    assert cache.stats()['misses'] == 0
@@ -0,0 +1,46 @@
+import sqlite3
+from app.database.dbconnection import ConnectionPool
+from app.database.migrations import PREDICTION_TABLES, migrate
+from app.models.users.model import UserDB
+
+
+def test_history_is_one_indexed_query_across_databases(tmp_path):
+    predictions = str(tmp_path / 'predictions.db')
+    users = str(tmp_path / 'users.db')
+
+    with sqlite3.connect(predictions) as conn:
+        for sql in PREDICTION_TABLES.values():
+            conn.execute(sql)
+        conn.executemany("INSERT INTO requests (id, district, rooms, floor, floors, area, type, cond, walls) "
+                         "VALUES (?, 'Kievsky', 1, 2, 9, 30.0, 'Czech', 'Renovation', 'Brick')",
+                         [(i,) for i in range(1, 3001)])
+        conn.executemany("INSERT INTO predictions (id, price, mean_error, mse, request_id) VALUES (?, ?, 1.0, 1.0, ?)",
+                         [(i, 1000.0 + i, i) for i in range(1, 3001)])
+    conn.close()
+    with sqlite3.connect(users) as conn:
+        conn.execute("CREATE TABLE user_predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+                     "request_id INTEGER NOT NULL, prediction_id INTEGER NOT NULL)")
+        conn.executemany("INSERT INTO user_predictions (user_id, request_id, prediction_id) VALUES (?, ?, ?)",
+                         [(1 + i % 2, i, i) for i in range(1, 3001)])
+    conn.close()
+    migrate({'predictions': predictions, 'users': users})
+
+    pool = ConnectionPool(users, size=1, attach={UserDB.PREDICTIONS_SCHEMA: predictions})
+    conn = pool.acquire()
+    user_db = UserDB(conn)
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    page = user_db.get_prediction_history(1, limit=2)
+    conn.set_trace_callback(None)
+
+    assert [(item['history_id'], item['id'], item['price']) for item in page] == [(3000, 3000, 4000.0), (2998, 2998, 3998.0)]
+    assert [item['id'] for item in user_db.get_prediction_history(1, after=2998, limit=2)] == [2996, 2994]
+    assert len(user_db.get_prediction_history(2)) == 1500
+    assert user_db.get_prediction_history(3) == []
+
+    (sql,) = statements
+    plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+    assert not [detail for detail in plan if detail.startswith('SCAN')], plan
+    assert not [detail for detail in plan if 'TEMP B-TREE' in detail], plan
+    pool.release(conn)
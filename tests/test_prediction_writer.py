@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+from app.config import Config
+from app.database.migrations import PREDICTION_TABLES
+from app.database.prediction_writer import PredictionWriter
+
+REQUEST = {'district': 'Primorsky', 'rooms': 2, 'floor': 3, 'floors': 9, 'area': 55.0,
+           'type': 'Czech', 'cond': 'Renovation', 'walls': 'Brick', 'desc': None}
+
+
+def _databases(tmp_path):
+    predictions = str(tmp_path / 'predictions.db')
+    users = str(tmp_path / 'users.db')
+    with sqlite3.connect(predictions) as conn:
+        for sql in PREDICTION_TABLES.values():
+            conn.execute(sql)
+        conn.execute("INSERT INTO requests (id, district, rooms, floor, floors, area, type, cond, walls) "
+                     "VALUES (7, 'Kievsky', 1, 2, 9, 30.0, 'Czech', 'Renovation', 'Brick')")
+    conn.close()
+    with sqlite3.connect(users) as conn:
+        conn.execute("CREATE TABLE user_predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+                     "request_id INTEGER NOT NULL, prediction_id INTEGER NOT NULL)")
+    conn.close()
+    return predictions, users
+
+
+def test_writer_batches_and_drains(tmp_path):
+    predictions, users = _databases(tmp_path)
+    writer = PredictionWriter(predictions, users, queue_size=4, batch_size=8, id_block=5)
+
+    ids = []
+    lock = threading.Lock()
+
+    def submit(offset):
+        for i in range(10):
+            result = writer.submit(REQUEST, {'predicted_price': 1000.0 * (offset + i)}, user_id=1 if i % 2 else None)
+            with lock:
+                ids.append(result)
+
+    threads = [threading.Thread(target=submit, args=(offset,)) for offset in (0, 100, 200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    assert sorted(req_id for req_id, _ in ids) == list(range(8, 38))
+    assert all(req_id == pr_id for req_id, pr_id in ids)
+    assert writer.stats()['written'] == 30 and writer.stats()['queued'] == 0
+
+    conn = sqlite3.connect(predictions)
+    assert conn.execute("SELECT COUNT(*), MIN(id), MAX(id), SUM(id != request_id) FROM predictions").fetchone() == (30, 8, 37, 0)
+    assert conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0] == 31
+    assert conn.execute("INSERT INTO requests (district, rooms, floor, floors, area, type, cond, walls) "
+                        "VALUES ('Kievsky', 1, 2, 9, 30.0, 'Czech', 'Renovation', 'Brick')").lastrowid == 38
+    conn.close()
+
+    conn = sqlite3.connect(users)
+    assert conn.execute("SELECT COUNT(*), SUM(request_id != prediction_id) FROM user_predictions").fetchone() == (15, 0)
+    conn.close()
+
+
+def test_writer_flush_makes_writes_visible(tmp_path):
+    predictions, users = _databases(tmp_path)
+    writer = PredictionWriter(predictions, users, id_block=2)
+
+    req_id, pr_id = writer.submit(REQUEST, {'predicted_price': 50000.0})
+    assert writer.flush(5)
+
+    conn = sqlite3.connect(predictions)
+    assert conn.execute("SELECT price FROM predictions WHERE id = ? AND request_id = ?", (pr_id, req_id)).fetchone() == (50000.0,)
+    conn.close()
+    writer.close()
+
+
+def test_writer_retries_while_the_database_is_locked(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DB_BUSY_TIMEOUT', 0.01)
+    predictions, users = _databases(tmp_path)
+    writer = PredictionWriter(predictions, users, id_block=10, retry_delay=0.01)
+    writer.submit(REQUEST, {'predicted_price': 50000.0})
+    assert writer.flush(5)
+
+    lock = sqlite3.connect(predictions)
+    lock.execute('BEGIN EXCLUSIVE')
+    ids = [writer.submit(REQUEST, {'predicted_price': 51000.0}, user_id=1)[0] for _ in range(2)]
+    assert not writer.flush(0.2)
+    assert writer.stats()['retried'] > 0 and writer.stats()['queued'] == 2 and writer.stats()['failed'] == 0
+    lock.rollback()
+    lock.close()
+
+    assert writer.flush(5)
+    writer.close()
+    assert writer.stats()['written'] == 3 and writer.stats()['failed'] == 0
+
+    conn = sqlite3.connect(predictions)
+    assert [row[0] for row in conn.execute("SELECT id FROM predictions WHERE price = 51000.0 ORDER BY id")] == ids
+    conn.close()
+    conn = sqlite3.connect(users)
+    assert [row[0] for row in conn.execute("SELECT prediction_id FROM user_predictions ORDER BY id")] == ids
+    conn.close()
+
+
+def test_writer_drops_only_the_bad_record_of_a_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DB_BUSY_TIMEOUT', 0.01)
+    predictions, users = _databases(tmp_path)
+    writer = PredictionWriter(predictions, users, id_block=10, retry_delay=0.01)
+
+    lock = sqlite3.connect(predictions)
+    writer.submit(REQUEST, {'predicted_price': 50000.0})
+    assert writer.flush(5)
+    lock.execute('BEGIN EXCLUSIVE')
+    good = [writer.submit(REQUEST, {'predicted_price': 1000.0 * i})[0] for i in range(3)]
+    bad = writer.submit(REQUEST, {'price': 1.0})[0]
+    good.append(writer.submit(REQUEST, {'predicted_price': 5000.0})[0])
+    lock.rollback()
+    lock.close()
+
+    assert writer.flush(5)
+    writer.close()
+    assert writer.stats()['written'] == 5 and writer.stats()['failed'] == 1
+
+    conn = sqlite3.connect(predictions)
+    saved = [row[0] for row in conn.execute("SELECT id FROM predictions ORDER BY id")]
+    assert bad not in saved and set(good) <= set(saved)
+    assert conn.execute("SELECT COUNT(*) FROM requests WHERE id = ?", (bad,)).fetchone()[0] == 0
+    conn.close()
+
+
+def test_submit_drops_a_prediction_when_the_queue_stays_full(tmp_path, monkeypatch):
+    predictions, users = _databases(tmp_path)
+    writer = PredictionWriter(predictions, users, queue_size=1, id_block=10, put_timeout=0.05)
+    monkeypatch.setattr(writer, '_write', lambda batch: batch)
+    monkeypatch.setattr(writer, '_start', lambda: None)
+
+    writer.submit(REQUEST, {'predicted_price': 50000.0})
+    writer.submit(REQUEST, {'predicted_price': 51000.0})
+
+    stats = writer.stats()
+    assert (stats['queued'], stats['overflows'], stats['dropped'], stats['failed']) == (1, 1, 1, 1)
@@ -19,3 +19,19 @@ def test_get_request_predictions(get_request_predictions):
     assert 'error' not in response.response_json, f"Response should not contain error: {response.response_json}"
     print(response.__str__())
 
+
+def test_get_request_user_predictions_paginated(post_request_predict, get_request_user_predictions):
+    Response(post_request_predict()).assert_status_code(201)
+    Response(post_request_predict()).assert_status_code(201)
+
+    request = get_request_user_predictions({'limit': 1})
+
+    response = Response(request)
+    response.assert_status_code(200)
+    predictions, marker = response.response_json
+    assert marker == {'user': 'not authenticated'}
+    assert len(predictions) == 1 and predictions[0]['price'] > 0
+    assert request.headers['X-Next-Cursor'] == '1'
+
+    page = get_request_user_predictions({'limit': 1, 'after': 1}).json()
+    assert page[0][0]['id'] < predictions[0]['id']
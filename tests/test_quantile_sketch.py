@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from app.utils.quantile_sketch import QuantileSketch
+
+
+def test_sketch_is_exact_below_capacity():
+    values = np.random.default_rng(0).lognormal(11, 0.6, 5000)
+    sketch = QuantileSketch(capacity=10000)
+    for chunk in np.array_split(values, 7):
+        sketch.add(chunk)
+
+    for q in (0.025, 0.5, 0.995):
+        assert sketch.quantile(q) == pd.Series(values).quantile(q)
+
+
+def test_merged_sketch_rank_error_is_small():
+    values = np.random.default_rng(1).lognormal(11, 0.6, 300000)
+    sketches = [QuantileSketch(capacity=4096) for _ in range(3)]
+    for index, sketch in enumerate(sketches):
+        for chunk in np.array_split(values[index::3], 20):
+            sketch.add(chunk)
+
+    merged = sketches[0]
+    merged.merge(sketches[1])
+    merged.merge(sketches[2])
+
+    assert merged.count == len(values)
+    assert sum(len(level) for level in merged.levels) < 4096 * len(merged.levels)
+    for q in (0.025, 0.5, 0.995):
+        assert abs((values < merged.quantile(q)).mean() - q) < 0.005
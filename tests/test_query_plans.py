@@ -0,0 +1,124 @@
+import inspect
+import re
+import sqlite3
+import pytest
+from app.config import Config
+from app.database.migrations import migrate
+from app.models.predicts.models import PredictDB
+from app.models.real_estate.models import RealEstateDB
+
+FULL_SCAN = re.compile(r'^SCAN \w+$')
+
+REQUEST = {'district': 'Primorsky', 'rooms': 2, 'floor': 3, 'floors': 9, 'area': 55.0,
+           'type': 'Czech', 'cond': 'Renovation', 'walls': 'Brick', 'desc': None}
+
+CALLS = [
+    ('RealEstateDB.get_all_data', lambda re_db, pr_db: re_db.get_all_data()),
+    ('RealEstateDB.get_all_data_filter', lambda re_db, pr_db: re_db.get_all_data_filter('price')),
+    ('RealEstateDB.get_all_data_search', lambda re_db, pr_db: re_db.get_all_data_search('district', 'prim')),
+    ('RealEstateDB.search_page unscoped', lambda re_db, pr_db: re_db.search_page(
+        re_db.match_expression('czech'), RealEstateDB.COLUMNS)),
+    ('RealEstateDB.search_page', lambda re_db, pr_db: re_db.search_page(
+        re_db.match_expression('prim', 'district'), ['id', 'price'], 2)),
+    ('RealEstateDB.count_matches', lambda re_db, pr_db: re_db.count_matches(re_db.match_expression('renov'))),
+    ('RealEstateDB.get_search_digit', lambda re_db, pr_db: [re_db.get_search_digit(column, 2) for column in
+                                                            ['id', 'price', 'rooms', 'floor', 'floors', 'area']]),
+    ('RealEstateDB.get_min_max_data', lambda re_db, pr_db: re_db.get_min_max_data()),
+    ('RealEstateDB.get_data_from_id', lambda re_db, pr_db: re_db.get_data_from_id(1)),
+    ('RealEstateDB.get_descriptions', lambda re_db, pr_db: re_db.get_descriptions([1, 5, 9])),
+    ('RealEstateDB.get_page first page', lambda re_db, pr_db: re_db.get_page(RealEstateDB.COLUMNS)),
+    ('RealEstateDB.get_page', lambda re_db, pr_db: [
+        re_db.get_page(RealEstateDB.COLUMNS, 'id', True, 2),
+        re_db.get_page(RealEstateDB.COLUMNS, 'price', False, None),
+        re_db.get_page(RealEstateDB.COLUMNS, 'area', True, 2),
+        re_db.get_page(['id', 'rooms'], 'floor', False, 2, condition='rooms = ?', params=(2,)),
+        re_db.get_page(RealEstateDB.COLUMNS, 'id', False, 1, condition='district IN (?)', params=('Primorsky',)),
+        re_db.get_page(RealEstateDB.COLUMNS, 'price', False, 1,
+                       condition='id IN (SELECT rowid FROM real_estate_fts WHERE real_estate_fts MATCH ?)',
+                       params=('"czech"*',))]),
+    ('RealEstateDB.count', lambda re_db, pr_db: [re_db.count(), re_db.count('rooms = ?', (2,))]),
+    ('PredictDB.reserve_ids', lambda re_db, pr_db: pr_db.reserve_ids(10)),
+    ('PredictDB.save_results', lambda re_db, pr_db: pr_db.save_results(
+        [(pr_id, REQUEST, {'predicted_price': 50000.0}, '2025-01-01 00:00:00') for pr_id in (20, 21)])),
+    ('PredictDB.get_all_data', lambda re_db, pr_db: pr_db.get_all_data()),
+    ('PredictDB.get_predict_data', lambda re_db, pr_db: pr_db.get_predict_data(2, 2)),
+    ('PredictDB.get_predict_data_many', lambda re_db, pr_db: pr_db.get_predict_data_many([(2, 2), (1, 1)])),
+    ('PredictDB.get_all_data_search', lambda re_db, pr_db: [pr_db.get_all_data_search({'price': '50000'}),
+                                                            pr_db.get_all_data_search({'request_id': '2'})]),
+    ('PredictDB.delete_prediction', lambda re_db, pr_db: pr_db.delete_prediction(2)),
+    ('PredictDB.delete_data', lambda re_db, pr_db: [pr_db.delete_data(1, 'top'), pr_db.delete_data(1, 'bottom')])
+]
+
+NO_QUERIES = {'RealEstateDB.match_expression'}
+
+ALLOWED_SCANS = {
+    'RealEstateDB.get_all_data': 'returns every row',
+    'RealEstateDB.get_all_data_filter': 'returns one column of every row',
+    'RealEstateDB.get_page first page': 'reads the first LIMIT rows in rowid order',
+    'PredictDB.get_all_data': 'returns every prediction',
+    'PredictDB.delete_data': 'reads the first or last LIMIT predictions in rowid order',
+    'PredictDB.reserve_ids': 'sqlite_sequence holds one row per AUTOINCREMENT table'
+}
+
+
+def _copy_schema(source, target, tables):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        for table in tables:
+            (sql,) = src.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+            dst.execute(sql)
+
+
+@pytest.fixture
+def databases(tmp_path):
+    paths = {'real_estate': str(tmp_path / 'real_estate.db'), 'predictions': str(tmp_path / 'predictions.db')}
+    _copy_schema(Config.DATABASE_REAL_ESTATE, paths['real_estate'], ['real_estate'])
+    _copy_schema(Config.DATABASE_PREDICTIONS, paths['predictions'], ['requests', 'predictions'])
+    migrate(paths)
+
+    with sqlite3.connect(paths['real_estate']) as conn:
+        conn.executemany("INSERT INTO real_estate (price, district, rooms, floor, floors, area, type, cond, walls, desc) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         [(50000.0 + i, 'Primorsky', 1 + i % 3, 3, 9, 40.0 + i, 'Czech', 'Renovation', 'Brick', None)
+                          for i in range(20)])
+
+    connections = {}
+    for key, path in paths.items():
+        connections[key] = sqlite3.connect(path)
+        connections[key].row_factory = sqlite3.Row
+    yield connections
+    for conn in connections.values():
+        conn.close()
+
+
+def test_every_model_method_is_covered():
+    covered = {label.split(' ')[0] for label, _ in CALLS}
+    for cls in (RealEstateDB, PredictDB):
+        methods = {f'{cls.__name__}.{name}' for name, _ in inspect.getmembers(cls, inspect.isfunction)
+                   if not name.startswith('_')}
+        assert methods - NO_QUERIES <= covered, f'No query plan check for {sorted(methods - NO_QUERIES - covered)}'
+
+
+def test_model_queries_use_indexes(databases):
+    re_db = RealEstateDB(databases['real_estate'])
+    pr_db = PredictDB(databases['predictions'])
+
+    failures = []
+    for label, call in CALLS:
+        statements = []
+        for conn in databases.values():
+            conn.set_trace_callback(statements.append)
+        call(re_db, pr_db)
+        for conn in databases.values():
+            conn.set_trace_callback(None)
+
+        queries = [sql for sql in statements if sql.lstrip().split(' ', 1)[0].upper() in ('SELECT', 'INSERT', 'DELETE', 'UPDATE')]
+        assert queries, f'{label} ran no query'
+
+        for sql in queries:
+            conn = databases['predictions' if label.startswith('PredictDB') else 'real_estate']
+            plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+            scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+            if scans and label not in ALLOWED_SCANS:
+                failures.append(f'{label}: {" ".join(sql.split())} -> {plan}')
+
+    assert not failures, '\n'.join(failures)
@@ -0,0 +1,57 @@
+import sqlite3
+from app.database.migrations import migrate
+from app.models.real_estate.models import RealEstateDB
+
+SCHEMA = """
+    CREATE TABLE real_estate (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        price REAL NOT NULL,
+        district TEXT NOT NULL,
+        rooms INTEGER NOT NULL,
+        floor INTEGER NOT NULL,
+        floors INTEGER NOT NULL,
+        area REAL NOT NULL,
+        type TEXT NOT NULL,
+        cond TEXT NOT NULL,
+        walls TEXT NOT NULL,
+        desc TEXT
+    )
+"""
+
+ROWS = [
+    ('Kievsky', 'Czech', 'Renovation', 'Brick', 'Near Primorsky park'),
+    ('Primorsky', 'New', 'Renovation', 'Monolith', 'Sea view, sauna'),
+    ('Suvorovsky', 'Czech', 'After builders', 'Panel', None),
+    ('Primorsky', 'Stalinka', 'Residential clean', 'Brick', 'Quiet yard')
+]
+
+
+def test_search_index_ranks_prefixes_and_follows_writes(tmp_path):
+    path = str(tmp_path / 'real_estate.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute(SCHEMA)
+        conn.execute("INSERT INTO real_estate (price, district, rooms, floor, floors, area, type, cond, walls, desc) "
+                     "VALUES (50000, 'Malinovsky', 2, 3, 9, 50, 'Czech', 'Renovation', 'Brick', 'Old row')")
+    migrate({'real_estate': path})
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executemany("INSERT INTO real_estate (price, district, rooms, floor, floors, area, type, cond, walls, desc) "
+                     "VALUES (50000, ?, 2, 3, 9, 50, ?, ?, ?, ?)", ROWS)
+    re_db = RealEstateDB(conn)
+
+    match = re_db.match_expression('PRIM')
+    assert [row['id'] for row in re_db.search_page(match, ['id'])] == [3, 5, 2]
+    assert re_db.count_matches(match) == 3
+    assert [row['id'] for row in re_db.search_page(match, ['id'], after=3, limit=1)] == [5]
+    assert [row['id'] for row in re_db.search_page(re_db.match_expression('prim', 'district'), ['id'])] == [3, 5]
+    assert re_db.count_matches(re_db.match_expression('old')) == 1
+
+    assert re_db.match_expression('...') is None
+    assert re_db.match_expression('brick', 'price') is None
+
+    conn.execute("UPDATE real_estate SET district = 'Kievsky' WHERE id = 5")
+    conn.execute("DELETE FROM real_estate WHERE id = 2")
+    assert re_db.count_matches(match) == 1
+    assert [row['id'] for row in re_db.search_page(re_db.match_expression('kiev'), ['id'])] == [5]
+    conn.close()
@@ -0,0 +1,36 @@
+import os
+import numpy as np
+import pandas as pd
+from app.utils.snapshot import ColumnarSnapshot
+
+
+def test_snapshot_round_trip(tmp_path):
+    df = pd.DataFrame({
+        'price': np.array([100, 250, 90], dtype=np.int64),
+        'area': [40.5, 61.0, np.nan],
+        'district': ['Kyiv', None, 'Lviv'],
+        'desc': ['quiet', 'quiet', None]
+    }, index=[3, 7, 12])
+
+    snapshot = ColumnarSnapshot(str(tmp_path))
+    assert snapshot.load('v1') is None
+
+    snapshot.save(df, 'v1')
+    loaded = snapshot.load('v1', categorical=False)
+    pd.testing.assert_frame_equal(loaded, df)
+    assert not loaded['price'].to_numpy().flags.writeable
+
+    categorical = snapshot.load('v1')
+    assert isinstance(categorical['district'].dtype, pd.CategoricalDtype)
+    assert categorical['district'].astype(object).tolist()[::2] == ['Kyiv', 'Lviv']
+    assert categorical['district'].isna().tolist() == [False, True, False]
+
+    snapshot.save(df.iloc[:2], 'v2')
+    assert snapshot.versions() == ['v1', 'v2']
+    assert len(snapshot.load('v1')) == 3 and len(snapshot.load('v2')) == 2
+
+    os.utime(os.path.join(str(tmp_path), 'v1'), (1, 1))
+    snapshot.save(df.iloc[:1], 'v3')
+    assert snapshot.versions() == ['v2', 'v3']
+    assert snapshot.load('v1') is None
+    assert len(snapshot.load('v3')) == 1